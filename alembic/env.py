@@ -12,7 +12,7 @@ from alembic import context
 
 # Import your models' Base and target metadata
 from app.db import Base
-from app.models import Escalation, Event, CallSession, StaffMember
+from app.models import Escalation, Event, CallSession, CallAnalysis, CallTranscriptTurn, StaffMember, IdempotencyKey, DeadLetter, EventStatus
 from app.db_models import Rate
 
 # This is the Alembic Config object
@@ -0,0 +1,48 @@
+"""add idempotency_keys table
+
+Revision ID: 3f9a1c2d7b10
+Revises: 1244eaddc8b2
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "3f9a1c2d7b10"
+down_revision = "1244eaddc8b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Shared EventBus dedup table (IDEMPOTENCY_BACKEND=database).
+    if "idempotency_keys" not in inspector.get_table_names():
+        op.create_table(
+            "idempotency_keys",
+            sa.Column("key", sa.String(), primary_key=True, nullable=False),
+            sa.Column("expires_at", sa.Float(), nullable=False),
+        )
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("idempotency_keys")}
+    if "ix_idempotency_keys_expires_at" not in existing_indexes:
+        op.create_index("ix_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "idempotency_keys" not in inspector.get_table_names():
+        return
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("idempotency_keys")}
+    if "ix_idempotency_keys_expires_at" in existing_indexes:
+        op.drop_index("ix_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,66 @@
+"""add call_analyses table
+
+Revision ID: 5d8e2f1a4c67
+Revises: 7c2e4b8d9a31
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "5d8e2f1a4c67"
+down_revision = "7c2e4b8d9a31"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    "ix_call_analyses_id": (["id"], False),
+    "ix_call_analyses_call_id": (["call_id"], True),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # One row per analyzed Retell call; the unique call_id is the upsert target.
+    if "call_analyses" not in inspector.get_table_names():
+        op.create_table(
+            "call_analyses",
+            sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+            sa.Column("call_id", sa.String(), nullable=False),
+            sa.Column("ticket_id", sa.Integer(), nullable=True),
+            sa.Column("caller_name", sa.String(), nullable=True),
+            sa.Column("intent", sa.String(), nullable=True),
+            sa.Column("requested_service", sa.String(), nullable=True),
+            sa.Column("selected_time", sa.String(), nullable=True),
+            sa.Column("outcome", sa.String(), nullable=True),
+            sa.Column("summary", sa.Text(), nullable=True),
+            sa.Column("transcript", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("call_analyses")}
+    for name, (columns, unique) in _INDEXES.items():
+        if name not in existing_indexes:
+            op.create_index(name, "call_analyses", columns, unique=unique)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "call_analyses" not in inspector.get_table_names():
+        return
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("call_analyses")}
+    for name in _INDEXES:
+        if name in existing_indexes:
+            op.drop_index(name, table_name="call_analyses")
+    op.drop_table("call_analyses")
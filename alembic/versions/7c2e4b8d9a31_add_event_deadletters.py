@@ -0,0 +1,67 @@
+"""add event_deadletters table
+
+Revision ID: 7c2e4b8d9a31
+Revises: 3f9a1c2d7b10
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "7c2e4b8d9a31"
+down_revision = "3f9a1c2d7b10"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    "ix_event_deadletters_id": ["id"],
+    "ix_event_deadletters_correlation_id": ["correlation_id"],
+    "ix_event_deadletters_timestamp": ["timestamp"],
+    "ix_event_deadletters_handler_timestamp": ["handler", "timestamp"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Durable EventBus dead letters (DEADLETTER_BACKEND=database).
+    if "event_deadletters" not in inspector.get_table_names():
+        op.create_table(
+            "event_deadletters",
+            sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+            sa.Column("handler", sa.String(), nullable=False),
+            sa.Column("source", sa.String(), nullable=True),
+            sa.Column("type", sa.String(), nullable=True),
+            sa.Column("idempotency_key", sa.String(), nullable=True),
+            sa.Column("correlation_id", sa.String(), nullable=True),
+            sa.Column("envelope", sa.Text(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("timestamp", sa.Integer(), nullable=False),
+            sa.Column("replay_count", sa.Integer(), nullable=True),
+            sa.Column("replayed_at", sa.Integer(), nullable=True),
+        )
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("event_deadletters")}
+    for name, columns in _INDEXES.items():
+        if name not in existing_indexes:
+            op.create_index(name, "event_deadletters", columns, unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "event_deadletters" not in inspector.get_table_names():
+        return
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("event_deadletters")}
+    for name in _INDEXES:
+        if name in existing_indexes:
+            op.drop_index(name, table_name="event_deadletters")
+    op.drop_table("event_deadletters")
@@ -0,0 +1,43 @@
+"""add call_transcript_turns table
+
+Revision ID: 9a4b6c2e8f13
+Revises: 5d8e2f1a4c67
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "9a4b6c2e8f13"
+down_revision = "5d8e2f1a4c67"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Append-only Retell transcript turns; (call_id, turn_index) is the dedup key.
+    if "call_transcript_turns" not in inspector.get_table_names():
+        op.create_table(
+            "call_transcript_turns",
+            sa.Column("call_id", sa.String(), nullable=False),
+            sa.Column("turn_index", sa.Integer(), nullable=False),
+            sa.Column("role", sa.String(), nullable=True),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("call_id", "turn_index"),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "call_transcript_turns" in inspector.get_table_names():
+        op.drop_table("call_transcript_turns")
@@ -0,0 +1,110 @@
+"""compress large transcript, ticket and event payload values
+
+Revision ID: b2f7d41c9e05
+Revises: 9a4b6c2e8f13
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+import base64
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "b2f7d41c9e05"
+down_revision = "9a4b6c2e8f13"
+branch_labels = None
+depends_on = None
+
+
+_BATCH_SIZE = 500
+
+# (table, primary key, column) pairs switched to CompressedText/CompressedJSON.
+_COLUMNS = [
+    ("call_analyses", "id", "transcript"),
+    ("escalations", "id", "issue"),
+    ("dashboard_events", "id", "payload"),
+]
+
+
+# Frozen copy of the column codec as of this revision, so the migration does not
+# change when app code does. Existing rows are always rewritten with zlib; the
+# app reads both markers.
+_MIN_BYTES = 1024
+_ZLIB_MARKER = "\x01zl:"
+_ZSTD_MARKER = "\x01zs:"
+_MARKER_LENGTH = len(_ZLIB_MARKER)
+
+
+def _is_compressed(value) -> bool:
+    return isinstance(value, str) and value[:_MARKER_LENGTH] in (_ZLIB_MARKER, _ZSTD_MARKER)
+
+
+def _compress(value):
+    if not isinstance(value, str) or _is_compressed(value):
+        return value
+    raw = value.encode("utf-8")
+    if len(raw) < _MIN_BYTES:
+        return value
+    encoded = _ZLIB_MARKER + base64.b64encode(zlib.compress(raw, 6)).decode("ascii")
+    return encoded if len(encoded) < len(value) else value
+
+
+def _decompress(value):
+    if not _is_compressed(value):
+        return value
+    marker, packed = value[:_MARKER_LENGTH], base64.b64decode(value[_MARKER_LENGTH:])
+    if marker == _ZSTD_MARKER:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(packed).decode("utf-8")
+    return zlib.decompress(packed).decode("utf-8")
+
+
+def _rewrite(convert) -> None:
+    """Walk each table by primary key in batches, rewriting values ``convert`` changes."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, pk, column in _COLUMNS:
+        if table not in tables:
+            continue
+        if column not in {col["name"] for col in inspector.get_columns(table)}:
+            continue
+        last_id = None
+        while True:
+            query = f"SELECT {pk}, {column} FROM {table}"
+            params = {"limit": _BATCH_SIZE}
+            if last_id is not None:
+                query += f" WHERE {pk} > :last_id"
+                params["last_id"] = last_id
+            query += f" ORDER BY {pk} LIMIT :limit"
+            rows = bind.execute(sa.text(query), params).fetchall()
+            if not rows:
+                break
+            updates = []
+            for row_id, value in rows:
+                if value is None:
+                    continue
+                converted = convert(value)
+                if converted != value:
+                    updates.append({"row_id": row_id, "value": converted})
+            if updates:
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET {column} = :value WHERE {pk} = :row_id"),
+                    updates,
+                )
+            last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    _rewrite(_compress)
+
+
+def downgrade() -> None:
+    _rewrite(_decompress)
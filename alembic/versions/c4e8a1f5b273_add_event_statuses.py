@@ -0,0 +1,60 @@
+"""add event_statuses table
+
+Revision ID: c4e8a1f5b273
+Revises: b2f7d41c9e05
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "c4e8a1f5b273"
+down_revision = "b2f7d41c9e05"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    "ix_event_statuses_status_updated_at": ["status", "updated_at"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Processing status per correlation_id for 202-accepted webhooks (WEBHOOK_ACCEPT_MODE=async).
+    if "event_statuses" not in inspector.get_table_names():
+        op.create_table(
+            "event_statuses",
+            sa.Column("correlation_id", sa.String(), primary_key=True, nullable=False),
+            sa.Column("source", sa.String(), nullable=True),
+            sa.Column("type", sa.String(), nullable=True),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("detail", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("event_statuses")}
+    for name, columns in _INDEXES.items():
+        if name not in existing_indexes:
+            op.create_index(name, "event_statuses", columns, unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "event_statuses" not in inspector.get_table_names():
+        return
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("event_statuses")}
+    for name in _INDEXES:
+        if name in existing_indexes:
+            op.drop_index(name, table_name="event_statuses")
+    op.drop_table("event_statuses")
@@ -0,0 +1,157 @@
+"""add structured ticket columns to escalations
+
+Revision ID: d7a3c9e1f842
+Revises: c4e8a1f5b273
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+import base64
+import re
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "d7a3c9e1f842"
+down_revision = "c4e8a1f5b273"
+branch_labels = None
+depends_on = None
+
+
+_BATCH_SIZE = 500
+
+_COLUMNS = ("call_id", "source", "severity", "subject")
+
+_INDEXES = {
+    "ix_escalations_call_id": ["call_id"],
+    "ix_escalations_source": ["source"],
+    "ix_escalations_severity": ["severity"],
+}
+
+# Frozen copies of the column codec and the ticket column derivation as of this
+# revision, so the migration does not change when app code does.
+_ZLIB_MARKER = "\x01zl:"
+_ZSTD_MARKER = "\x01zs:"
+_CRITICAL_KEYWORDS = ("leak", "fire", "smoke", "flood", "bleed", "emergency")
+_HIGH_KEYWORDS = ("refund", "cancel", "failed", "error", "charge", "angry", "complain")
+_SUBJECT_MAX_CHARS = 140
+_CALL_ID = re.compile(r"(?:^|[\s|])call_id=([^\s|]+)")
+
+
+def _decompress(value):
+    if not value:
+        return ""
+    marker = value[: len(_ZLIB_MARKER)]
+    if marker == _ZLIB_MARKER:
+        return zlib.decompress(base64.b64decode(value[len(marker) :])).decode("utf-8")
+    if marker == _ZSTD_MARKER:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(base64.b64decode(value[len(marker) :])).decode("utf-8")
+    return value
+
+
+def _severity(text):
+    lowered = text.lower()
+    if any(keyword in lowered for keyword in _CRITICAL_KEYWORDS):
+        return "critical"
+    if any(keyword in lowered for keyword in _HIGH_KEYWORDS):
+        return "high"
+    return "medium" if lowered.strip() else "low"
+
+
+def _ticket_columns(issue, severity_text):
+    match = _CALL_ID.search(issue)
+    call_id = match.group(1) if match else None
+    subject = issue.splitlines()[0].strip() if issue else ""
+    if len(subject) > _SUBJECT_MAX_CHARS:
+        subject = subject[: _SUBJECT_MAX_CHARS - 1] + "…"
+    return {
+        "call_id": call_id,
+        "source": "Voice" if call_id else "System",
+        "severity": _severity(severity_text),
+        "subject": subject,
+    }
+
+
+def _backfill(bind, *, with_analyses: bool) -> None:
+    """Derive the columns for existing tickets, walking the primary key in batches.
+
+    Call tickets are classified together with their analysis transcript, which
+    the issue may only reference.
+    """
+    if with_analyses:
+        query = (
+            "SELECT e.id, e.issue, a.transcript FROM escalations e "
+            "LEFT JOIN call_analyses a ON a.ticket_id = e.id "
+            "WHERE e.id > :last_id AND e.severity IS NULL ORDER BY e.id LIMIT :limit"
+        )
+    else:
+        query = (
+            "SELECT id, issue, NULL FROM escalations WHERE id > :last_id AND severity IS NULL "
+            "ORDER BY id LIMIT :limit"
+        )
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text(query), {"last_id": last_id, "limit": _BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row_id, issue, transcript in rows:
+            issue = _decompress(issue)
+            severity_text = "\n".join(part for part in (issue, _decompress(transcript)) if part)
+            updates.append({"row_id": row_id, **_ticket_columns(issue, severity_text)})
+        bind.execute(
+            sa.text(
+                "UPDATE escalations SET call_id = :call_id, source = :source, "
+                "severity = :severity, subject = :subject WHERE id = :row_id"
+            ),
+            updates,
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "escalations" not in inspector.get_table_names():
+        return
+
+    existing_columns = {col.get("name") for col in inspector.get_columns("escalations")}
+    missing = [name for name in _COLUMNS if name not in existing_columns]
+    if missing:
+        with op.batch_alter_table("escalations") as batch_op:
+            for name in missing:
+                batch_op.add_column(sa.Column(name, sa.String(), nullable=True))
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("escalations")}
+    for name, columns in _INDEXES.items():
+        if name not in existing_indexes:
+            op.create_index(name, "escalations", columns, unique=False)
+
+    _backfill(bind, with_analyses="call_analyses" in inspector.get_table_names())
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "escalations" not in inspector.get_table_names():
+        return
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("escalations")}
+    for name in _INDEXES:
+        if name in existing_indexes:
+            op.drop_index(name, table_name="escalations")
+
+    existing_columns = {col.get("name") for col in inspector.get_columns("escalations")}
+    present = [name for name in _COLUMNS if name in existing_columns]
+    if present:
+        with op.batch_alter_table("escalations") as batch_op:
+            for name in present:
+                batch_op.drop_column(name)
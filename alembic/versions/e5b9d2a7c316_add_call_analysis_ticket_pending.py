@@ -0,0 +1,59 @@
+"""add ticket_pending flag to call_analyses
+
+Revision ID: e5b9d2a7c316
+Revises: d7a3c9e1f842
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "e5b9d2a7c316"
+down_revision = "d7a3c9e1f842"
+branch_labels = None
+depends_on = None
+
+
+_INDEX = "ix_call_analyses_ticket_pending"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "call_analyses" not in inspector.get_table_names():
+        return
+
+    # Marks calls the ticket pipeline still owes a ticket. Existing rows start unmarked:
+    # an unticketed row may come from `python -m app.backfill --no-tickets`.
+    existing_columns = {col.get("name") for col in inspector.get_columns("call_analyses")}
+    if "ticket_pending" not in existing_columns:
+        with op.batch_alter_table("call_analyses") as batch_op:
+            batch_op.add_column(
+                sa.Column("ticket_pending", sa.Boolean(), nullable=False, server_default=sa.false())
+            )
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("call_analyses")}
+    if _INDEX not in existing_indexes:
+        op.create_index(_INDEX, "call_analyses", ["ticket_pending"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "call_analyses" not in inspector.get_table_names():
+        return
+
+    existing_indexes = {idx.get("name") for idx in inspector.get_indexes("call_analyses")}
+    if _INDEX in existing_indexes:
+        op.drop_index(_INDEX, table_name="call_analyses")
+
+    existing_columns = {col.get("name") for col in inspector.get_columns("call_analyses")}
+    if "ticket_pending" in existing_columns:
+        with op.batch_alter_table("call_analyses") as batch_op:
+            batch_op.drop_column("ticket_pending")
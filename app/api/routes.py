@@ -5,11 +5,13 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 
 from ..db import AsyncSessionLocal
-from app.models import CallSession, Escalation, Event
+from app.core.tickets import ticket_columns
+from app.models import CallSession, CallTranscriptTurn, Escalation, Event
 
 router = APIRouter()
 
@@ -24,17 +26,6 @@ def _clamp_limit(value: int, *, default: int, maximum: int) -> int:
     return min(v, maximum)
 
 
-def _derive_severity(text_value: str | None) -> str:
-    text_lower = (text_value or "").lower()
-    if any(k in text_lower for k in ("leak", "fire", "smoke", "flood", "bleed", "emergency")):
-        return "critical"
-    if any(k in text_lower for k in ("refund", "cancel", "failed", "error", "charge", "angry", "complain")):
-        return "high"
-    if text_lower.strip():
-        return "medium"
-    return "low"
-
-
 def _normalize_ticket_status(status_value: str | None) -> str:
     status_upper = (status_value or "").strip().upper()
     if status_upper in {"RESOLVED", "CLOSED", "DONE"}:
@@ -44,66 +35,97 @@ def _normalize_ticket_status(status_value: str | None) -> str:
     return "Open"
 
 
+def _ticket_row(row: Escalation, *, notes: bool) -> dict[str, Any]:
+    created_at = row.created_at.isoformat() if isinstance(row.created_at, datetime) else None
+    issue = (row.issue or "") if notes else ""
+    columns = {"source": row.source, "severity": row.severity, "subject": row.subject}
+    if row.severity is None and notes:
+        # Written before the structured columns existed and not yet backfilled.
+        columns = ticket_columns(issue)
+    return {
+        "id": f"TCK-{row.id}",
+        "customer": row.guest_name or "Unknown",
+        "source": columns["source"] or "System",
+        "subject": columns["subject"] or "Ticket",
+        "severity": columns["severity"] or "low",
+        "status": _normalize_ticket_status(row.status),
+        "notes": issue,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
 @router.get("/tickets")
-async def get_tickets(limit: int = Query(50)) -> list[dict[str, Any]]:
-    """Return recent tickets."""
+async def get_tickets(
+    limit: int = Query(50),
+    source: str | None = Query(None),
+    severity: str | None = Query(None),
+    call_id: str | None = Query(None),
+    notes: bool = Query(False),
+) -> list[dict[str, Any]]:
+    """Return recent tickets; the issue text is only loaded with ``notes=true``."""
     try:
         safe_limit = _clamp_limit(limit, default=50, maximum=200)
+        stmt = select(Escalation).order_by(Escalation.created_at.desc()).limit(safe_limit)
+        if source:
+            stmt = stmt.where(Escalation.source == source)
+        if severity:
+            stmt = stmt.where(Escalation.severity == severity.strip().lower())
+        if call_id:
+            stmt = stmt.where(Escalation.call_id == call_id)
+        if notes:
+            stmt = stmt.options(undefer(Escalation.issue))
         async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(Escalation).order_by(Escalation.created_at.desc()).limit(safe_limit)
-            )
-            rows = result.scalars().all()
-            results: list[dict[str, Any]] = []
-            for row in rows:
-                created_at = row.created_at.isoformat() if isinstance(row.created_at, datetime) else None
-                issue = row.issue or ""
-                subject = issue.splitlines()[0].strip() if issue else ""
-                if len(subject) > 140:
-                    subject = subject[:139] + "…"
-                results.append(
-                    {
-                        "id": f"TCK-{row.id}",
-                        "customer": row.guest_name or "Unknown",
-                        "source": "Voice" if "call_id=" in issue else "System",
-                        "subject": subject or "Ticket",
-                        "severity": _derive_severity(issue),
-                        "status": _normalize_ticket_status(row.status),
-                        "notes": issue,
-                        "created_at": created_at,
-                        "updated_at": created_at,
-                    }
-                )
-            return results
+            result = await db.execute(stmt)
+            return [_ticket_row(row, notes=notes) for row in result.scalars().all()]
     except Exception:
         return []
 
 
+@router.get("/tickets/{ticket_id}")
+async def get_ticket(ticket_id: str) -> dict[str, Any]:
+    """Return one ticket with its notes; accepts ``TCK-<id>`` or the bare id."""
+    raw_id = ticket_id.strip()
+    if raw_id.upper().startswith("TCK-"):
+        raw_id = raw_id[4:]
+    try:
+        row_id = int(raw_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="ticket_not_found")
+    async with AsyncSessionLocal() as db:
+        row = (
+            await db.execute(select(Escalation).options(undefer(Escalation.issue)).where(Escalation.id == row_id))
+        ).scalars().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="ticket_not_found")
+    return _ticket_row(row, notes=True)
+
+
 @router.get("/events")
-async def get_events(limit: int = Query(100)) -> list[dict[str, Any]]:
-    """Return recent events."""
+async def get_events(limit: int = Query(100), payload: bool = Query(False)) -> list[dict[str, Any]]:
+    """Return recent events; the stored payload is only loaded with ``payload=true``."""
     try:
         safe_limit = _clamp_limit(limit, default=100, maximum=500)
+        stmt = select(Event).order_by(Event.at.desc()).limit(safe_limit)
+        if payload:
+            stmt = stmt.options(undefer(Event.payload))
         async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(Event).order_by(Event.created_at.desc()).limit(safe_limit)
-            )
+            result = await db.execute(stmt)
             rows = result.scalars().all()
             results: list[dict[str, Any]] = []
             for row in rows:
-                created_at = row.created_at.isoformat() if isinstance(row.created_at, datetime) else None
-                results.append(
-                    {
-                        "id": row.id,
-                        "source": row.source,
-                        "type": row.type,
-                        "severity": row.severity,
-                        "text": row.text,
-                        "payload": row.payload,
-                        "created_at": created_at,
-                        "at": created_at,
-                    }
-                )
+                created_at = row.at.isoformat() if isinstance(row.at, datetime) else None
+                item = {
+                    "id": row.id,
+                    "source": row.source,
+                    "type": row.type,
+                    "text": row.text,
+                    "created_at": created_at,
+                    "at": created_at,
+                }
+                if payload:
+                    item["payload"] = row.payload
+                results.append(item)
             return results
     except Exception:
         return []
@@ -138,6 +160,30 @@ async def get_calls(limit: int = Query(50)) -> list[dict[str, Any]]:
         return []
 
 
+@router.get("/calls/{call_id}/transcript")
+async def get_call_transcript(
+    call_id: str,
+    after: int = Query(-1),
+    limit: int = Query(500),
+) -> list[dict[str, Any]]:
+    """Return transcript turns for a call, optionally only those after a turn index."""
+    try:
+        safe_limit = _clamp_limit(limit, default=500, maximum=2000)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(CallTranscriptTurn)
+                .where(CallTranscriptTurn.call_id == call_id, CallTranscriptTurn.turn_index > after)
+                .order_by(CallTranscriptTurn.turn_index)
+                .limit(safe_limit)
+            )
+            return [
+                {"turn_index": row.turn_index, "role": row.role, "content": row.content}
+                for row in result.scalars().all()
+            ]
+    except Exception:
+        return []
+
+
 @router.get("/staff")
 async def get_staff(limit: int = Query(100)) -> list[dict[str, Any]]:
     """Return staff directory entries."""
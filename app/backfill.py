@@ -0,0 +1,418 @@
+"""Bulk backfill of Retell call exports.
+
+Streams a JSONL file or a JSON array of call records and normalizes each one
+with the same helpers as the webhook path (``_extract_call_id``, transcript
+turns and snippet, the analysis extractor, ``_build_ticket_issue``). Rows are
+written in large ``executemany`` batches, several batches at a time.
+
+Usage::
+
+    python -m app.backfill calls.jsonl --batch-size 500 --concurrency 4
+
+A checkpoint file (``<input>.checkpoint`` by default) records how many
+records are committed, so an interrupted run resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import bindparam, delete, insert, select, update
+
+from app.core.tickets import ticket_columns
+from app.core.upsert import dialect_insert
+from app.models import CallAnalysis, Escalation
+from app.retell_ingest import (
+    _analysis_fields,
+    _analysis_on_conflict,
+    _build_ticket_issue,
+    _call_id_from_fields,
+    _derive_snippet,
+    _payload_fields,
+    _session_changes,
+    _session_row,
+    _session_upsert,
+    _severity_text,
+    _tail_snippet,
+    _transcript_reference,
+    _transcript_to_text,
+    _turn_from_item,
+    _turns_insert,
+)
+
+_log = logging.getLogger("retell.backfill")
+
+_READ_CHUNK = 1 << 16
+_SESSION_KEYS = {"id", "started_at", "updated_at"}
+
+
+@dataclass
+class BackfillReport:
+    records: int = 0
+    skipped: int = 0
+    calls: int = 0
+    turns: int = 0
+    tickets: int = 0
+    batches: int = 0
+    resumed_from: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "records_per_second": round(self.records_per_second, 1)}
+
+
+def iter_records(path: str) -> Iterator[Any]:
+    """Yield records from a JSONL file or a (streamed, never fully loaded) JSON array."""
+    with open(path, "r", encoding="utf-8") as handle:
+        head = handle.read(_READ_CHUNK)
+        if head.lstrip().startswith("["):
+            yield from _iter_json_array(handle, head)
+            return
+        pending = head
+        while True:
+            lines = pending.split("\n")
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            chunk = handle.read(_READ_CHUNK)
+            if not chunk:
+                break
+            pending += chunk
+        if pending.strip():
+            yield json.loads(pending)
+
+
+def _iter_json_array(handle, buffer: str) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    buffer = buffer.lstrip()[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        if buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                yield record
+                buffer = buffer[end:]
+                continue
+        if eof:
+            raise ValueError("unterminated JSON array")
+        chunk = handle.read(_READ_CHUNK)
+        eof = not chunk
+        buffer += chunk
+
+
+def _timestamp(value: Any, default: datetime) -> datetime:
+    """Retell exports use epoch milliseconds; fall back to ``default``."""
+    if isinstance(value, (int, float)) and value > 0:
+        seconds = value / 1000 if value > 10**11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return default
+
+
+def normalize_record(record: Any, now: datetime) -> dict[str, Any] | None:
+    """Map one exported call to session, turn and analysis rows (``None`` if unusable)."""
+    if not isinstance(record, dict):
+        return None
+    fields = _payload_fields.extract(record)
+    call_id = _call_id_from_fields(fields)
+    if not call_id:
+        return None
+
+    analysis = fields.get("analysis", {})
+    transcript = record.get("transcript_object") or record.get("transcript") or analysis.get("transcript")
+    turns: list[dict[str, Any]] = []
+    if isinstance(transcript, list):
+        transcript_text = _transcript_to_text(transcript) if analysis or fields.get("summary") else ""
+        snippet = _tail_snippet(transcript)
+        for index, item in enumerate(transcript):
+            turn = _turn_from_item(item)
+            if turn is not None:
+                turns.append(
+                    {"call_id": call_id, "turn_index": index, "role": turn[0], "content": turn[1], "created_at": now}
+                )
+    else:
+        transcript_text = _transcript_to_text(transcript)
+        snippet = _derive_snippet(transcript_text)
+
+    changes = _session_changes(
+        normalized_type="call_analyzed" if analysis else "call_ended",
+        from_contact=fields.get("from_contact", ""),
+        intent=fields.get("intent", ""),
+        latency_ms=None,
+        snippet=snippet,
+    )
+    session = {**_session_row(call_id, changes, now), "started_at": _timestamp(record.get("start_timestamp"), now)}
+
+    result: dict[str, Any] = {"call_id": call_id, "session": session, "turns": turns, "analysis": None}
+    if analysis or fields.get("summary"):
+        found = _analysis_fields.extract(analysis)
+        values = {
+            "caller_name": fields.get("caller_name") or found.get("caller_name", ""),
+            "intent": fields.get("intent") or found.get("intent", ""),
+            "requested_service": found.get("requested_service") or fields.get("requested_service", ""),
+            "selected_time": found.get("selected_time") or fields.get("selected_time", ""),
+            "outcome": found.get("outcome") or fields.get("outcome", ""),
+            "summary": fields.get("summary") or found.get("summary", ""),
+            "transcript": transcript_text,
+        }
+        result["analysis"] = {"call_id": call_id, "ticket_id": None, "created_at": now, "updated_at": now, **values}
+        result["severity_text"] = _severity_text(values["summary"], transcript_text)
+        # As in ingest: the ticket references turn rows instead of embedding the text.
+        transcript_ref = _transcript_reference(call_id) if turns else ""
+        result["issue"] = _build_ticket_issue(
+            call_id=call_id,
+            caller_name=values["caller_name"],
+            intent=values["intent"],
+            requested_service=values["requested_service"],
+            selected_time=values["selected_time"],
+            outcome=values["outcome"],
+            summary=values["summary"],
+            transcript_text="" if transcript_ref else transcript_text,
+            transcript_ref=transcript_ref,
+        )
+    return result
+
+
+async def write_batch(db, calls: list[dict[str, Any]], *, create_tickets: bool = True) -> dict[str, int]:
+    """Write normalized calls in one transaction; returns written counts.
+
+    Duplicate call_ids inside a batch are collapsed (last record wins), because
+    one multi-row ``ON CONFLICT DO UPDATE`` cannot touch the same row twice.
+    """
+    by_call = {call["call_id"]: call for call in calls}
+    calls = list(by_call.values())
+    now = datetime.now(timezone.utc)
+    upsert = dialect_insert(db)
+
+    # One executemany per distinct column set, as in the write-behind flush.
+    session_groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for call in calls:
+        columns = tuple(sorted(set(call["session"]) - _SESSION_KEYS))
+        session_groups.setdefault(columns, []).append(call["session"])
+    for columns, rows in session_groups.items():
+        await db.execute(_session_upsert(upsert, columns), rows)
+
+    turns = [turn for call in calls for turn in call["turns"]]
+    if turns:
+        await db.execute(_turns_insert(upsert), turns)
+
+    analysed = [call for call in calls if call["analysis"] is not None]
+    tickets = 0
+    if analysed:
+        await db.execute(_analysis_on_conflict(upsert(CallAnalysis.__table__)), [c["analysis"] for c in analysed])
+
+    if analysed and create_tickets:
+        table = CallAnalysis.__table__
+        unticketed = set(
+            (
+                await db.execute(
+                    select(table.c.call_id).where(
+                        table.c.call_id.in_([c["call_id"] for c in analysed]), table.c.ticket_id.is_(None)
+                    )
+                )
+            ).scalars()
+        )
+        pending = [c for c in analysed if c["call_id"] in unticketed]
+        if pending:
+            created = (
+                await db.execute(
+                    insert(Escalation.__table__).returning(
+                        Escalation.__table__.c.id, sort_by_parameter_order=True
+                    ),
+                    [
+                        {
+                            "guest_name": c["analysis"]["caller_name"] or "Unknown Caller",
+                            "room_number": "N/A",
+                            "issue": c["issue"],
+                            "status": "OPEN",
+                            "sentiment": "Neutral",
+                            "created_at": now,
+                            **ticket_columns(c["issue"], call_id=c["call_id"], severity_text=c["severity_text"]),
+                        }
+                        for c in pending
+                    ],
+                )
+            ).scalars().all()
+            links = [{"cid": c["call_id"], "tid": tid} for c, tid in zip(pending, created)]
+            await db.execute(
+                update(table)
+                .where(table.c.call_id == bindparam("cid"), table.c.ticket_id.is_(None))
+                .values(ticket_id=bindparam("tid"), updated_at=now),
+                links,
+            )
+            linked = set(
+                (
+                    await db.execute(select(table.c.ticket_id).where(table.c.ticket_id.in_(list(created))))
+                ).scalars()
+            )
+            orphans = [tid for tid in created if tid not in linked]
+            if orphans:
+                await db.execute(delete(Escalation).where(Escalation.id.in_(orphans)))
+            tickets = len(created) - len(orphans)
+
+    await db.commit()
+    return {"calls": len(calls), "turns": len(turns), "tickets": tickets}
+
+
+def _read_checkpoint(path: str | None) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as handle:
+        return int(json.load(handle).get("offset", 0))
+
+
+def _write_checkpoint(path: str | None, offset: int) -> None:
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"offset": offset, "updated_at": int(time.time())}, handle)
+    os.replace(tmp_path, path)
+
+
+async def backfill(
+    path: str,
+    *,
+    session_factory=None,
+    batch_size: int = 500,
+    concurrency: int = 4,
+    checkpoint_path: str | None = None,
+    create_tickets: bool = True,
+) -> BackfillReport:
+    """Stream ``path`` into the database; resumes from ``checkpoint_path`` if present.
+
+    Up to ``concurrency`` batches are written in parallel. The checkpoint only
+    advances past a batch once every earlier batch has committed, so a resume
+    never skips records.
+    """
+    if session_factory is None:
+        from app.db import AsyncSessionLocal
+
+        session_factory = AsyncSessionLocal
+
+    report = BackfillReport(resumed_from=_read_checkpoint(checkpoint_path))
+    started = time.monotonic()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+    done: dict[int, int] = {}
+    watermark = report.resumed_from
+    next_batch = 0
+
+    async def writer() -> None:
+        nonlocal watermark, next_batch
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                seq, end_offset, calls = item
+                if calls:
+                    async with session_factory() as db:
+                        counts = await write_batch(db, calls, create_tickets=create_tickets)
+                    report.calls += counts["calls"]
+                    report.turns += counts["turns"]
+                    report.tickets += counts["tickets"]
+                report.batches += 1
+                done[seq] = end_offset
+                while next_batch in done:
+                    watermark = done.pop(next_batch)
+                    next_batch += 1
+                _write_checkpoint(checkpoint_path, watermark)
+                _log.info(
+                    "RETELL_BACKFILL_BATCH seq=%s offset=%s calls=%s rate=%.1f/s",
+                    seq,
+                    watermark,
+                    report.calls,
+                    report.records / max(time.monotonic() - started, 1e-9),
+                )
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(writer()) for _ in range(max(1, concurrency))]
+
+    async def put(item) -> None:
+        # A failed writer must stop the run instead of leaving put() blocked on a full queue.
+        pending = asyncio.ensure_future(queue.put(item))
+        while not pending.done():
+            await asyncio.wait([pending, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for task in workers:
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    pending.cancel()
+                    raise task.exception()
+
+    try:
+        now = datetime.now(timezone.utc)
+        batch: list[dict[str, Any]] = []
+        seq = 0
+        offset = 0
+        for offset, record in enumerate(iter_records(path), start=1):
+            if offset <= report.resumed_from:
+                continue
+            report.records += 1
+            call = normalize_record(record, now)
+            if call is None:
+                report.skipped += 1
+            else:
+                batch.append(call)
+            if report.records % batch_size == 0:
+                await put((seq, offset, batch))
+                seq += 1
+                batch = []
+        if report.records % batch_size:
+            await put((seq, offset, batch))
+        for _ in workers:
+            await put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    report.elapsed_seconds = round(time.monotonic() - started, 3)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.backfill", description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="JSONL file or JSON array of Retell call records")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file (default: <path>.checkpoint)")
+    parser.add_argument("--no-checkpoint", action="store_true", help="ignore and do not write a checkpoint")
+    parser.add_argument("--no-tickets", action="store_true", help="store calls and analyses without creating tickets")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    checkpoint = None if args.no_checkpoint else (args.checkpoint or f"{args.path}.checkpoint")
+    report = asyncio.run(
+        backfill(
+            args.path,
+            batch_size=max(1, args.batch_size),
+            concurrency=max(1, args.concurrency),
+            checkpoint_path=checkpoint,
+            create_tickets=not args.no_tickets,
+        )
+    )
+    print(json.dumps(report.to_dict()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
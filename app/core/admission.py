@@ -0,0 +1,93 @@
+"""Admission control for webhook ingress.
+
+Each ingress source (retell, make, telegram) has its own in-flight request
+limit, and all of them share an optional EventBus queue-depth limit. Requests
+over a limit are shed immediately, so they do not pile up on DB pool checkouts
+and outbound HTTP calls until ``DB_POOL_TIMEOUT`` fires.
+
+Work that outlives its request (202-accepted webhooks) keeps counting as in
+flight through ``hold()``, so a backlog of accepted bodies sheds new requests
+the same way slow synchronous handlers do.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, source: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"{source} admission rejected: {reason}")
+        self.source = source
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, queue_depth: Optional[Callable[[], int]] = None) -> None:
+        self._queue_depth = queue_depth
+        self._inflight: Dict[str, int] = {}
+        self._held = 0
+        self._admitted: Dict[str, int] = {}
+        self._shed: Dict[str, Dict[str, int]] = {}
+
+    def limit_for(self, source: str) -> int:
+        return int(getattr(settings, f"ADMISSION_MAX_INFLIGHT_{source.upper()}", 0) or 0)
+
+    def inflight(self, source: str) -> int:
+        return self._inflight.get(source, 0)
+
+    def _reject(self, source: str, reason: str) -> AdmissionRejected:
+        counters = self._shed.setdefault(source, {})
+        counters[reason] = counters.get(reason, 0) + 1
+        return AdmissionRejected(source, reason, settings.ADMISSION_RETRY_AFTER_SECONDS)
+
+    @asynccontextmanager
+    async def slot(self, source: str) -> AsyncIterator[None]:
+        limit = self.limit_for(source)
+        if limit and self.inflight(source) >= limit:
+            raise self._reject(source, "inflight_limit")
+        max_depth = settings.ADMISSION_MAX_QUEUE_DEPTH
+        if max_depth and self._queue_depth is not None and self._queue_depth() >= max_depth:
+            raise self._reject(source, "queue_depth")
+
+        self._inflight[source] = self.inflight(source) + 1
+        self._admitted[source] = self._admitted.get(source, 0) + 1
+        try:
+            yield
+        finally:
+            self._inflight[source] -= 1
+
+    def hold(self, source: str, *, limit: int = 0) -> Callable[[], None]:
+        """Count background work for an already admitted ``source`` request as in flight.
+
+        ``limit`` caps held work across all sources. Returns the release callback,
+        which is safe to call more than once.
+        """
+        if limit and self._held >= limit:
+            raise self._reject(source, "background_limit")
+        self._held += 1
+        self._inflight[source] = self.inflight(source) + 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._held -= 1
+                self._inflight[source] -= 1
+
+        return release
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        sources = set(self._inflight) | set(self._shed) | {"retell", "make", "telegram"}
+        return {
+            source: {
+                "inflight": self.inflight(source),
+                "limit": self.limit_for(source),
+                "admitted": self._admitted.get(source, 0),
+                "shed": dict(self._shed.get(source, {})),
+            }
+            for source in sorted(sources)
+        }
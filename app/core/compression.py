@@ -0,0 +1,106 @@
+"""Transparent compression for large text and JSON columns.
+
+``CompressedText`` stores values shorter than ``COMPRESSION_MIN_BYTES`` as-is.
+Larger values are compressed (zstd when ``zstandard`` is installed, zlib
+otherwise), base64-encoded and tagged with a short marker prefix. They stay
+valid ``TEXT``, so no column type change is needed and old plain rows remain
+readable. ``CompressedJSON`` does the same for JSON documents.
+
+Decompression happens when a row is loaded. The large columns are
+``deferred`` on the models, so list queries never load or inflate them.
+"""
+
+import base64
+import json
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy.types import Text, TypeDecorator
+
+from app.core.config import settings
+
+try:  # optional, better ratio and speed than zlib
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+_ZLIB_MARKER = "\x01zl:"
+_ZSTD_MARKER = "\x01zs:"
+_MARKER_LENGTH = len(_ZLIB_MARKER)
+
+
+def is_compressed(value: Any) -> bool:
+    return isinstance(value, str) and value[:_MARKER_LENGTH] in (_ZLIB_MARKER, _ZSTD_MARKER)
+
+
+def _codec() -> str:
+    codec = (settings.COMPRESSION_CODEC or "auto").strip().lower()
+    if codec == "auto":
+        return "zstd" if zstandard is not None else "zlib"
+    if codec == "zstd" and zstandard is None:
+        return "zlib"
+    return codec
+
+
+def compress_text(value: str, *, min_bytes: Optional[int] = None) -> str:
+    """Compress ``value`` if it is at least ``min_bytes`` and compression pays off."""
+    threshold = settings.COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if threshold <= 0 or is_compressed(value):
+        return value
+    raw = value.encode("utf-8")
+    if len(raw) < threshold:
+        return value
+    if _codec() == "zstd":
+        marker, packed = _ZSTD_MARKER, zstandard.ZstdCompressor(level=3).compress(raw)
+    else:
+        marker, packed = _ZLIB_MARKER, zlib.compress(raw, 6)
+    encoded = marker + base64.b64encode(packed).decode("ascii")
+    return encoded if len(encoded) < len(value) else value
+
+
+def decompress_text(value: str) -> str:
+    if not is_compressed(value):
+        return value
+    marker, packed = value[:_MARKER_LENGTH], base64.b64decode(value[_MARKER_LENGTH:])
+    if marker == _ZSTD_MARKER:
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed column value but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(packed).decode("utf-8")
+    return zlib.decompress(packed).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        return compress_text(str(value))
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        return decompress_text(value)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON document stored as (possibly compressed) text; plain legacy strings load unchanged."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+        return compress_text(text)
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        text = decompress_text(value)
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
@@ -29,9 +29,90 @@ class Settings(BaseSettings):  # pylint: disable=too-few-public-methods
     TELEGRAM_WEBHOOK_SECRET: str | None = None
     MAKE_WEBHOOK_URL: str | None = None
     MAKE_SIGNING_SECRET: str | None = None
+    MAKE_BATCH_MAX_ENVELOPES: int = 500
     RETELL_SIGNING_SECRET: str | None = None
+    # Serialize ingest per call_id (different calls in parallel) and coalesce pending updates.
+    RETELL_INGEST_ORDERED: bool = True
+    # Striped in-process lock per call_id around ingest; the advisory lock extends it
+    # across workers (Postgres only, held for the ingest transaction).
+    RETELL_INGEST_LOCK_STRIPES: int = 256
+    RETELL_INGEST_ADVISORY_LOCK: bool = False
+    # Buffer CallSession writes in memory; call_ended/call_analyzed force a flush.
+    RETELL_SESSION_WRITE_BEHIND: bool = False
+    RETELL_SESSION_FLUSH_INTERVAL_MS: int = 250
+    RETELL_SESSION_FLUSH_MAX_ROWS: int = 200
+    # Create call_analyzed tickets in a background stage instead of before /webhook responds.
+    RETELL_TICKET_PIPELINE: bool = False
+    RETELL_TICKET_WORKERS: int = 2
+    # Failed ticket creations are re-queued with capped exponential backoff; after the
+    # last attempt the call stays pending for recover() on the next startup.
+    RETELL_TICKET_MAX_ATTEMPTS: int = 5
+    RETELL_TICKET_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    RETELL_TICKET_RETRY_MAX_DELAY_SECONDS: float = 30.0
     WEBHOOK_TIMESTAMP_TOLERANCE_SECONDS: int = 300
+    # Webhook bodies over this size are rejected with 413 while streaming in (0 disables).
+    WEBHOOK_MAX_BODY_BYTES: int = 1_048_576
+    # Journal verified Retell/Make bodies to local segment files before processing;
+    # entries without a commit marker are re-driven on startup.
+    WEBHOOK_JOURNAL_ENABLED: bool = False
+    WEBHOOK_JOURNAL_DIR: str = "data/webhook-journal"
+    WEBHOOK_JOURNAL_SEGMENT_BYTES: int = 16_777_216
+    WEBHOOK_JOURNAL_FSYNC_INTERVAL_MS: int = 2
+    # "sync" answers /webhook, /webhooks/make/in and /staff/escalate after all downstream
+    # work; "async" answers 202 once the body is journaled and the event is recorded as
+    # queued, with progress at GET /events/status/{correlation_id} (admin token).
+    WEBHOOK_ACCEPT_MODE: str = "sync"
+    # Accepted bodies are processed by at most this many tasks at once; each counts as
+    # in flight for its admission source until it finishes, and past the backlog cap
+    # new requests get 503.
+    WEBHOOK_ACCEPT_MAX_CONCURRENCY: int = 16
+    WEBHOOK_ACCEPT_MAX_BACKLOG: int = 1000
+
+    # COLUMN COMPRESSION — large transcripts/ticket text/event payloads are stored
+    # compressed once they reach this size (0 disables). Codec: auto | zstd | zlib.
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_CODEC: str = "auto"
+
+    # ADMISSION CONTROL — webhook requests over these limits get a fast 503 + Retry-After.
+    # 0 disables a limit. Queue depth applies to the EventBus in queued mode.
+    ADMISSION_MAX_INFLIGHT_RETELL: int = 64
+    ADMISSION_MAX_INFLIGHT_MAKE: int = 32
+    ADMISSION_MAX_INFLIGHT_TELEGRAM: int = 16
+    ADMISSION_MAX_QUEUE_DEPTH: int = 0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
     IDEMPOTENCY_TTL_SECONDS: int = 3600
+    IDEMPOTENCY_MAX_KEYS: int = 100_000
+    # "memory" (per process) or "database" (shared across NUM_WORKERS via idempotency_keys)
+    IDEMPOTENCY_BACKEND: str = "memory"
+    IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS: int = 60
+
+    # EVENT BUS
+    # "sequential" awaits matching handlers one by one; "concurrent" fans out so
+    # publish latency is bounded by the slowest handler instead of the sum.
+    EVENT_BUS_DISPATCH_MODE: str = "sequential"
+    EVENT_BUS_HANDLER_TIMEOUT_SECONDS: float = 10.0
+    EVENT_BUS_MAX_ATTEMPTS: int = 3
+    # "inline" retries inside publish; "scheduled" hands failures to a background
+    # retry scheduler (jittered exponential backoff) so retries add no caller latency.
+    EVENT_BUS_RETRY_MODE: str = "inline"
+    EVENT_BUS_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    EVENT_BUS_RETRY_MAX_DELAY_SECONDS: float = 60.0
+    EVENT_BUS_RETRY_MAX_CONCURRENCY: int = 4
+    # Queued mode: publish acknowledges on enqueue and a worker pool runs handlers.
+    EVENT_BUS_QUEUED: bool = False
+    EVENT_BUS_WORKERS: int = 4
+    EVENT_BUS_QUEUE_SIZE: int = 1000
+    EVENT_BUS_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    # Priority lanes (queued mode): workers always serve critical > high > normal.
+    # Keep NORMAL below EVENT_BUS_WORKERS so a worker is always free for escalations.
+    EVENT_BUS_CRITICAL_CONCURRENCY: int = 4
+    EVENT_BUS_HIGH_CONCURRENCY: int = 4
+    EVENT_BUS_NORMAL_CONCURRENCY: int = 3
+    EVENT_BUS_CRITICAL_TYPES: str = ""
+    # "memory" keeps the last 200 failures in process; "database" persists to event_deadletters.
+    DEADLETTER_BACKEND: str = "memory"
+    DEADLETTER_REPLAY_BATCH_SIZE: int = 50
+    DEADLETTER_REPLAY_INTERVAL_SECONDS: float = 1.0
     ADMIN_TOKEN: str | None = None
     google_api_key: str | None = Field(default=None, validation_alias="GOOGLE_API_KEY")
     API_KEY: str = "grace_prod_key_99"
@@ -0,0 +1,242 @@
+"""Dead-letter stores for EventBus handler failures.
+
+``InMemoryDeadLetterStore`` keeps the most recent failures in process (the
+historical behaviour). ``SqlDeadLetterStore`` persists them to the
+``event_deadletters`` table so they survive restarts and can be paged through
+and replayed without holding payloads in memory. A replay that succeeds
+removes its entry; one that fails again updates the entry in place.
+"""
+
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, select, update
+
+from app.core.config import settings
+
+_log = logging.getLogger("GRACE_BUS")
+
+
+def _summary(entry_id: int, envelope: Any, handler: str, error: str, timestamp: int, replay_count: int) -> Dict[str, Any]:
+    return {
+        "id": entry_id,
+        "handler": handler,
+        "error": error,
+        "timestamp": timestamp,
+        "source": envelope.source,
+        "type": envelope.type,
+        "idempotency_key": envelope.idempotency_key,
+        "correlation_id": envelope.correlation_id,
+        "replay_count": replay_count,
+    }
+
+
+class DeadLetterStore(ABC):
+    @abstractmethod
+    async def record(self, envelope: Any, handler: str, error: str) -> None:
+        ...
+
+    @abstractmethod
+    async def list(self, *, limit: int, before_id: Optional[int] = None, handler: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first page of dead-letter summaries (payloads excluded)."""
+
+    @abstractmethod
+    async def select(
+        self,
+        *,
+        ids: Optional[Sequence[int]] = None,
+        handler: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Oldest-first entries (with ``envelope``) for replay."""
+
+    @abstractmethod
+    async def resolve(self, ids: Sequence[int]) -> None:
+        """Drop entries whose replay succeeded."""
+
+    @abstractmethod
+    async def replay_failed(self, entry_id: int, error: str) -> None:
+        """Record another failed replay on an existing entry."""
+
+
+class InMemoryDeadLetterStore(DeadLetterStore):
+    def __init__(self, max_entries: int = 200) -> None:
+        self._max_entries = max_entries
+        self._next_id = 1
+        self.entries: List[Dict[str, Any]] = []
+
+    async def record(self, envelope: Any, handler: str, error: str) -> None:
+        self.entries.append(
+            {
+                "id": self._next_id,
+                "envelope": envelope,
+                "handler": handler,
+                "error": error,
+                "timestamp": int(time.time()),
+                "replay_count": 0,
+            }
+        )
+        self._next_id += 1
+        if len(self.entries) > self._max_entries:
+            self.entries = self.entries[-self._max_entries :]
+
+    def _filtered(self, ids, handler, since, until) -> List[Dict[str, Any]]:
+        wanted = set(ids) if ids is not None else None
+        return [
+            entry
+            for entry in self.entries
+            if (wanted is None or entry["id"] in wanted)
+            and (handler is None or entry["handler"] == handler)
+            and (since is None or entry["timestamp"] >= since)
+            and (until is None or entry["timestamp"] <= until)
+        ]
+
+    async def list(self, *, limit: int, before_id: Optional[int] = None, handler: Optional[str] = None) -> List[Dict[str, Any]]:
+        page = []
+        for entry in reversed(self._filtered(None, handler, None, None)):
+            if before_id is not None and entry["id"] >= before_id:
+                continue
+            page.append(
+                _summary(entry["id"], entry["envelope"], entry["handler"], entry["error"], entry["timestamp"], entry["replay_count"])
+            )
+            if len(page) >= limit:
+                break
+        return page
+
+    async def select(self, *, ids=None, handler=None, since=None, until=None, limit: int = 100) -> List[Dict[str, Any]]:
+        return self._filtered(ids, handler, since, until)[:limit]
+
+    async def resolve(self, ids: Sequence[int]) -> None:
+        wanted = set(ids)
+        if wanted:
+            self.entries = [entry for entry in self.entries if entry["id"] not in wanted]
+
+    async def replay_failed(self, entry_id: int, error: str) -> None:
+        for entry in self.entries:
+            if entry["id"] == entry_id:
+                entry["error"] = error
+                entry["replay_count"] += 1
+                return
+
+
+class SqlDeadLetterStore(DeadLetterStore):
+    def __init__(self, *, session_factory=None) -> None:
+        self._session_factory = session_factory
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.db import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    async def record(self, envelope: Any, handler: str, error: str) -> None:
+        from app.models import DeadLetter
+
+        async with self._factory()() as db:
+            db.add(
+                DeadLetter(
+                    handler=handler,
+                    source=envelope.source,
+                    type=envelope.type,
+                    idempotency_key=envelope.idempotency_key,
+                    correlation_id=envelope.correlation_id,
+                    envelope=envelope.to_bytes().decode("utf-8"),
+                    error=error,
+                    timestamp=int(time.time()),
+                    replay_count=0,
+                )
+            )
+            await db.commit()
+
+    async def list(self, *, limit: int, before_id: Optional[int] = None, handler: Optional[str] = None) -> List[Dict[str, Any]]:
+        from app.models import DeadLetter
+
+        columns = (
+            DeadLetter.id,
+            DeadLetter.handler,
+            DeadLetter.error,
+            DeadLetter.timestamp,
+            DeadLetter.source,
+            DeadLetter.type,
+            DeadLetter.idempotency_key,
+            DeadLetter.correlation_id,
+            DeadLetter.replay_count,
+        )
+        stmt = select(*columns).order_by(DeadLetter.id.desc()).limit(limit)
+        if before_id is not None:
+            stmt = stmt.where(DeadLetter.id < before_id)
+        if handler:
+            stmt = stmt.where(DeadLetter.handler == handler)
+        async with self._factory()() as db:
+            rows = (await db.execute(stmt)).all()
+        return [dict(row._mapping) for row in rows]
+
+    async def select(self, *, ids=None, handler=None, since=None, until=None, limit: int = 100) -> List[Dict[str, Any]]:
+        from app.core.events import EventEnvelope
+        from app.models import DeadLetter
+
+        stmt = select(DeadLetter).order_by(DeadLetter.id.asc()).limit(limit)
+        if ids is not None:
+            stmt = stmt.where(DeadLetter.id.in_(list(ids)))
+        if handler:
+            stmt = stmt.where(DeadLetter.handler == handler)
+        if since is not None:
+            stmt = stmt.where(DeadLetter.timestamp >= since)
+        if until is not None:
+            stmt = stmt.where(DeadLetter.timestamp <= until)
+        async with self._factory()() as db:
+            rows = (await db.execute(stmt)).scalars().all()
+
+        entries = []
+        for row in rows:
+            try:
+                envelope = EventEnvelope.trusted(**json.loads(row.envelope))
+            except Exception as exc:
+                _log.warning("deadletter_envelope_unreadable id=%s err=%s", row.id, exc)
+                continue
+            entries.append(
+                {
+                    "id": row.id,
+                    "envelope": envelope,
+                    "handler": row.handler,
+                    "error": row.error,
+                    "timestamp": row.timestamp,
+                    "replay_count": row.replay_count,
+                }
+            )
+        return entries
+
+    async def resolve(self, ids: Sequence[int]) -> None:
+        from app.models import DeadLetter
+
+        if not ids:
+            return
+        async with self._factory()() as db:
+            await db.execute(delete(DeadLetter).where(DeadLetter.id.in_(list(ids))))
+            await db.commit()
+
+    async def replay_failed(self, entry_id: int, error: str) -> None:
+        from app.models import DeadLetter
+
+        async with self._factory()() as db:
+            await db.execute(
+                update(DeadLetter)
+                .where(DeadLetter.id == entry_id)
+                .values(error=error, replay_count=DeadLetter.replay_count + 1, replayed_at=int(time.time()))
+            )
+            await db.commit()
+
+
+def build_deadletter_store() -> DeadLetterStore:
+    backend = (settings.DEADLETTER_BACKEND or "memory").strip().lower()
+    if backend in {"database", "db", "postgres", "sql"}:
+        return SqlDeadLetterStore()
+    if backend != "memory":
+        _log.warning("unknown DEADLETTER_BACKEND=%s, falling back to memory", backend)
+    return InMemoryDeadLetterStore()
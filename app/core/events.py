@@ -1,18 +1,35 @@
 import asyncio
+import json
 import logging
 import time
 import uuid
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import FrozenInstanceError, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.core.config import settings
-
+from app.core.deadletters import DeadLetterStore, build_deadletter_store
+from app.core.idempotency import IdempotencyBackend, build_idempotency_backend
+from app.core.lanes import LaneQueue, lane_for_severity
+from app.core.retry import RetryJob, RetryScheduler
+from app.core.severity import payload_severity
 
 logger = logging.getLogger("GRACE_BUS")
 
 
-@dataclass(frozen=True)
+_ENVELOPE_FIELDS = ("version", "source", "type", "idempotency_key", "timestamp", "correlation_id", "payload")
+
+
 class EventEnvelope:
+    """Immutable bus event.
+
+    The public constructor validates its fields and is meant for the ingress
+    boundary (envelopes parsed from request bodies). Envelopes the app builds
+    itself from known-good values go through :meth:`trusted`, which skips
+    validation. ``__slots__`` keeps each instance free of a per-object ``__dict__``.
+    """
+
+    __slots__ = _ENVELOPE_FIELDS
+
     version: str
     source: str
     type: str
@@ -21,15 +38,90 @@ class EventEnvelope:
     correlation_id: str
     payload: Dict[str, Any]
 
-    def __post_init__(self) -> None:
-        if self.version != "v1":
+    def __init__(
+        self,
+        version: str,
+        source: str,
+        type: str,
+        idempotency_key: str,
+        timestamp: int,
+        correlation_id: str,
+        payload: Dict[str, Any],
+    ) -> None:
+        if version != "v1":
             raise ValueError("Unsupported envelope version")
-        if not self.source or not self.type:
+        if not source or not type:
             raise ValueError("Envelope requires source and type")
-        if not self.idempotency_key:
+        if not idempotency_key:
             raise ValueError("Envelope requires idempotency_key")
-        if not self.correlation_id:
+        if not correlation_id:
             raise ValueError("Envelope requires correlation_id")
+        _set = object.__setattr__
+        _set(self, "version", version)
+        _set(self, "source", source)
+        _set(self, "type", type)
+        _set(self, "idempotency_key", idempotency_key)
+        _set(self, "timestamp", timestamp)
+        _set(self, "correlation_id", correlation_id)
+        _set(self, "payload", payload)
+
+    @classmethod
+    def trusted(
+        cls,
+        *,
+        source: str,
+        type: str,
+        idempotency_key: str,
+        correlation_id: str,
+        payload: Dict[str, Any],
+        timestamp: Optional[int] = None,
+        version: str = "v1",
+    ) -> "EventEnvelope":
+        """Build an envelope from values the caller already knows are valid."""
+        envelope = object.__new__(cls)
+        _set = object.__setattr__
+        _set(envelope, "version", version)
+        _set(envelope, "source", source)
+        _set(envelope, "type", type)
+        _set(envelope, "idempotency_key", idempotency_key)
+        _set(envelope, "timestamp", int(time.time()) if timestamp is None else timestamp)
+        _set(envelope, "correlation_id", correlation_id)
+        _set(envelope, "payload", payload)
+        return envelope
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _ENVELOPE_FIELDS)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _ENVELOPE_FIELDS)
+        return f"EventEnvelope({fields})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict view; ``payload`` is shared, not deep-copied like ``asdict``."""
+        return {name: getattr(self, name) for name in _ENVELOPE_FIELDS}
+
+    def to_bytes(self) -> bytes:
+        """Compact UTF-8 JSON encoding."""
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass
+class HandlerOutcome:
+    handler: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    duration_ms: float = 0.0
 
 
 @dataclass
@@ -37,6 +129,7 @@ class PublishResult:
     status: str
     correlation_id: str
     envelope: EventEnvelope
+    handlers: List[HandlerOutcome] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -44,22 +137,217 @@ class _HandlerRegistration:
     source: Optional[str]
     event_type: Optional[str]
     handler: Callable[[EventEnvelope], Any]
+    timeout_seconds: Optional[float] = None
+    max_attempts: Optional[int] = None
+    batch: bool = False
+
+
+def _normalize_pattern(value: Optional[str]) -> Optional[str]:
+    if not value or value == "*":
+        return None
+    return value
+
+
+def _type_prefixes(event_type: str) -> List[str]:
+    """``ticket.escalation.created`` -> ``["ticket.", "ticket.escalation."]``."""
+    prefixes = []
+    index = event_type.find(".")
+    while index != -1:
+        prefixes.append(event_type[: index + 1])
+        index = event_type.find(".", index + 1)
+    return prefixes
+
+
+class _RoutingTable:
+    """Handler index compiled at subscribe time.
 
-    def matches(self, envelope: EventEnvelope) -> bool:
-        if self.source and self.source != envelope.source:
-            return False
-        if self.event_type and self.event_type != envelope.type:
-            return False
-        return True
+    Exact, source-only, type-only and catch-all registrations live in buckets keyed
+    by ``(source, type)`` with ``None`` as the wildcard; dotted-prefix patterns
+    (``ticket.*``) are keyed by ``(source, "ticket.")``. The resolved handler tuple
+    for each concrete ``(source, type)`` is memoised, so steady-state matching is a
+    single dict lookup per event.
+    """
+
+    _MAX_CACHED_ROUTES = 4096
+
+    def __init__(self) -> None:
+        self._buckets: Dict[Tuple[Optional[str], Optional[str]], List[Tuple[int, _HandlerRegistration]]] = {}
+        self._prefixes: Dict[Tuple[Optional[str], str], List[Tuple[int, _HandlerRegistration]]] = {}
+        self._routes: Dict[Tuple[str, str], Tuple[_HandlerRegistration, ...]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, registration: _HandlerRegistration) -> None:
+        entry = (self._count, registration)
+        self._count += 1
+        source = _normalize_pattern(registration.source)
+        event_type = _normalize_pattern(registration.event_type)
+        if event_type and event_type.endswith(".*"):
+            self._prefixes.setdefault((source, event_type[:-1]), []).append(entry)
+        else:
+            self._buckets.setdefault((source, event_type), []).append(entry)
+        self._routes.clear()
+
+    def match(self, envelope: EventEnvelope) -> Tuple[_HandlerRegistration, ...]:
+        key = (envelope.source, envelope.type)
+        route = self._routes.get(key)
+        if route is None:
+            route = self._resolve(*key)
+            if len(self._routes) >= self._MAX_CACHED_ROUTES:
+                self._routes.clear()
+            self._routes[key] = route
+        return route
+
+    def _resolve(self, source: str, event_type: str) -> Tuple[_HandlerRegistration, ...]:
+        entries: List[Tuple[int, _HandlerRegistration]] = []
+        for bucket_key in ((source, event_type), (source, None), (None, event_type), (None, None)):
+            entries.extend(self._buckets.get(bucket_key, ()))
+        if self._prefixes:
+            for prefix in _type_prefixes(event_type):
+                entries.extend(self._prefixes.get((source, prefix), ()))
+                entries.extend(self._prefixes.get((None, prefix), ()))
+        # Preserve subscription order across buckets.
+        entries.sort(key=lambda entry: entry[0])
+        return tuple(registration for _seq, registration in entries)
+
+
+def _handler_name(handler: Callable[..., Any]) -> str:
+    return getattr(handler, "__name__", "handler")
+
+
+def _csv_set(value: str) -> set:
+    return {part.strip() for part in (value or "").split(",") if part.strip()}
+
+
+def _overall_status(outcomes: List[HandlerOutcome]) -> str:
+    statuses = {outcome.status for outcome in outcomes}
+    if statuses & {"failed", "timeout"}:
+        return "failed"
+    if "retry_scheduled" in statuses:
+        return "retrying"
+    return "processed"
 
 
 class EventBus:
-    def __init__(self, ttl_seconds: Optional[int] = None) -> None:
-        self._handlers: List[_HandlerRegistration] = []
-        self._idempotency: Dict[str, float] = {}
-        self._deadletters: List[Dict[str, Any]] = []
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        dispatch_mode: Optional[str] = None,
+        max_idempotency_keys: Optional[int] = None,
+        idempotency_backend: Optional[IdempotencyBackend] = None,
+        deadletter_store: Optional[DeadLetterStore] = None,
+        retry_mode: Optional[str] = None,
+        retry_scheduler: Optional[RetryScheduler] = None,
+    ) -> None:
+        self._routes = _RoutingTable()
+        self.deadletters = deadletter_store or build_deadletter_store()
         self._ttl_seconds = ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS
-        self._max_deadletters = 200
+        self._idempotency = idempotency_backend or build_idempotency_backend(
+            self._ttl_seconds,
+            max_idempotency_keys or settings.IDEMPOTENCY_MAX_KEYS,
+        )
+        self._dispatch_mode = dispatch_mode
+        self._retry_mode = retry_mode
+        self._retries = retry_scheduler or RetryScheduler(
+            base_delay_seconds=settings.EVENT_BUS_RETRY_BASE_DELAY_SECONDS,
+            max_delay_seconds=settings.EVENT_BUS_RETRY_MAX_DELAY_SECONDS,
+            max_concurrency_per_handler=settings.EVENT_BUS_RETRY_MAX_CONCURRENCY,
+        )
+        self._queue: Optional[LaneQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self.statuses: Optional[Any] = None
+
+    @property
+    def dispatch_mode(self) -> str:
+        return self._dispatch_mode or settings.EVENT_BUS_DISPATCH_MODE
+
+    @property
+    def retry_mode(self) -> str:
+        return self._retry_mode or settings.EVENT_BUS_RETRY_MODE
+
+    @property
+    def queued(self) -> bool:
+        return self._queue is not None
+
+    async def start(self, *, workers: Optional[int] = None, queue_size: Optional[int] = None) -> None:
+        """Switch to queued mode: publish enqueues and a worker pool runs handlers."""
+        if self._queue is not None:
+            return
+        self._queue = LaneQueue(
+            queue_size or settings.EVENT_BUS_QUEUE_SIZE,
+            {
+                "critical": settings.EVENT_BUS_CRITICAL_CONCURRENCY,
+                "high": settings.EVENT_BUS_HIGH_CONCURRENCY,
+                "normal": settings.EVENT_BUS_NORMAL_CONCURRENCY,
+            },
+        )
+        worker_count = workers or settings.EVENT_BUS_WORKERS
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"event-bus-worker-{index}")
+            for index in range(worker_count)
+        ]
+        logger.info("event_bus_workers_started workers=%s queue_size=%s", worker_count, self._queue.maxsize)
+
+    async def stop(self, *, drain_timeout: Optional[float] = None) -> None:
+        """Drain queued envelopes (up to ``drain_timeout``) and stop the worker pool.
+
+        Retries still waiting in the scheduler are dead-lettered so they can be replayed.
+        """
+        if self._queue is not None:
+            await self._stop_workers(drain_timeout)
+        await self._retries.stop()
+
+    async def _stop_workers(self, drain_timeout: Optional[float]) -> None:
+        queue = self._queue
+        assert queue is not None
+        try:
+            await asyncio.wait_for(
+                queue.join(),
+                timeout=drain_timeout if drain_timeout is not None else settings.EVENT_BUS_DRAIN_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("event_bus_drain_timeout pending=%s", queue.qsize())
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        logger.info("event_bus_workers_stopped")
+
+    def track_statuses(self, store: Any) -> None:
+        """Report envelope progress to ``store`` (an ``EventStatusStore``) by correlation_id."""
+        self.statuses = store
+
+    async def _mark_status(self, envelope: EventEnvelope, status: str, **kwargs: Any) -> None:
+        if self.statuses is None:
+            return
+        try:
+            await self.statuses.mark(envelope.correlation_id, status, **kwargs)
+        except Exception as exc:
+            logger.warning(
+                "event_status_update_failed status=%s correlation_id=%s err=%s",
+                status,
+                envelope.correlation_id,
+                exc,
+            )
+
+    async def _settle_status(self, envelope: EventEnvelope, overall: str) -> None:
+        # "failed" was already recorded as dead_lettered when the handler gave up.
+        if overall == "processed":
+            await self._mark_status(envelope, "processed", only_from=("queued", "retrying"))
+        elif overall == "retrying":
+            await self._mark_status(envelope, "retrying", only_from=("queued",))
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def priority_for(self, envelope: EventEnvelope) -> str:
+        """Lane for ``envelope``: configured critical types first, then payload severity."""
+        if envelope.type in _csv_set(settings.EVENT_BUS_CRITICAL_TYPES):
+            return "critical"
+        return lane_for_severity(payload_severity(envelope.payload))
 
     def register_handler(
         self,
@@ -67,8 +355,14 @@ class EventBus:
         source: Optional[str] = None,
         event_type: Optional[str] = None,
         handler: Callable[[EventEnvelope], Any],
+        timeout_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        batch: bool = False,
     ) -> None:
-        self._handlers.append(_HandlerRegistration(source, event_type, handler))
+        """Subscribe ``handler``; with ``batch=True`` it receives a list of envelopes."""
+        self._routes.add(
+            _HandlerRegistration(source, event_type, handler, timeout_seconds, max_attempts, batch)
+        )
 
     def subscribe(self, event_type: str, handler: Callable[[EventEnvelope], Any]) -> None:
         self.register_handler(event_type=event_type, handler=handler)
@@ -79,75 +373,362 @@ class EventBus:
             if payload is None:
                 raise ValueError("Legacy publish requires payload")
             corr_id = correlation_id or str(uuid.uuid4())
-            envelope = EventEnvelope(
-                version="v1",
+            envelope = EventEnvelope.trusted(
                 source="legacy",
                 type=event_type,
                 idempotency_key=corr_id,
-                timestamp=int(time.time()),
                 correlation_id=corr_id,
                 payload=payload,
             )
 
-        self._purge_expired()
-
-        if self._is_duplicate(envelope.idempotency_key):
+        if not await self._idempotency.claim(envelope.idempotency_key):
             return PublishResult(status="duplicate", correlation_id=envelope.correlation_id, envelope=envelope)
 
-        self._mark_processed(envelope.idempotency_key)
+        if self._queue is not None:
+            await self._queue.put(self.priority_for(envelope), envelope)
+            return PublishResult(status="queued", correlation_id=envelope.correlation_id, envelope=envelope)
+
+        status, outcomes = await self._process(envelope)
+        return PublishResult(
+            status=status,
+            correlation_id=envelope.correlation_id,
+            envelope=envelope,
+            handlers=outcomes,
+        )
+
+    async def publish_many(self, envelopes: List[EventEnvelope]) -> List[PublishResult]:
+        """Publish a batch with one idempotency pass and one dispatch per handler group.
+
+        Results are returned in input order. Batch handlers get every matching
+        envelope in a single call; other handlers are invoked per envelope.
+        """
+        keys = list(dict.fromkeys(envelope.idempotency_key for envelope in envelopes))
+        claimed = await self._idempotency.claim_many(keys)
+
+        results: List[Optional[PublishResult]] = [None] * len(envelopes)
+        accepted: List[Tuple[int, EventEnvelope]] = []
+        for index, envelope in enumerate(envelopes):
+            if envelope.idempotency_key in claimed:
+                claimed.discard(envelope.idempotency_key)
+                accepted.append((index, envelope))
+            else:
+                results[index] = PublishResult(
+                    status="duplicate", correlation_id=envelope.correlation_id, envelope=envelope
+                )
+
+        if self._queue is not None:
+            for index, envelope in accepted:
+                await self._queue.put(self.priority_for(envelope), envelope)
+                results[index] = PublishResult(status="queued", correlation_id=envelope.correlation_id, envelope=envelope)
+            return [result for result in results if result is not None]
+
+        # Keyed by identity: the same handler subscribed twice is two registrations.
+        groups: Dict[int, Tuple[_HandlerRegistration, List[Tuple[int, EventEnvelope]]]] = {}
+        for index, envelope in accepted:
+            for registration in self._routes.match(envelope):
+                groups.setdefault(id(registration), (registration, []))[1].append((index, envelope))
+
+        group_calls = [self._dispatch_group(registration, members) for registration, members in groups.values()]
+        if self.dispatch_mode == "concurrent" and len(group_calls) > 1:
+            group_outcomes = await asyncio.gather(*group_calls)
+        else:
+            group_outcomes = [await call for call in group_calls]
+
+        outcomes_by_index: Dict[int, List[HandlerOutcome]] = {index: [] for index, _envelope in accepted}
+        for members_outcomes in group_outcomes:
+            for index, outcome in members_outcomes:
+                outcomes_by_index[index].append(outcome)
+
+        for index, envelope in accepted:
+            outcomes = outcomes_by_index[index]
+            if self.statuses is not None:
+                await self._settle_status(envelope, _overall_status(outcomes))
+            results[index] = PublishResult(
+                status=_overall_status(outcomes),
+                correlation_id=envelope.correlation_id,
+                envelope=envelope,
+                handlers=outcomes,
+            )
+        return [result for result in results if result is not None]
+
+    async def _dispatch_group(
+        self,
+        registration: _HandlerRegistration,
+        members: List[Tuple[int, EventEnvelope]],
+    ) -> List[Tuple[int, HandlerOutcome]]:
+        if not registration.batch:
+            return [(index, await self._dispatch(registration, envelope)) for index, envelope in members]
+
+        started = time.perf_counter()
+        batch = [envelope for _index, envelope in members]
+        max_attempts = registration.max_attempts or settings.EVENT_BUS_MAX_ATTEMPTS
+        timeout_seconds = registration.timeout_seconds or settings.EVENT_BUS_HANDLER_TIMEOUT_SECONDS
+        scheduled = self.retry_mode == "scheduled" and max_attempts > 1
+        success, error, attempts = await self._dispatch_with_retry(
+            registration.handler,
+            batch,
+            max_attempts=1 if scheduled else max_attempts,
+            timeout_seconds=timeout_seconds,
+        )
+        duration_ms = (time.perf_counter() - started) * 1000
+        name = _handler_name(registration.handler)
+        if success:
+            outcome = HandlerOutcome(handler=name, status="processed", attempts=attempts, duration_ms=duration_ms)
+            return [(index, outcome) for index, _envelope in members]
 
-        failures = []
-        for registration in self._handlers:
-            if registration.matches(envelope):
-                success, error = await self._dispatch_with_retry(registration.handler, envelope)
-                if not success:
-                    failures.append(error)
-                    self._record_deadletter(envelope, registration.handler, error)
+        if scheduled:
+            self._schedule_retry(registration, batch, attempts, max_attempts, timeout_seconds)
+            outcome = HandlerOutcome(
+                handler=name,
+                status="retry_scheduled",
+                attempts=attempts,
+                error=str(error) or type(error).__name__,
+                duration_ms=duration_ms,
+            )
+            return [(index, outcome) for index, _envelope in members]
+
+        for envelope in batch:
+            await self._record_deadletter(envelope, registration.handler, error)
+        outcome = HandlerOutcome(
+            handler=name,
+            status="timeout" if isinstance(error, asyncio.TimeoutError) else "failed",
+            attempts=attempts,
+            error=str(error) or type(error).__name__,
+            duration_ms=duration_ms,
+        )
+        return [(index, outcome) for index, _envelope in members]
+
+    async def _process(self, envelope: EventEnvelope) -> Tuple[str, List[HandlerOutcome]]:
+        matched = self._routes.match(envelope)
+        if self.dispatch_mode == "concurrent" and len(matched) > 1:
+            outcomes = list(
+                await asyncio.gather(*(self._dispatch(registration, envelope) for registration in matched))
+            )
+        else:
+            outcomes = [await self._dispatch(registration, envelope) for registration in matched]
 
-        status = "failed" if failures else "processed"
-        return PublishResult(status=status, correlation_id=envelope.correlation_id, envelope=envelope)
+        status = _overall_status(outcomes)
+        if self.statuses is not None:
+            await self._settle_status(envelope, status)
+        return status, outcomes
+
+    async def _worker(self, index: int) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            lane, envelope = await queue.get()
+            try:
+                status, _outcomes = await self._process(envelope)
+                if status not in {"processed", "retrying"}:
+                    logger.warning(
+                        "event_bus_worker_failed worker=%s lane=%s type=%s correlation_id=%s",
+                        index,
+                        lane,
+                        envelope.type,
+                        envelope.correlation_id,
+                    )
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("event_bus_worker_error worker=%s correlation_id=%s", index, envelope.correlation_id)
+            finally:
+                await queue.task_done(lane)
 
     def get_deadletters(self) -> List[Dict[str, Any]]:
-        return list(self._deadletters)
+        """Recent in-process dead letters (empty when a durable store is configured)."""
+        return list(getattr(self.deadletters, "entries", []))
+
+    async def replay_deadletters(
+        self,
+        entries: List[Dict[str, Any]],
+        *,
+        batch_size: Optional[int] = None,
+        interval_seconds: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """Re-dispatch dead letters to their original handler in rate-limited batches.
 
-    def _purge_expired(self) -> None:
-        now = time.time()
-        expired_keys = [key for key, exp in self._idempotency.items() if exp <= now]
-        for key in expired_keys:
-            self._idempotency.pop(key, None)
+        Replays bypass idempotency (the key was already claimed by the first delivery).
+        An entry is removed once its replay succeeds; a replay that fails again
+        (now or after a scheduled retry) updates the original entry.
+        """
+        size = max(1, batch_size or settings.DEADLETTER_REPLAY_BATCH_SIZE)
+        interval = settings.DEADLETTER_REPLAY_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        summary = {"replayed": 0, "processed": 0, "retry_scheduled": 0, "failed": 0, "skipped": 0}
 
-    def _is_duplicate(self, key: str) -> bool:
-        exp = self._idempotency.get(key)
-        return exp is not None and exp > time.time()
+        for offset in range(0, len(entries), size):
+            if offset:
+                await asyncio.sleep(interval)
+            batch = entries[offset : offset + size]
+            resolved_ids = []
+            for entry in batch:
+                envelope = entry["envelope"]
+                registration = next(
+                    (
+                        candidate
+                        for candidate in self._routes.match(envelope)
+                        if _handler_name(candidate.handler) == entry["handler"]
+                    ),
+                    None,
+                )
+                if registration is None:
+                    summary["skipped"] += 1
+                    continue
+                outcome = await self._dispatch(registration, envelope, replay_of=entry["id"])
+                summary["replayed"] += 1
+                if outcome.status == "processed":
+                    resolved_ids.append(entry["id"])
+                    summary["processed"] += 1
+                elif outcome.status == "retry_scheduled":
+                    summary["retry_scheduled"] += 1
+                else:
+                    summary["failed"] += 1
+            await self.deadletters.resolve(resolved_ids)
 
-    def _mark_processed(self, key: str) -> None:
-        self._idempotency[key] = time.time() + self._ttl_seconds
+        return summary
 
-    async def _dispatch_with_retry(self, handler: Callable[[EventEnvelope], Any], envelope: EventEnvelope) -> tuple[bool, Optional[Exception]]:
-        max_attempts = 3
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "idempotency": self._idempotency.stats(),
+            "queue_depth": self.queue_depth(),
+            "workers": len(self._workers),
+            "lanes": self._queue.stats() if self._queue is not None else {},
+            "retries": self._retries.stats(),
+        }
+
+    async def _dispatch(
+        self,
+        registration: _HandlerRegistration,
+        envelope: EventEnvelope,
+        *,
+        replay_of: Optional[int] = None,
+    ) -> HandlerOutcome:
+        started = time.perf_counter()
+        max_attempts = registration.max_attempts or settings.EVENT_BUS_MAX_ATTEMPTS
+        timeout_seconds = registration.timeout_seconds or settings.EVENT_BUS_HANDLER_TIMEOUT_SECONDS
+        scheduled = self.retry_mode == "scheduled" and max_attempts > 1
+        success, error, attempts = await self._dispatch_with_retry(
+            registration.handler,
+            [envelope] if registration.batch else envelope,
+            max_attempts=1 if scheduled else max_attempts,
+            timeout_seconds=timeout_seconds,
+        )
+        duration_ms = (time.perf_counter() - started) * 1000
+        name = _handler_name(registration.handler)
+        if success:
+            return HandlerOutcome(handler=name, status="processed", attempts=attempts, duration_ms=duration_ms)
+
+        error_text = str(error) or type(error).__name__
+        if scheduled:
+            self._schedule_retry(
+                registration, [envelope], attempts, max_attempts, timeout_seconds, replay_of=replay_of
+            )
+            return HandlerOutcome(
+                handler=name,
+                status="retry_scheduled",
+                attempts=attempts,
+                error=error_text,
+                duration_ms=duration_ms,
+            )
+
+        await self._record_deadletter(envelope, registration.handler, error, replay_of=replay_of)
+        return HandlerOutcome(
+            handler=name,
+            status="timeout" if isinstance(error, asyncio.TimeoutError) else "failed",
+            attempts=attempts,
+            error=error_text,
+            duration_ms=duration_ms,
+        )
+
+    def _schedule_retry(
+        self,
+        registration: _HandlerRegistration,
+        envelopes: List[EventEnvelope],
+        attempts: int,
+        max_attempts: int,
+        timeout_seconds: Optional[float],
+        *,
+        replay_of: Optional[int] = None,
+    ) -> None:
+        """Retry ``envelopes`` off-path; a batch handler gets them back as one batch.
+
+        ``replay_of`` is the dead-letter entry a replayed envelope came from.
+        """
+        handler = registration.handler
+        argument = envelopes if registration.batch else envelopes[0]
+
+        async def run() -> None:
+            await self._invoke(handler, argument, timeout_seconds)
+            for envelope in envelopes:
+                await self._mark_status(envelope, "processed", only_from=("retrying",))
+            if replay_of is not None:
+                await self.deadletters.resolve([replay_of])
+
+        async def on_exhausted(error: Exception) -> None:
+            for envelope in envelopes:
+                await self._record_deadletter(envelope, handler, error, replay_of=replay_of)
+
+        self._retries.schedule(
+            RetryJob(
+                name=_handler_name(handler),
+                attempt=attempts,
+                max_attempts=max_attempts,
+                run=run,
+                on_exhausted=on_exhausted,
+            )
+        )
+
+    async def _invoke(
+        self,
+        handler: Callable[..., Any],
+        argument: Any,
+        timeout_seconds: Optional[float],
+    ) -> None:
+        if asyncio.iscoroutinefunction(handler):
+            await asyncio.wait_for(handler(argument), timeout=timeout_seconds)
+        else:
+            handler(argument)
+
+    async def _dispatch_with_retry(
+        self,
+        handler: Callable[..., Any],
+        envelope: Any,
+        *,
+        max_attempts: int = 3,
+        timeout_seconds: Optional[float] = None,
+    ) -> Tuple[bool, Optional[Exception], int]:
         for attempt in range(1, max_attempts + 1):
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(envelope)
-                else:
-                    handler(envelope)
-                return True, None
+                await self._invoke(handler, envelope, timeout_seconds)
+                return True, None, attempt
             except Exception as exc:  # pragma: no cover - defensive
                 if attempt >= max_attempts:
-                    return False, exc
+                    return False, exc, attempt
                 await asyncio.sleep(0.1 * (2 ** (attempt - 1)))
-        return False, None
-
-    def _record_deadletter(self, envelope: EventEnvelope, handler: Callable[[EventEnvelope], Any], error: Exception) -> None:
-        entry = {
-            "envelope": envelope,
-            "handler": getattr(handler, "__name__", "handler"),
-            "error": str(error),
-            "timestamp": int(time.time()),
-        }
-        self._deadletters.append(entry)
-        if len(self._deadletters) > self._max_deadletters:
-            self._deadletters = self._deadletters[-self._max_deadletters :]
+        return False, None, max_attempts
+
+    async def _record_deadletter(
+        self,
+        envelope: EventEnvelope,
+        handler: Callable[[EventEnvelope], Any],
+        error: Exception,
+        *,
+        replay_of: Optional[int] = None,
+    ) -> None:
+        await self._mark_status(
+            envelope,
+            "dead_lettered",
+            detail=f"{_handler_name(handler)}: {str(error) or type(error).__name__}",
+        )
+        try:
+            if replay_of is not None:
+                await self.deadletters.replay_failed(replay_of, str(error))
+            else:
+                await self.deadletters.record(envelope, _handler_name(handler), str(error))
+        except Exception as exc:
+            logger.error(
+                "deadletter_record_failed handler=%s correlation_id=%s err=%s",
+                _handler_name(handler),
+                envelope.correlation_id,
+                exc,
+            )
 
 
 bus = EventBus()
@@ -0,0 +1,102 @@
+"""Shape-compiled field extraction for loosely keyed payloads.
+
+Webhook senders spell the same field several ways (``call_id`` / ``callId`` /
+``conversation_id`` ...), but any one sender produces only a few payload
+*shapes* (key sets). ``ShapeExtractor`` fingerprints a mapping's key set and,
+the first time it sees that shape, compiles a plan. For each field the plan
+keeps only the alternate keys that are actually present, in priority order.
+Later payloads of the same shape resolve each field with one or two dict
+lookups instead of probing every alias.
+
+Plans live in a bounded LRU. Each shape counts its hits, so a new or drifting
+payload format shows up in ``stats()``.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Sequence, Tuple
+
+_log = logging.getLogger("GRACE_BUS")
+
+_Plan = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+class _CompiledShape:
+    __slots__ = ("strings", "dicts", "hits")
+
+    def __init__(self, strings: _Plan, dicts: _Plan) -> None:
+        self.strings = strings
+        self.dicts = dicts
+        self.hits = 0
+
+
+class ShapeExtractor:
+    def __init__(
+        self,
+        name: str,
+        *,
+        strings: Mapping[str, Sequence[str]],
+        dicts: Optional[Mapping[str, Sequence[str]]] = None,
+        max_shapes: int = 256,
+    ) -> None:
+        self.name = name
+        self._strings = {field: tuple(keys) for field, keys in strings.items()}
+        self._dicts = {field: tuple(keys) for field, keys in (dicts or {}).items()}
+        self._max_shapes = max(1, max_shapes)
+        self._shapes: "OrderedDict[FrozenSet[str], _CompiledShape]" = OrderedDict()
+        self.compiled = 0
+        self.evictions = 0
+
+    def _compile(self, keys: FrozenSet[str]) -> _CompiledShape:
+        def plan(fields: Dict[str, Tuple[str, ...]]) -> _Plan:
+            return tuple(
+                (field, present)
+                for field, aliases in fields.items()
+                if (present := tuple(alias for alias in aliases if alias in keys))
+            )
+
+        shape = _CompiledShape(plan(self._strings), plan(self._dicts))
+        self._shapes[keys] = shape
+        self.compiled += 1
+        if len(self._shapes) > self._max_shapes:
+            self._shapes.popitem(last=False)
+            self.evictions += 1
+        _log.info("payload_shape_compiled extractor=%s keys=%s", self.name, sorted(keys))
+        return shape
+
+    def extract(self, mapping: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return ``{field: value}`` for string fields (stripped, non-empty) and dict fields.
+
+        Fields that are missing or empty are omitted.
+        """
+        keys = frozenset(mapping)
+        shape = self._shapes.get(keys)
+        if shape is None:
+            shape = self._compile(keys)
+        else:
+            self._shapes.move_to_end(keys)
+        shape.hits += 1
+
+        found: Dict[str, Any] = {}
+        for field, aliases in shape.strings:
+            for alias in aliases:
+                value = mapping[alias]
+                if isinstance(value, str) and value.strip():
+                    found[field] = value.strip()
+                    break
+        for field, aliases in shape.dicts:
+            for alias in aliases:
+                value = mapping[alias]
+                if isinstance(value, dict):
+                    found[field] = value
+                    break
+        return found
+
+    def stats(self, *, top: int = 20) -> Dict[str, Any]:
+        ranked = sorted(self._shapes.items(), key=lambda item: item[1].hits, reverse=True)[:top]
+        return {
+            "shapes": len(self._shapes),
+            "compiled": self.compiled,
+            "evictions": self.evictions,
+            "top": [{"keys": sorted(keys), "hits": shape.hits} for keys, shape in ranked],
+        }
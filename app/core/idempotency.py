@@ -0,0 +1,216 @@
+"""Idempotency backends used by the event bus.
+
+``IdempotencyStore`` is the in-process structure: keys live in an insertion/recency
+ordered map (for LRU eviction) and a min-heap of expiry times (for incremental
+expiry), so each operation is O(log n) instead of a full scan of every key seen
+within the TTL window.
+
+``SqlIdempotencyBackend`` shares claims across uvicorn workers through the
+``idempotency_keys`` table (Postgres in production, SQLite in tests).
+"""
+
+import heapq
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.upsert import dialect_insert
+
+_log = logging.getLogger("GRACE_BUS")
+
+
+class IdempotencyStore:
+    def __init__(self, ttl_seconds: int, max_size: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max(1, max_size)
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        expires_at = self._entries.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def purge_expired(self) -> int:
+        """Drop keys whose TTL has elapsed; only touches the expired heap prefix."""
+        now = time.time()
+        heap = self._expiry_heap
+        purged = 0
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            # Heap entries go stale when a key is re-marked or evicted; skip those.
+            if self._entries.get(key) == expires_at:
+                del self._entries[key]
+                purged += 1
+        self.expirations += purged
+        return purged
+
+    def seen(self, key: str) -> bool:
+        """Return True (and refresh recency) if ``key`` is live, counting hits/misses."""
+        if key in self:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key: str) -> None:
+        expires_at = time.time() + self._ttl_seconds
+        self._entries[key] = expires_at
+        self._entries.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        if len(self._expiry_heap) > 2 * max(len(self._entries), 1024):
+            self._compact()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _compact(self) -> None:
+        self._expiry_heap = [(expires_at, key) for key, expires_at in self._entries.items()]
+        heapq.heapify(self._expiry_heap)
+
+
+class IdempotencyBackend(ABC):
+    """Claims idempotency keys; ``claim`` returns False for a live duplicate."""
+
+    @abstractmethod
+    async def claim(self, key: str) -> bool:
+        ...
+
+    async def claim_many(self, keys: List[str]) -> Set[str]:
+        """Claim distinct ``keys`` in one pass; returns the subset newly claimed."""
+        return {key for key in keys if await self.claim(key)}
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+class InMemoryIdempotencyBackend(IdempotencyBackend):
+    def __init__(self, ttl_seconds: int, max_size: int) -> None:
+        self.store = IdempotencyStore(ttl_seconds, max_size)
+
+    async def claim(self, key: str) -> bool:
+        self.store.purge_expired()
+        if self.store.seen(key):
+            return False
+        self.store.add(key)
+        return True
+
+    async def claim_many(self, keys: List[str]) -> Set[str]:
+        self.store.purge_expired()
+        claimed = set()
+        for key in keys:
+            if not self.store.seen(key):
+                self.store.add(key)
+                claimed.add(key)
+        return claimed
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self.store.stats()}
+
+
+class SqlIdempotencyBackend(IdempotencyBackend):
+    """Cross-worker dedup via ``INSERT ... ON CONFLICT`` on ``idempotency_keys``.
+
+    A conflicting row only counts as a duplicate while it is unexpired; an expired
+    row is taken over in the same statement, so correctness never waits on cleanup.
+    Expired rows are deleted at most once per ``cleanup_interval_seconds``.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        *,
+        session_factory=None,
+        cleanup_interval_seconds: Optional[float] = None,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._session_factory = session_factory
+        self._cleanup_interval_seconds = (
+            cleanup_interval_seconds
+            if cleanup_interval_seconds is not None
+            else settings.IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS
+        )
+        self._last_cleanup = 0.0
+        self.claims = 0
+        self.duplicates = 0
+        self.cleaned = 0
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.db import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    async def claim(self, key: str) -> bool:
+        return key in await self.claim_many([key])
+
+    async def claim_many(self, keys: List[str]) -> Set[str]:
+        from app.models import IdempotencyKey
+
+        if not keys:
+            return set()
+        now = time.time()
+        expires_at = now + self._ttl_seconds
+        async with self._factory()() as db:
+            insert = dialect_insert(db)
+            stmt = insert(IdempotencyKey).values([{"key": key, "expires_at": expires_at} for key in keys])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IdempotencyKey.key],
+                set_={"expires_at": stmt.excluded.expires_at},
+                where=IdempotencyKey.expires_at <= now,
+            ).returning(IdempotencyKey.key)
+            result = await db.execute(stmt)
+            claimed = set(result.scalars().all())
+
+            if now - self._last_cleanup >= self._cleanup_interval_seconds:
+                self._last_cleanup = now
+                deleted = await db.execute(
+                    IdempotencyKey.__table__.delete().where(IdempotencyKey.expires_at <= now)
+                )
+                self.cleaned += max(deleted.rowcount or 0, 0)
+            await db.commit()
+
+        self.claims += len(claimed)
+        self.duplicates += len(keys) - len(claimed)
+        return claimed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "database",
+            "claims": self.claims,
+            "duplicates": self.duplicates,
+            "cleaned": self.cleaned,
+        }
+
+
+def build_idempotency_backend(ttl_seconds: int, max_size: int) -> IdempotencyBackend:
+    backend = (settings.IDEMPOTENCY_BACKEND or "memory").strip().lower()
+    if backend in {"database", "db", "postgres", "sql"}:
+        return SqlIdempotencyBackend(ttl_seconds)
+    if backend != "memory":
+        _log.warning("unknown IDEMPOTENCY_BACKEND=%s, falling back to memory", backend)
+    return InMemoryIdempotencyBackend(ttl_seconds, max_size)
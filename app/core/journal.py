@@ -0,0 +1,316 @@
+"""Local append-only journal for accepted webhook bodies.
+
+With ``WEBHOOK_JOURNAL_ENABLED`` set, every verified webhook body is appended
+here before the handler acts on it. A commit marker is written once the
+handler has produced its response. A process that dies in between leaves an
+append without a commit, and ``replay()`` re-drives those entries on the next
+startup. The Retell and Make stages are idempotent: the bus dedupes on the
+body digest, and Retell ingest upserts by ``call_id``. A re-drive of those
+at worst repeats work that had already finished. A re-driven staff
+escalation (async accept mode) can create its ticket a second time if the
+crash landed after the ticket commit.
+
+Layout: ``WEBHOOK_JOURNAL_DIR/slot-<n>/<first seq>.log``. Each worker process
+claims a slot with an exclusive ``flock``, so workers never share files, and
+a restarted worker re-claims and replays a slot left behind. Records are JSON
+lines, ``{"op": "a", ...}`` for appends and ``{"op": "c", "seq": n}`` for
+commits. Segments roll over at ``WEBHOOK_JOURNAL_SEGMENT_BYTES``.
+
+Appends wait for durability through a group commit: the first append opens
+a batch, and one ``fsync`` after ``WEBHOOK_JOURNAL_FSYNC_INTERVAL_MS`` covers
+every append written meanwhile. Commit markers are buffered and not fsynced,
+because losing one only causes a redundant replay. A segment is deleted once
+it is no longer active and every append in it is committed. Deletion is
+oldest-first, so a commit marker is never dropped while the entry it covers
+is still on disk.
+
+Blocking file work (slot scan, segment creation, ``fsync``, close, unlink)
+runs in the default executor. Rolls and batch flushes share one lock, so a
+batch never resolves before the segment its appends went to is synced.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+_log = logging.getLogger("GRACE_BUS")
+
+JournalHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"{first_seq:016d}.log"
+
+
+def _open_segment(path: Path):
+    handle = path.open("a", encoding="utf-8")
+    return handle, path.stat().st_size
+
+
+def _close_segment(handle) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+
+
+def _release_slot(lock) -> None:
+    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+    lock.close()
+
+
+def _unlink_all(paths: List[Path]) -> None:
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class WebhookJournal:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        *,
+        segment_bytes: Optional[int] = None,
+        fsync_interval_ms: Optional[int] = None,
+        max_slots: int = 64,
+    ) -> None:
+        self._directory = directory
+        self._segment_bytes = segment_bytes
+        self._fsync_interval_ms = fsync_interval_ms
+        self._max_slots = max_slots
+        self._slot_dir: Optional[Path] = None
+        self._slot_lock = None
+        self._file = None
+        self._active: Optional[Path] = None
+        self._active_size = 0
+        self._next_seq = 1
+        self._segments: "OrderedDict[Path, Set[int]]" = OrderedDict()
+        self._segment_of: Dict[int, Path] = {}
+        self._recovered: List[Dict[str, Any]] = []
+        self._sync_waiter: Optional[asyncio.Future] = None
+        self._sync_tasks: Set[asyncio.Future] = set()
+        self._io_lock = asyncio.Lock()
+        self.appended = 0
+        self.committed = 0
+        self.replayed = 0
+        self.fsyncs = 0
+        self.compacted_segments = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    async def open(self) -> int:
+        """Claim a slot, load its segments and start a fresh active segment.
+
+        Returns the number of uncommitted entries waiting for ``replay()``.
+        """
+        async with self._io_lock:
+            if not self.is_open:
+                await asyncio.get_running_loop().run_in_executor(None, self._open_sync)
+        return len(self._recovered)
+
+    def _open_sync(self) -> None:
+        root = Path(self._directory or settings.WEBHOOK_JOURNAL_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        self._claim_slot(root)
+        assert self._slot_dir is not None
+
+        pending: Dict[int, Dict[str, Any]] = {}
+        for path in sorted(self._slot_dir.glob("*.log")):
+            seqs: Set[int] = set()
+            with path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write; its append never acked.
+                        continue
+                    seq = int(record.get("seq") or 0)
+                    self._next_seq = max(self._next_seq, seq + 1)
+                    if record.get("op") == "a":
+                        pending[seq] = record
+                        seqs.add(seq)
+                        self._segment_of[seq] = path
+                    elif record.get("op") == "c":
+                        pending.pop(seq, None)
+            self._segments[path] = seqs
+        for path, seqs in self._segments.items():
+            seqs.intersection_update(pending)
+        self._recovered = [pending[seq] for seq in sorted(pending)]
+
+        self._active = self._slot_dir / _segment_name(self._next_seq)
+        self._file, self._active_size = _open_segment(self._active)
+        self._segments.setdefault(self._active, set())
+        _unlink_all(self._compactable())
+        if self._recovered:
+            _log.warning("WEBHOOK_JOURNAL_RECOVERED slot=%s pending=%s", self._slot_dir.name, len(self._recovered))
+
+    def _claim_slot(self, root: Path) -> None:
+        for index in range(self._max_slots):
+            slot = root / f"slot-{index}"
+            slot.mkdir(exist_ok=True)
+            handle = (slot / "lock").open("a+")
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                continue
+            self._slot_dir, self._slot_lock = slot, handle
+            return
+        raise RuntimeError(f"no free webhook journal slot under {root}")
+
+    async def _roll(self, segment_limit: int) -> None:
+        async with self._io_lock:
+            if self._active_size < segment_limit:
+                return  # another append rolled while this one waited
+            assert self._slot_dir is not None
+            loop = asyncio.get_running_loop()
+            path = self._slot_dir / _segment_name(self._next_seq)
+            handle, size = await loop.run_in_executor(None, _open_segment, path)
+            previous = self._file
+            self._file, self._active, self._active_size = handle, path, size
+            self._segments.setdefault(path, set())
+            # Appends written meanwhile went to the new segment; the old one is synced
+            # before any pending batch can resolve.
+            await loop.run_in_executor(None, _close_segment, previous)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._file.write(line)
+        self._active_size += len(line)
+
+    async def append(self, route: str, body: bytes, *, correlation_id: str, sha256: str) -> int:
+        """Durably record a verified body; returns its sequence number."""
+        if not self.is_open:
+            await self.open()
+        segment_limit = self._segment_bytes or settings.WEBHOOK_JOURNAL_SEGMENT_BYTES
+        if self._active_size >= segment_limit:
+            await self._roll(segment_limit)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._write(
+            {
+                "op": "a",
+                "seq": seq,
+                "route": route,
+                "correlation_id": correlation_id,
+                "sha256": sha256,
+                "ts": int(time.time()),
+                "body": body.decode("utf-8"),
+            }
+        )
+        self._segments[self._active].add(seq)
+        self._segment_of[seq] = self._active
+        self.appended += 1
+        await self._sync()
+        return seq
+
+    async def _sync(self) -> None:
+        if self._sync_waiter is None:
+            self._sync_waiter = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self._flush_batch(self._sync_waiter))
+            self._sync_tasks.add(task)
+            task.add_done_callback(self._sync_tasks.discard)
+        await asyncio.shield(self._sync_waiter)
+
+    async def _flush_batch(self, waiter: asyncio.Future) -> None:
+        interval = self._fsync_interval_ms if self._fsync_interval_ms is not None else settings.WEBHOOK_JOURNAL_FSYNC_INTERVAL_MS
+        if interval > 0:
+            await asyncio.sleep(interval / 1000.0)
+        # Appends after this point join the next batch.
+        self._sync_waiter = None
+        try:
+            async with self._io_lock:
+                self._file.flush()
+                await asyncio.get_running_loop().run_in_executor(None, os.fsync, self._file.fileno())
+            self.fsyncs += 1
+        except Exception as exc:
+            waiter.set_exception(exc)
+        else:
+            waiter.set_result(None)
+
+    def commit(self, seq: int) -> None:
+        """Mark ``seq`` as handled and delete segments that are fully committed."""
+        path = self._segment_of.pop(seq, None)
+        if path is None or not self.is_open:
+            return
+        # Buffered only; the next batch flush, roll or close writes it out.
+        self._write({"op": "c", "seq": seq})
+        self._segments.get(path, set()).discard(seq)
+        self.committed += 1
+        paths = self._compactable()
+        if paths:
+            future = asyncio.get_running_loop().run_in_executor(None, _unlink_all, paths)
+            self._sync_tasks.add(future)
+            future.add_done_callback(self._sync_tasks.discard)
+
+    def _compactable(self) -> List[Path]:
+        """Pop the leading segments that are inactive and fully committed."""
+        paths: List[Path] = []
+        while self._segments:
+            path, seqs = next(iter(self._segments.items()))
+            if seqs or path == self._active:
+                break
+            self._segments.popitem(last=False)
+            paths.append(path)
+        self.compacted_segments += len(paths)
+        return paths
+
+    async def replay(self, handlers: Dict[str, JournalHandler]) -> int:
+        """Re-drive entries recovered by ``open()`` and commit the ones that complete."""
+        entries, self._recovered = self._recovered, []
+        done = 0
+        for entry in entries:
+            handler = handlers.get(entry.get("route", ""))
+            if handler is None:
+                _log.warning("WEBHOOK_JOURNAL_NO_HANDLER route=%s seq=%s", entry.get("route"), entry.get("seq"))
+                continue
+            try:
+                await handler(entry)
+            except Exception as exc:
+                # Stays uncommitted and is retried on the next startup.
+                _log.warning("WEBHOOK_JOURNAL_REPLAY_FAILED seq=%s err=%s", entry.get("seq"), exc)
+                continue
+            self.commit(int(entry["seq"]))
+            done += 1
+        self.replayed += done
+        return done
+
+    async def close(self) -> None:
+        if self._sync_tasks:
+            await asyncio.gather(*self._sync_tasks, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        async with self._io_lock:
+            if self._file is not None:
+                handle, self._file = self._file, None
+                await loop.run_in_executor(None, _close_segment, handle)
+            await loop.run_in_executor(None, _unlink_all, self._compactable())
+            if self._slot_lock is not None:
+                lock, self._slot_lock = self._slot_lock, None
+                await loop.run_in_executor(None, _release_slot, lock)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.is_open,
+            "slot": self._slot_dir.name if self._slot_dir is not None else None,
+            "segments": len(self._segments),
+            "pending": sum(len(seqs) for seqs in self._segments.values()),
+            "appended": self.appended,
+            "committed": self.committed,
+            "replayed": self.replayed,
+            "fsyncs": self.fsyncs,
+            "compacted_segments": self.compacted_segments,
+        }
+
+
+webhook_journal = WebhookJournal()
@@ -0,0 +1,97 @@
+"""Priority lanes for the EventBus worker pool.
+
+Envelopes are queued per lane. Workers always take from the highest-priority
+lane that has work and spare concurrency, so a critical escalation is picked up
+ahead of any backlog of routine call updates. Each lane has its own
+concurrency limit and depth counters.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Sequence, Tuple
+
+LANES = ("critical", "high", "normal")
+
+_SEVERITY_LANES = {"critical": "critical", "high": "high", "medium": "normal", "low": "normal"}
+
+
+def lane_for_severity(severity: str) -> str:
+    return _SEVERITY_LANES.get(severity, "normal")
+
+
+class LaneQueue:
+    def __init__(self, maxsize: int, limits: Dict[str, int], lanes: Sequence[str] = LANES) -> None:
+        self._lanes = tuple(lanes)
+        self._maxsize = max(1, maxsize)
+        self._limits = {lane: max(1, limits.get(lane, 1)) for lane in self._lanes}
+        self._queues: Dict[str, Deque[Any]] = {lane: deque() for lane in self._lanes}
+        self._active = {lane: 0 for lane in self._lanes}
+        self._enqueued = {lane: 0 for lane in self._lanes}
+        self._processed = {lane: 0 for lane in self._lanes}
+        self._max_depth = {lane: 0 for lane in self._lanes}
+        self._size = 0
+        self._unfinished = 0
+        self._cond = asyncio.Condition()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def qsize(self) -> int:
+        return self._size
+
+    def full(self) -> bool:
+        return self._size >= self._maxsize
+
+    async def put(self, lane: str, item: Any) -> None:
+        if lane not in self._queues:
+            lane = self._lanes[-1]
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._size < self._maxsize)
+            queue = self._queues[lane]
+            queue.append(item)
+            self._size += 1
+            self._unfinished += 1
+            self._enqueued[lane] += 1
+            self._max_depth[lane] = max(self._max_depth[lane], len(queue))
+            self._idle.clear()
+            self._cond.notify_all()
+
+    async def get(self) -> Tuple[str, Any]:
+        async with self._cond:
+            while True:
+                for lane in self._lanes:
+                    if self._queues[lane] and self._active[lane] < self._limits[lane]:
+                        item = self._queues[lane].popleft()
+                        self._size -= 1
+                        self._active[lane] += 1
+                        self._cond.notify_all()
+                        return lane, item
+                await self._cond.wait()
+
+    async def task_done(self, lane: str) -> None:
+        async with self._cond:
+            self._active[lane] -= 1
+            self._processed[lane] += 1
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._idle.set()
+            self._cond.notify_all()
+
+    async def join(self) -> None:
+        await self._idle.wait()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            lane: {
+                "depth": len(self._queues[lane]),
+                "max_depth": self._max_depth[lane],
+                "active": self._active[lane],
+                "limit": self._limits[lane],
+                "enqueued": self._enqueued[lane],
+                "processed": self._processed[lane],
+            }
+            for lane in self._lanes
+        }
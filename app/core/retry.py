@@ -0,0 +1,136 @@
+"""Delayed retry scheduler for EventBus handlers.
+
+Failed handler invocations are parked in a min-heap keyed by due time and run by
+a single background task, so backoff never sleeps inside the publishing
+coroutine. Delays use exponential backoff with full jitter, and each handler
+name gets its own concurrency limit so a flaky integration cannot monopolise
+the event loop with retries.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+_log = logging.getLogger("GRACE_BUS")
+
+
+@dataclass
+class RetryJob:
+    name: str
+    attempt: int
+    max_attempts: int
+    run: Callable[[], Awaitable[Any]]
+    on_exhausted: Callable[[Exception], Awaitable[None]]
+
+
+class RetryScheduler:
+    def __init__(
+        self,
+        *,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 60.0,
+        max_concurrency_per_handler: int = 4,
+    ) -> None:
+        self._base_delay = base_delay_seconds
+        self._max_delay = max_delay_seconds
+        self._max_concurrency = max(1, max_concurrency_per_handler)
+        self._heap: List[Tuple[float, int, RetryJob]] = []
+        self._sequence = itertools.count()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.scheduled = 0
+        self.succeeded = 0
+        self.exhausted = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the retry following ``attempt``."""
+        ceiling = min(self._max_delay, self._base_delay * (2 ** max(attempt - 1, 0)))
+        return random.uniform(0, ceiling)
+
+    def schedule(self, job: RetryJob) -> None:
+        due = time.monotonic() + self.backoff(job.attempt)
+        heapq.heappush(self._heap, (due, next(self._sequence), job))
+        self.scheduled += 1
+        if self._stopping:
+            return  # stop() hands it to on_exhausted once in-flight attempts finish
+        self._ensure_runner()
+        assert self._wakeup is not None
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Stop the runner; retries that never ran are handed to ``on_exhausted``."""
+        # In-flight attempts that fail while we wait must not start a new runner.
+        self._stopping = True
+        try:
+            if self._runner is not None:
+                self._runner.cancel()
+                await asyncio.gather(self._runner, return_exceptions=True)
+                self._runner = None
+            if self._inflight:
+                await asyncio.gather(*self._inflight, return_exceptions=True)
+            pending, self._heap = self._heap, []
+            for _due, _seq, job in pending:
+                await self._exhaust(job, RuntimeError("retry_cancelled_on_shutdown"))
+        finally:
+            self._stopping = False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._heap),
+            "inflight": len(self._inflight),
+            "scheduled": self.scheduled,
+            "succeeded": self.succeeded,
+            "exhausted": self.exhausted,
+        }
+
+    def _ensure_runner(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run(), name="event-bus-retry-scheduler")
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _due, _seq, job = heapq.heappop(self._heap)
+                task = asyncio.create_task(self._attempt(job))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _attempt(self, job: RetryJob) -> None:
+        semaphore = self._semaphores.setdefault(job.name, asyncio.Semaphore(self._max_concurrency))
+        async with semaphore:
+            job.attempt += 1
+            try:
+                await job.run()
+            except Exception as exc:
+                if job.attempt >= job.max_attempts:
+                    await self._exhaust(job, exc)
+                else:
+                    self.schedule(job)
+                return
+        self.succeeded += 1
+
+    async def _exhaust(self, job: RetryJob, error: Exception) -> None:
+        self.exhausted += 1
+        try:
+            await job.on_exhausted(error)
+        except Exception:  # pragma: no cover - defensive
+            _log.exception("retry_exhausted_callback_failed handler=%s", job.name)
@@ -33,14 +33,13 @@ class SignatureExpiredError(SignatureError):
         super().__init__(code="expired_signature", message=message)
 
 
-def verify_hmac_signature(
+def check_signature_headers(
     *,
-    raw_body: bytes,
     timestamp: Optional[str | int],
     signature: Optional[str],
-    secret: str,
     tolerance_seconds: int,
 ) -> None:
+    """Validate the signature headers that do not depend on the body."""
     if not timestamp or not signature:
         raise SignatureMissingError()
 
@@ -53,11 +52,14 @@ def verify_hmac_signature(
     if abs(now - timestamp_int) > tolerance_seconds:
         raise SignatureExpiredError()
 
-    timestamp_str = str(timestamp)
-    message = timestamp_str.encode() + b"." + raw_body
-    expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
 
-    provided = str(signature).strip()
+def hmac_signer(secret: str, timestamp: str | int) -> "hmac.HMAC":
+    """HMAC state seeded with ``timestamp.``; feed it the body with ``update``."""
+    return hmac.new(secret.encode(), str(timestamp).encode() + b".", hashlib.sha256)
+
+
+def compare_hmac_signature(expected: str, signature: Optional[str]) -> None:
+    provided = str(signature or "").strip()
     if provided.lower().startswith("sha256="):
         provided = provided.split("=", 1)[1]
     provided = provided.lower()
@@ -66,6 +68,20 @@ def verify_hmac_signature(
         raise SignatureInvalidError()
 
 
+def verify_hmac_signature(
+    *,
+    raw_body: bytes,
+    timestamp: Optional[str | int],
+    signature: Optional[str],
+    secret: str,
+    tolerance_seconds: int,
+) -> None:
+    check_signature_headers(timestamp=timestamp, signature=signature, tolerance_seconds=tolerance_seconds)
+    signer = hmac_signer(secret, timestamp)
+    signer.update(raw_body)
+    compare_hmac_signature(signer.hexdigest(), signature)
+
+
 async def verify_retell_signature(request: Request) -> None:
     if not settings.RETELL_SIGNING_SECRET:
         return
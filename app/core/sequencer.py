@@ -0,0 +1,80 @@
+"""Per-key ordered execution with coalescing of pending updates.
+
+Work submitted for one key (for example a Retell ``call_id``) runs strictly in
+submission order on a single drainer task, while different keys run in
+parallel. While an item for a key is running, further coalescible items queue
+behind it. Consecutive coalescible items are merged, so only the latest state
+is written. Every caller still gets the result of the write that covered its
+item.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List
+
+
+@dataclass
+class _Pending:
+    value: Any
+    coalesce: bool
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+
+class KeyedSequencer:
+    def __init__(
+        self,
+        run: Callable[[Any], Awaitable[Any]],
+        *,
+        merge: Callable[[Any, Any], Any],
+    ) -> None:
+        self._run = run
+        self._merge = merge
+        self._pending: Dict[str, Deque[_Pending]] = {}
+        self._drainers: Dict[str, asyncio.Task] = {}
+        self.submitted = 0
+        self.coalesced = 0
+
+    async def submit(self, key: str, value: Any, *, coalesce: bool = False) -> Any:
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(key, deque())
+        tail = queue[-1] if queue else None
+        self.submitted += 1
+        if coalesce and tail is not None and tail.coalesce:
+            tail.value = self._merge(tail.value, value)
+            tail.waiters.append(waiter)
+            self.coalesced += 1
+        else:
+            queue.append(_Pending(value, coalesce, [waiter]))
+
+        if key not in self._drainers:
+            self._drainers[key] = asyncio.create_task(self._drain(key))
+        return await waiter
+
+    async def _drain(self, key: str) -> None:
+        queue = self._pending[key]
+        try:
+            while queue:
+                item = queue.popleft()
+                try:
+                    result = await self._run(item.value)
+                except Exception as exc:
+                    for waiter in item.waiters:
+                        if not waiter.done():
+                            waiter.set_exception(exc)
+                    continue
+                for waiter in item.waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+        finally:
+            self._drainers.pop(key, None)
+            if not queue:
+                self._pending.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active_keys": len(self._drainers),
+            "pending": sum(len(queue) for queue in self._pending.values()),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+        }
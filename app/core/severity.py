@@ -0,0 +1,33 @@
+"""Keyword severity classification shared by the dashboard API and the event bus."""
+
+from typing import Any, Optional
+
+CRITICAL_KEYWORDS = ("leak", "fire", "smoke", "flood", "bleed", "emergency")
+HIGH_KEYWORDS = ("refund", "cancel", "failed", "error", "charge", "angry", "complain")
+
+SEVERITY_LEVELS = ("critical", "high", "medium", "low")
+
+
+def derive_severity(text_value: Optional[str]) -> str:
+    text_lower = (text_value or "").lower()
+    if any(k in text_lower for k in CRITICAL_KEYWORDS):
+        return "critical"
+    if any(k in text_lower for k in HIGH_KEYWORDS):
+        return "high"
+    if text_lower.strip():
+        return "medium"
+    return "low"
+
+
+def payload_severity(payload: Any, *, text_keys=("issue", "summary", "text", "message")) -> str:
+    """Explicit ``severity``/``priority`` on a payload wins; otherwise classify its text."""
+    if not isinstance(payload, dict):
+        return "low"
+    for key in ("severity", "priority"):
+        value = payload.get(key)
+        if isinstance(value, str) and value.strip().lower() in SEVERITY_LEVELS:
+            return value.strip().lower()
+    text = " ".join(
+        value for value in (payload.get(key) for key in text_keys) if isinstance(value, str)
+    )
+    return derive_severity(text)
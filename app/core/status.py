@@ -0,0 +1,108 @@
+"""Processing status per ``correlation_id`` for 202-accepted webhooks.
+
+With ``WEBHOOK_ACCEPT_MODE=async``, a webhook records a ``queued`` row before
+it answers 202. The EventBus then moves that row forward as the envelope is
+handled: ``processed``, ``retrying`` (a scheduled retry is pending) or
+``dead_lettered``. ``failed`` means the request was rejected before it reached
+the bus, for example because Retell ingest failed.
+
+Transitions are conditional ``UPDATE``s, so a late ``processed`` never
+overwrites ``dead_lettered``. An envelope published without a status row
+(internal events, sync-mode requests) updates nothing.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import select, update
+
+from app.core.upsert import dialect_insert
+
+_log = logging.getLogger("GRACE_BUS")
+
+QUEUED = "queued"
+PROCESSED = "processed"
+RETRYING = "retrying"
+FAILED = "failed"
+DEAD_LETTERED = "dead_lettered"
+
+
+class EventStatusStore:
+    def __init__(self, *, session_factory=None) -> None:
+        self._session_factory = session_factory
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.db import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    async def record(self, correlation_id: str, *, source: str, type: str) -> None:
+        """Insert (or reset) the ``queued`` row for a newly accepted request."""
+        from app.models import EventStatus
+
+        now = datetime.utcnow()
+        async with self._factory()() as db:
+            stmt = dialect_insert(db)(EventStatus).values(
+                correlation_id=correlation_id,
+                source=source,
+                type=type,
+                status=QUEUED,
+                detail=None,
+                created_at=now,
+                updated_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EventStatus.correlation_id],
+                set_={"source": source, "type": type, "status": QUEUED, "detail": None, "updated_at": now},
+            )
+            await db.execute(stmt)
+            await db.commit()
+
+    async def mark(
+        self,
+        correlation_id: str,
+        status: str,
+        *,
+        detail: Optional[str] = None,
+        only_from: Optional[Sequence[str]] = None,
+    ) -> bool:
+        """Move ``correlation_id`` to ``status``; returns False when no row matched."""
+        from app.models import EventStatus
+
+        stmt = (
+            update(EventStatus)
+            .where(EventStatus.correlation_id == correlation_id)
+            .values(status=status, detail=detail, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if only_from is not None:
+            stmt = stmt.where(EventStatus.status.in_(list(only_from)))
+        async with self._factory()() as db:
+            result = await db.execute(stmt)
+            await db.commit()
+        return bool(result.rowcount)
+
+    async def get(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        from app.models import EventStatus
+
+        async with self._factory()() as db:
+            row = (
+                await db.execute(select(EventStatus).where(EventStatus.correlation_id == correlation_id))
+            ).scalars().first()
+        if row is None:
+            return None
+        return {
+            "correlation_id": row.correlation_id,
+            "source": row.source,
+            "type": row.type,
+            "status": row.status,
+            "detail": row.detail,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }
+
+
+event_statuses = EventStatusStore()
@@ -0,0 +1,52 @@
+"""Striped async locks keyed by string.
+
+``StripedLock`` maps a key (for example a Retell ``call_id``) to one of a
+fixed number of ``asyncio.Lock`` stripes using a stable hash. Same-key work
+is therefore serialized without a per-key lock table that grows forever.
+Unrelated keys that share a stripe also serialize, which is the cost of the
+fixed memory bound.
+
+``advisory_key`` derives the signed 64-bit key Postgres advisory locks take,
+for serializing the same key across worker processes.
+"""
+
+import asyncio
+import hashlib
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+
+def advisory_key(namespace: str, key: str) -> int:
+    digest = hashlib.blake2b(f"{namespace}:{key}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class StripedLock:
+    def __init__(self, stripes: int = 256) -> None:
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(max(1, stripes))]
+        self.acquisitions = 0
+        self.contended = 0
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock_for(self, key: str) -> asyncio.Lock:
+        return self._locks[zlib.crc32(key.encode("utf-8")) % len(self._locks)]
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        lock = self.lock_for(key)
+        self.acquisitions += 1
+        if lock.locked():
+            self.contended += 1
+        async with lock:
+            yield
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stripes": len(self._locks),
+            "held": sum(1 for lock in self._locks if lock.locked()),
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+        }
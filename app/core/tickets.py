@@ -0,0 +1,46 @@
+"""Structured ticket columns derived once from the issue text at write time.
+
+The dashboard used to re-derive source, severity and subject from
+``Escalation.issue`` on every poll. Writers now store them through
+``ticket_columns`` so list reads and filters use small indexed columns.
+Retell tickets classify severity from the call summary and transcript, which
+the issue may only reference.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+from app.core.severity import derive_severity
+
+SUBJECT_MAX_CHARS = 140
+
+_CALL_ID = re.compile(r"(?:^|[\s|])call_id=([^\s|]+)")
+
+
+def ticket_subject(issue: Optional[str]) -> str:
+    subject = issue.splitlines()[0].strip() if issue else ""
+    if len(subject) > SUBJECT_MAX_CHARS:
+        subject = subject[: SUBJECT_MAX_CHARS - 1] + "…"
+    return subject
+
+
+def ticket_columns(
+    issue: Optional[str],
+    *,
+    call_id: Optional[str] = None,
+    severity_text: Optional[str] = None,
+) -> Dict[str, Any]:
+    """``call_id``/``source``/``severity``/``subject`` for an ``Escalation`` with ``issue``.
+
+    ``severity_text``, when given, is classified instead of ``issue``.
+    """
+    text = issue or ""
+    if call_id is None:
+        match = _CALL_ID.search(text)
+        call_id = match.group(1) if match else None
+    return {
+        "call_id": call_id,
+        "source": "Voice" if call_id else "System",
+        "severity": derive_severity(text if severity_text is None else severity_text),
+        "subject": ticket_subject(text),
+    }
@@ -0,0 +1,21 @@
+"""Dialect-aware ``INSERT ... ON CONFLICT`` helpers.
+
+Postgres and SQLite both support ``ON CONFLICT`` (and ``RETURNING``), but
+SQLAlchemy exposes them through dialect-specific ``insert`` constructs.
+"""
+
+from typing import Any, Callable
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_name(db: Any) -> str:
+    """Return the dialect name for an AsyncSession, AsyncConnection or Engine."""
+    bind = db.get_bind() if hasattr(db, "get_bind") else db
+    return bind.dialect.name
+
+
+def dialect_insert(db: Any) -> Callable[..., Any]:
+    if dialect_name(db) == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
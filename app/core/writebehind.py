@@ -0,0 +1,122 @@
+"""Write-behind buffering of per-key row state.
+
+``WriteBehindBuffer`` keeps the latest pending changes per key in memory and
+hands them to a flush callback in batches. A flush happens when
+``interval_seconds`` has passed since the first buffered change, when
+``max_rows`` keys are pending, or when a caller forces it (for example on a
+terminal event). Changes identical to what was last flushed for a key are
+dropped as no-ops. A bounded LRU of written state backs that check.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+_log = logging.getLogger("GRACE_BUS")
+
+Row = Tuple[str, Dict[str, Any]]
+
+
+class WriteBehindBuffer:
+    def __init__(
+        self,
+        flush: Callable[[List[Row]], Awaitable[None]],
+        *,
+        interval_seconds: float,
+        max_rows: int,
+        max_tracked_keys: int = 10_000,
+    ) -> None:
+        self._flush_rows = flush
+        self._interval_seconds = interval_seconds
+        self._max_rows = max(1, max_rows)
+        self._max_tracked_keys = max(1, max_tracked_keys)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._written: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self.buffered = 0
+        self.noops = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.failures = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _is_noop(self, key: str, changes: Dict[str, Any]) -> bool:
+        if key in self._pending:
+            return False
+        written = self._written.get(key)
+        if written is None:
+            return False
+        return all(name in written and written[name] == value for name, value in changes.items())
+
+    async def put(self, key: str, changes: Dict[str, Any], *, force: bool = False) -> bool:
+        """Buffer ``changes`` for ``key``; returns False when they were a no-op.
+
+        ``force`` flushes everything pending (including this key) before returning.
+        """
+        if self._is_noop(key, changes):
+            self.noops += 1
+            if force and self._pending:
+                await self.flush()
+            return False
+
+        self._pending[key] = {**self._pending.get(key, {}), **changes}
+        self.buffered += 1
+        if force or len(self._pending) >= self._max_rows:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+        return True
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            rows = list(batch.items())
+            try:
+                await self._flush_rows(rows)
+            except Exception:
+                self.failures += 1
+                # Newer changes buffered during the failed flush win over the batch.
+                for key, changes in batch.items():
+                    self._pending[key] = {**changes, **self._pending.get(key, {})}
+                raise
+
+            for key, changes in rows:
+                self._written[key] = {**self._written.pop(key, {}), **changes}
+            while len(self._written) > self._max_tracked_keys:
+                self._written.popitem(last=False)
+            self.flushes += 1
+            self.rows_flushed += len(rows)
+            return len(rows)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._interval_seconds)
+        try:
+            await self.flush()
+        except Exception as exc:
+            _log.warning("write_behind_flush_failed rows=%s err=%s", len(self._pending), exc)
+            if self._pending:
+                self._timer = asyncio.create_task(self._flush_later())
+
+    async def stop(self) -> None:
+        """Cancel the timer and flush whatever is still pending."""
+        timer, self._timer = self._timer, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "buffered": self.buffered,
+            "noops": self.noops,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "failures": self.failures,
+        }
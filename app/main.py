@@ -7,7 +7,7 @@ import hashlib
 import hmac
 import time
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 import re
 from datetime import datetime
 from pathlib import Path
@@ -21,21 +21,35 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from app.core.admission import AdmissionController, AdmissionRejected
 from app.core.config import settings
 from app.core.events import EventEnvelope, bus, logger
+from app.core.journal import webhook_journal
+from app.core.status import FAILED, PROCESSED, QUEUED, event_statuses
+from app.core.tickets import ticket_columns
 from app.core.security import (
     SignatureExpiredError,
     SignatureInvalidError,
     SignatureMissingError,
-    verify_hmac_signature,
 )
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.body import WebhookBodyMiddleware, WebhookRoute, read_webhook_body
 from app.services import telegram_bot
 from app.services.openai_service import OpenAIService
 from app.services.make_integration import handle_make_trigger, send_make_webhook
 from .api.routes import router as dashboard_api_router
 from .db import AsyncSessionLocal
 from app.models import Escalation, Event
-from .retell_ingest import ingest_retell_webhook
+from .retell_ingest import (
+    call_locks,
+    call_sequencer,
+    extractor_stats,
+    flush_session_buffers,
+    ingest_retell_webhook,
+    ingest_retell_webhook_ordered,
+    session_buffer_stats,
+)
+from .ticket_pipeline import ticket_pipeline
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
@@ -51,8 +65,33 @@ async def lifespan(_app: FastAPI):
         bus.subscribe("ticket.created", telegram_bot.handle_ticket_created)
     if settings.ENABLE_MAKE_WEBHOOKS:
         bus.subscribe("ticket.created", handle_make_trigger)
+    if settings.EVENT_BUS_QUEUED:
+        await bus.start()
+    if settings.RETELL_TICKET_PIPELINE:
+        try:
+            recovered = await ticket_pipeline.recover()
+            if recovered:
+                logger.info("Re-queued %s analyzed calls awaiting tickets", recovered)
+        except Exception as e:
+            logger.warning("⚠️ Ticket pipeline recovery failed: %s", e)
+    if _accept_async():
+        bus.track_statuses(event_statuses)
+    if settings.WEBHOOK_JOURNAL_ENABLED or _accept_async():
+        try:
+            if await webhook_journal.open():
+                replayed = await webhook_journal.replay(
+                    {"retell": _replay_retell, "make": _replay_make, "escalate": _replay_escalate}
+                )
+                logger.info("Re-drove %s journaled webhooks", replayed)
+        except Exception as e:
+            logger.warning("⚠️ Webhook journal recovery failed: %s", e)
     logger.info("Grace AI Event Bus Online")
     yield
+    await _drain_accepted()
+    await flush_session_buffers()
+    await ticket_pipeline.stop()
+    await bus.stop()
+    await webhook_journal.close()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -97,6 +136,37 @@ def __build():
         "mark": BUILD_MARK,
     }
 
+RETELL_WEBHOOK_ROUTE = WebhookRoute(secret_setting="RETELL_SIGNING_SECRET")
+MAKE_WEBHOOK_ROUTE = WebhookRoute(secret_setting="MAKE_SIGNING_SECRET")
+UNSIGNED_WEBHOOK_ROUTE = WebhookRoute()
+
+# Added before AdmissionMiddleware so it runs inside it: shed requests are never read.
+app.add_middleware(
+    WebhookBodyMiddleware,
+    routes={
+        "/webhook": RETELL_WEBHOOK_ROUTE,
+        "/webhooks/retell/simulate": UNSIGNED_WEBHOOK_ROUTE,
+        "/webhooks/make/in": MAKE_WEBHOOK_ROUTE,
+        "/webhooks/make/in/batch": MAKE_WEBHOOK_ROUTE,
+        "/integrations/make/trigger": MAKE_WEBHOOK_ROUTE,
+        "/telegram-webhook": UNSIGNED_WEBHOOK_ROUTE,
+        "/staff/escalate": UNSIGNED_WEBHOOK_ROUTE,
+    },
+)
+
+admission = AdmissionController(queue_depth=bus.queue_depth)
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission,
+    routes={
+        "/webhook": "retell",
+        "/webhooks/retell/simulate": "retell",
+        "/webhooks/make/in": "make",
+        "/webhooks/make/in/batch": "make",
+        "/telegram-webhook": "telegram",
+    },
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -136,6 +206,149 @@ def _auth_error(required_header: str, reason: str) -> JSONResponse:
     )
 
 
+def _verify_make_ingress_signature(body) -> JSONResponse | None:
+    try:
+        body.verify()
+    except SignatureMissingError:
+        return _error_response(401, "missing_signature")
+    except SignatureExpiredError:
+        return _error_response(401, "expired_signature")
+    except SignatureInvalidError:
+        return _error_response(401, "invalid_signature")
+    return None
+
+
+def _accept_async() -> bool:
+    return (settings.WEBHOOK_ACCEPT_MODE or "sync").strip().lower() == "async"
+
+
+async def _journal_append(route: str, body, correlation_id: str) -> int | None:
+    """Journal a verified body before it is processed; ``None`` when journaling is off."""
+    if not (settings.WEBHOOK_JOURNAL_ENABLED or _accept_async()):
+        return None
+    return await webhook_journal.append(route, body.raw, correlation_id=correlation_id, sha256=body.sha256)
+
+
+def _journal_commit(seq: int | None) -> None:
+    if seq is not None:
+        webhook_journal.commit(seq)
+
+
+_accepted_tasks: set[asyncio.Task] = set()
+_accept_semaphore: asyncio.Semaphore | None = None
+
+
+def _accept_limiter() -> asyncio.Semaphore:
+    global _accept_semaphore
+    if _accept_semaphore is None:
+        _accept_semaphore = asyncio.Semaphore(max(1, settings.WEBHOOK_ACCEPT_MAX_CONCURRENCY))
+    return _accept_semaphore
+
+
+async def _accept_for_processing(
+    route: str,
+    body,
+    *,
+    correlation_id: str,
+    source: str,
+    event_type: str,
+    process,
+) -> JSONResponse:
+    """Journal ``body``, record it as queued and answer 202; ``process()`` runs in the background.
+
+    Background runs share ``WEBHOOK_ACCEPT_MAX_CONCURRENCY`` and stay counted
+    as in flight for the route's admission source until they finish.
+    """
+    try:
+        release = admission.hold(route, limit=settings.WEBHOOK_ACCEPT_MAX_BACKLOG)
+    except AdmissionRejected as exc:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "overloaded", "source": exc.source, "reason": exc.reason},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    try:
+        seq = await _journal_append(route, body, correlation_id)
+    except Exception:
+        release()
+        return _error_response(503, "webhook_journal_unavailable", correlation_id=correlation_id)
+    try:
+        await event_statuses.record(correlation_id, source=source, type=event_type)
+    except Exception:
+        release()
+        # The caller retries on 503, so this copy must not be replayed as well.
+        _journal_commit(seq)
+        return _error_response(503, "event_status_unavailable", correlation_id=correlation_id)
+
+    task = asyncio.create_task(_run_accepted(seq, correlation_id, process, release))
+    _accepted_tasks.add(task)
+    task.add_done_callback(_accepted_tasks.discard)
+    return JSONResponse(
+        status_code=202,
+        content={
+            "status": QUEUED,
+            "correlation_id": correlation_id,
+            "status_url": f"/events/status/{correlation_id}",
+        },
+    )
+
+
+async def _run_accepted(seq: int | None, correlation_id: str, process, release) -> None:
+    try:
+        async with _accept_limiter():
+            response = await process()
+        if await _settle_accepted(correlation_id, response):
+            _journal_commit(seq)
+    except Exception as exc:
+        logger.warning("accepted_request_failed correlation_id=%s err=%s", correlation_id, exc)
+        # Left uncommitted in the journal: re-driven on the next startup.
+        await _mark_failed(correlation_id, str(exc) or type(exc).__name__)
+    finally:
+        release()
+
+
+async def _settle_accepted(correlation_id: str, response: JSONResponse) -> bool:
+    """Record the request-level outcome; returns False when the request should be re-driven."""
+    if bus.statuses is None:
+        return response.status_code < 500
+    content = json.loads(response.body or b"{}")
+    if response.status_code >= 400:
+        await _mark_failed(correlation_id, content.get("error") or str(response.status_code))
+        return response.status_code < 500
+    if content.get("status") == "duplicate":
+        try:
+            await event_statuses.mark(correlation_id, PROCESSED, detail="duplicate", only_from=(QUEUED,))
+        except Exception as exc:
+            logger.warning("event_status_update_failed correlation_id=%s err=%s", correlation_id, exc)
+    return True
+
+
+async def _mark_failed(correlation_id: str, detail: str) -> None:
+    try:
+        await event_statuses.mark(correlation_id, FAILED, detail=detail)
+    except Exception as exc:
+        logger.warning("event_status_update_failed correlation_id=%s err=%s", correlation_id, exc)
+
+
+async def _replay_accepted(correlation_id: str, process) -> None:
+    if bus.statuses is not None:
+        await event_statuses.mark(correlation_id, QUEUED, only_from=(FAILED,))
+    response = await process()
+    if not await _settle_accepted(correlation_id, response):
+        raise RuntimeError(f"replay_failed status={response.status_code}")
+
+
+async def _drain_accepted() -> None:
+    global _accept_semaphore
+    if _accepted_tasks:
+        _done, pending = await asyncio.wait(set(_accepted_tasks), timeout=settings.EVENT_BUS_DRAIN_TIMEOUT_SECONDS)
+        if pending:
+            # Unfinished requests stay uncommitted in the journal and are re-driven on startup.
+            logger.warning("accepted_request_drain_timeout pending=%s", len(pending))
+    # The semaphore binds to the running loop; the next startup makes a new one.
+    _accept_semaphore = None
+
+
 def _parse_envelope(data: dict) -> EventEnvelope | None:
     try:
         return EventEnvelope(**data)
@@ -195,11 +408,86 @@ def health_check():
     return {"status": "healthy", "service": "Grace Hotel AI"}
 
 @app.get("/events/deadletter")
-def get_deadletters(request: Request):
+async def get_deadletters(
+    request: Request,
+    limit: int = 50,
+    before_id: int | None = None,
+    handler: str | None = None,
+):
     admin_error = _require_admin_token(request)
     if admin_error:
         return admin_error
-    return JSONResponse(status_code=200, content={"deadletters": bus.get_deadletters()})
+    page_size = min(max(limit, 1), 200)
+    entries = await bus.deadletters.list(limit=page_size, before_id=before_id, handler=handler)
+    next_before_id = entries[-1]["id"] if len(entries) == page_size else None
+    return JSONResponse(
+        status_code=200,
+        content={"deadletters": entries, "next_before_id": next_before_id},
+    )
+
+@app.post("/events/deadletter/replay")
+async def replay_deadletters(request: Request):
+    admin_error = _require_admin_token(request)
+    if admin_error:
+        return admin_error
+
+    try:
+        data = await request.json()
+    except Exception:
+        return _error_response(400, "invalid_json")
+    if not isinstance(data, dict):
+        return _error_response(400, "invalid_request")
+
+    ids = data.get("ids")
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+        return _error_response(400, "invalid_request")
+    handler = data.get("handler")
+    if ids is None and not handler:
+        # Refuse an unfiltered replay-everything request.
+        return _error_response(400, "replay_filter_required")
+
+    try:
+        limit = min(max(int(data.get("limit", 100)), 1), 1000)
+        since = int(data["since"]) if data.get("since") is not None else None
+        until = int(data["until"]) if data.get("until") is not None else None
+        batch_size = int(data["batch_size"]) if data.get("batch_size") is not None else None
+    except (TypeError, ValueError):
+        return _error_response(400, "invalid_request")
+
+    entries = await bus.deadletters.select(ids=ids, handler=handler, since=since, until=until, limit=limit)
+    summary = await bus.replay_deadletters(entries, batch_size=batch_size)
+    return JSONResponse(status_code=200, content={"status": "replayed", **summary})
+
+@app.get("/events/status/{correlation_id}")
+async def get_event_status(request: Request, correlation_id: str):
+    admin_error = _require_admin_token(request)
+    if admin_error:
+        return admin_error
+    status = await event_statuses.get(correlation_id)
+    if status is None:
+        return _error_response(404, "status_not_found", correlation_id=correlation_id)
+    return JSONResponse(status_code=200, content=status)
+
+@app.get("/events/stats")
+def get_event_bus_stats(request: Request):
+    admin_error = _require_admin_token(request)
+    if admin_error:
+        return admin_error
+    return JSONResponse(
+        status_code=200,
+        content={
+            **bus.get_stats(),
+            "retell_ingest": {
+                **call_sequencer.stats(),
+                "session_buffer": session_buffer_stats(),
+                "ticket_pipeline": ticket_pipeline.stats(),
+                "payload_shapes": extractor_stats(),
+                "call_locks": call_locks.stats(),
+            },
+            "admission": admission.stats(),
+            "webhook_journal": webhook_journal.stats(),
+        },
+    )
 
 @app.post("/webhooks/make/in")
 async def make_ingress(request: Request):
@@ -209,34 +497,38 @@ async def make_ingress(request: Request):
     if not settings.MAKE_SIGNING_SECRET:
         return _error_response(503, "make_signing_secret_missing")
 
-    raw_body = await request.body()
-    timestamp = request.headers.get("X-Signature-Timestamp")
-    signature = request.headers.get("X-Signature")
+    body = await read_webhook_body(request, MAKE_WEBHOOK_ROUTE)
+    signature_error = _verify_make_ingress_signature(body)
+    if signature_error:
+        return signature_error
 
-    try:
-        verify_hmac_signature(
-            raw_body=raw_body,
-            timestamp=timestamp,
-            signature=signature,
-            secret=settings.MAKE_SIGNING_SECRET,
-            tolerance_seconds=settings.WEBHOOK_TIMESTAMP_TOLERANCE_SECONDS,
+    if not body.json_ok or not isinstance(body.json, dict):
+        return _error_response(400, "invalid_envelope")
+
+    envelope = _parse_envelope(body.json)
+    if not envelope:
+        return _error_response(400, "invalid_envelope")
+
+    if _accept_async():
+        return await _accept_for_processing(
+            "make",
+            body,
+            correlation_id=envelope.correlation_id,
+            source=envelope.source,
+            event_type=envelope.type,
+            process=lambda: _publish_make_envelope(envelope),
         )
-    except SignatureMissingError:
-        return _error_response(401, "missing_signature")
-    except SignatureExpiredError:
-        return _error_response(401, "expired_signature")
-    except SignatureInvalidError:
-        return _error_response(401, "invalid_signature")
 
     try:
-        data = await request.json()
+        seq = await _journal_append("make", body, envelope.correlation_id)
     except Exception:
-        return _error_response(400, "invalid_envelope")
+        return _error_response(503, "webhook_journal_unavailable", correlation_id=envelope.correlation_id)
+    response = await _publish_make_envelope(envelope)
+    _journal_commit(seq)
+    return response
 
-    envelope = _parse_envelope(data)
-    if not envelope:
-        return _error_response(400, "invalid_envelope")
 
+async def _publish_make_envelope(envelope: EventEnvelope) -> JSONResponse:
     result = await bus.publish(envelope)
     if result.status == "duplicate":
         return JSONResponse(
@@ -252,12 +544,85 @@ async def make_ingress(request: Request):
         content={"status": "accepted", "correlation_id": result.correlation_id},
     )
 
+
+async def _publish_make_batch(envelopes: list[EventEnvelope]) -> JSONResponse:
+    results = await bus.publish_many(envelopes)
+
+    if settings.ENABLE_TELEGRAM:
+        for result in results:
+            if result.status != "duplicate":
+                telegram_bot.record_event(result.envelope)
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "accepted",
+            "results": [
+                {
+                    "correlation_id": result.correlation_id,
+                    "status": "duplicate" if result.status == "duplicate" else "accepted",
+                }
+                for result in results
+            ],
+        },
+    )
+
+
+async def _replay_make(entry: dict) -> None:
+    data = json.loads(entry["body"])
+    if isinstance(data, dict) and "envelopes" not in data:
+        envelope = _parse_envelope(data)
+        if envelope:
+            await _replay_accepted(envelope.correlation_id, lambda: _publish_make_envelope(envelope))
+        return
+    items = data.get("envelopes") if isinstance(data, dict) else data
+    envelopes = [_parse_envelope(item) for item in items if isinstance(item, dict)]
+    await _publish_make_batch([envelope for envelope in envelopes if envelope])
+
+@app.post("/webhooks/make/in/batch")
+async def make_ingress_batch(request: Request):
+    if not settings.ENABLE_MAKE_WEBHOOKS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    if not settings.MAKE_SIGNING_SECRET:
+        return _error_response(503, "make_signing_secret_missing")
+
+    body = await read_webhook_body(request, MAKE_WEBHOOK_ROUTE)
+    signature_error = _verify_make_ingress_signature(body)
+    if signature_error:
+        return signature_error
+
+    if not body.json_ok:
+        return _error_response(400, "invalid_envelope")
+    data = body.json
+    if isinstance(data, dict):
+        data = data.get("envelopes")
+    if not isinstance(data, list) or not data:
+        return _error_response(400, "invalid_envelope")
+    if len(data) > settings.MAKE_BATCH_MAX_ENVELOPES:
+        return _error_response(413, "batch_too_large")
+
+    envelopes = []
+    for item in data:
+        envelope = _parse_envelope(item) if isinstance(item, dict) else None
+        if not envelope:
+            return _error_response(400, "invalid_envelope")
+        envelopes.append(envelope)
+
+    try:
+        seq = await _journal_append("make", body, envelopes[0].correlation_id)
+    except Exception:
+        return _error_response(503, "webhook_journal_unavailable")
+    response = await _publish_make_batch(envelopes)
+    _journal_commit(seq)
+    return response
+
 @app.post("/integrations/make/trigger")
 async def make_trigger(request: Request):
     if not settings.ENABLE_MAKE_WEBHOOKS:
         raise HTTPException(status_code=404, detail="Not Found")
 
-    raw_body = await request.body()
+    body = await read_webhook_body(request, MAKE_WEBHOOK_ROUTE)
     admin_header = request.headers.get("X-Admin-Token")
     admin_ok = False
 
@@ -269,16 +634,8 @@ async def make_trigger(request: Request):
 
     if not admin_ok:
         if settings.MAKE_SIGNING_SECRET:
-            timestamp = request.headers.get("X-Signature-Timestamp")
-            signature = request.headers.get("X-Signature")
             try:
-                verify_hmac_signature(
-                    raw_body=raw_body,
-                    timestamp=timestamp,
-                    signature=signature,
-                    secret=settings.MAKE_SIGNING_SECRET,
-                    tolerance_seconds=settings.WEBHOOK_TIMESTAMP_TOLERANCE_SECONDS,
-                )
+                body.verify()
             except SignatureMissingError:
                 return _auth_error("X-Signature", "missing_signature_headers")
             except SignatureExpiredError:
@@ -291,12 +648,10 @@ async def make_trigger(request: Request):
     if not settings.MAKE_WEBHOOK_URL:
         return _error_response(503, "make_webhook_url_missing")
 
-    try:
-        payload = json.loads(raw_body)
-    except Exception:
+    if not body.json_ok or not isinstance(body.json, dict):
         return _error_response(400, "invalid_envelope")
 
-    envelope = _parse_envelope(payload)
+    envelope = _parse_envelope(body.json)
     if not envelope:
         return _error_response(400, "invalid_envelope")
 
@@ -318,11 +673,10 @@ async def retell_simulate(request: Request):
     if not settings.ENABLE_RETELL_SIMULATION:
         raise HTTPException(status_code=404, detail="Not Found")
 
-    raw_body = await request.body()
-    try:
-        data = json.loads(raw_body)
-    except Exception:
+    body = await read_webhook_body(request, UNSIGNED_WEBHOOK_ROUTE)
+    if not body.json_ok:
         return _error_response(400, "invalid_json")
+    data = body.json
 
     envelope = None
     if isinstance(data, dict) and data.get("version") == "v1":
@@ -330,13 +684,11 @@ async def retell_simulate(request: Request):
         if not envelope:
             return _error_response(400, "invalid_envelope")
     else:
-        idempotency_key = hashlib.sha256(raw_body).hexdigest()
-        envelope = EventEnvelope(
-            version="v1",
+        idempotency_key = body.sha256
+        envelope = EventEnvelope.trusted(
             source="retell",
             type="call_simulated",
             idempotency_key=idempotency_key,
-            timestamp=int(time.time()),
             correlation_id=str(uuid.uuid4()),
             payload=data,
         )
@@ -401,9 +753,13 @@ async def test_make(request: Request):
 @app.get("/staff/recent-tickets")
 async def get_recent_tickets():
     from sqlalchemy import select as sa_select
+    from sqlalchemy.orm import undefer
     async with AsyncSessionLocal() as db:
         result = await db.execute(
-            sa_select(Escalation).order_by(Escalation.created_at.desc()).limit(20)
+            sa_select(Escalation)
+            .options(undefer(Escalation.issue))
+            .order_by(Escalation.created_at.desc())
+            .limit(20)
         )
         tickets = result.scalars().all()
         return [
@@ -439,15 +795,38 @@ async def get_stats():
 
 @app.post("/staff/escalate")
 async def create_ticket(request: Request):
-    data = await request.json()
+    body = await read_webhook_body(request, UNSIGNED_WEBHOOK_ROUTE)
+    if not body.json_ok or not isinstance(body.json, dict):
+        return _error_response(400, "invalid_json")
+    data = body.json
     correlation_id = str(uuid.uuid4())
+    if _accept_async():
+        return await _accept_for_processing(
+            "escalate",
+            body,
+            correlation_id=correlation_id,
+            source="legacy",
+            event_type="ticket.created",
+            process=lambda: _create_staff_ticket(data, correlation_id),
+        )
+    return await _create_staff_ticket(data, correlation_id)
+
+
+async def _replay_escalate(entry: dict) -> None:
+    data = json.loads(entry["body"])
+    await _replay_accepted(entry["correlation_id"], lambda: _create_staff_ticket(data, entry["correlation_id"]))
+
+
+async def _create_staff_ticket(data: dict, correlation_id: str) -> JSONResponse:
+    issue = data.get("issue", "Test Issue")
     async with AsyncSessionLocal() as db:
         new_ticket = Escalation(
             guest_name=data.get("guest_name", "Test Guest"),
             room_number=data.get("room_number", "101"),
-            issue=data.get("issue", "Test Issue"),
+            issue=issue,
             status="OPEN",
             sentiment=data.get("sentiment", "Neutral"),
+            **ticket_columns(issue if isinstance(issue, str) else str(issue)),
         )
         db.add(new_ticket)
         await db.commit()
@@ -460,7 +839,7 @@ async def create_ticket(request: Request):
         },
         correlation_id,
     )
-    return {"status": "Ticket Created", "correlation_id": correlation_id}
+    return JSONResponse(status_code=200, content={"status": "Ticket Created", "correlation_id": correlation_id})
 
 
 @app.delete("/staff/tickets/{ticket_id}")
@@ -481,18 +860,9 @@ async def handle_webhook(request: Request):
     if not settings.RETELL_SIGNING_SECRET:
         return _error_response(503, "retell_signing_secret_missing")
 
-    raw_body = await request.body()
-    timestamp = request.headers.get("X-Signature-Timestamp")
-    signature = request.headers.get("X-Signature")
-
+    body = await read_webhook_body(request, RETELL_WEBHOOK_ROUTE)
     try:
-        verify_hmac_signature(
-            raw_body=raw_body,
-            timestamp=timestamp,
-            signature=signature,
-            secret=settings.RETELL_SIGNING_SECRET,
-            tolerance_seconds=settings.WEBHOOK_TIMESTAMP_TOLERANCE_SECONDS,
-        )
+        body.verify()
     except SignatureMissingError:
         return _error_response(401, "missing_signature_headers")
     except SignatureExpiredError:
@@ -502,11 +872,44 @@ async def handle_webhook(request: Request):
             return _error_response(401, "timestamp_invalid_or_expired")
         return _error_response(401, "signature_mismatch")
 
+    if not body.json_ok:
+        return _error_response(400, "invalid_json")
+
+    correlation_id = str(uuid.uuid4())
+    if _accept_async():
+        payload = body.json
+        return await _accept_for_processing(
+            "retell",
+            body,
+            correlation_id=correlation_id,
+            source="retell",
+            event_type=_derive_retell_type(payload),
+            process=lambda: _process_retell_webhook(
+                payload, idempotency_key=body.sha256, correlation_id=correlation_id
+            ),
+        )
+
     try:
-        payload = json.loads(raw_body)
+        seq = await _journal_append("retell", body, correlation_id)
     except Exception:
-        return _error_response(400, "invalid_json")
+        return _error_response(503, "webhook_journal_unavailable", correlation_id=correlation_id)
+    response = await _process_retell_webhook(body.json, idempotency_key=body.sha256, correlation_id=correlation_id)
+    _journal_commit(seq)
+    return response
+
+
+async def _replay_retell(entry: dict) -> None:
+    await _replay_accepted(
+        entry["correlation_id"],
+        lambda: _process_retell_webhook(
+            json.loads(entry["body"]),
+            idempotency_key=entry["sha256"],
+            correlation_id=entry["correlation_id"],
+        ),
+    )
 
+
+async def _process_retell_webhook(payload: Any, *, idempotency_key: str, correlation_id: str) -> JSONResponse:
     event_type = _derive_retell_type(payload)
     call_id = payload.get("call_id") if isinstance(payload, dict) else None
     logging.getLogger("retell.webhook").info(
@@ -515,17 +918,16 @@ async def handle_webhook(request: Request):
         call_id or "unknown",
     )
 
-    envelope = EventEnvelope(
-        version="v1",
+    envelope = EventEnvelope.trusted(
         source="retell",
         type=event_type,
-        idempotency_key=hashlib.sha256(raw_body).hexdigest(),
-        timestamp=int(time.time()),
-        correlation_id=str(uuid.uuid4()),
+        idempotency_key=idempotency_key,
+        correlation_id=correlation_id,
         payload=payload,
     )
 
-    ingest_result = await ingest_retell_webhook(
+    ingest = ingest_retell_webhook_ordered if settings.RETELL_INGEST_ORDERED else ingest_retell_webhook
+    ingest_result = await ingest(
         payload,
         event_type=event_type,
         correlation_id=envelope.correlation_id,
@@ -665,10 +1067,10 @@ async def telegram_webhook(request: Request):
     if not hmac.compare_digest(provided, secret):
         return JSONResponse(status_code=401, content={"error": "telegram_secret_invalid"})
 
-    try:
-        data = await request.json()
-    except Exception:
+    body = await read_webhook_body(request, UNSIGNED_WEBHOOK_ROUTE)
+    if not body.json_ok or not isinstance(body.json, dict):
         return _error_response(400, "invalid_json")
+    data = body.json
 
     logger.info("telegram_webhook_received", extra={"payload": data})
 
@@ -800,10 +1202,10 @@ def _open_staff_ticket(reason: str, user_text: str | None = None, call_id: str |
         issue = f"{reason} | user_text={user_text}"
     if call_id:
         issue = f"{issue} | call_id={call_id}"
-    asyncio.ensure_future(_write_staff_ticket(issue))
+    asyncio.ensure_future(_write_staff_ticket(issue, call_id=call_id))
 
 
-async def _write_staff_ticket(issue: str) -> None:
+async def _write_staff_ticket(issue: str, *, call_id: str | None = None) -> None:
     try:
         async with AsyncSessionLocal() as db:
             t = Escalation(
@@ -812,6 +1214,7 @@ async def _write_staff_ticket(issue: str) -> None:
                 issue=issue,
                 status="OPEN",
                 sentiment="Neutral",
+                **ticket_columns(issue, call_id=call_id),
             )
             db.add(t)
             await db.commit()
@@ -902,6 +1305,124 @@ def _clarify() -> str:
 def _loop_break() -> str:
     return "Good afternoon, how may I assist you today?"
 
+_LLM_REPLY_TIMEOUT_SECONDS = 8.0
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+")
+
+
+class _GuardedReplyStream:
+    """Release streamed model text sentence by sentence through the response guards.
+
+    ``_apply_response_guards`` runs on every complete sentence (the policy
+    patterns are phrase-level and never span one). A sentence the guards
+    replace ends the reply: the replacement is said instead and later text is
+    dropped. Text that could still turn out to repeat one of the recent replies
+    is held back, so the loop-break substitution happens before any of it is
+    spoken.
+    """
+
+    def __init__(self, context: dict[str, Any], user_text: str, call_id: str | None, recent: list[str]) -> None:
+        self._context = context
+        self._user_text = user_text
+        self._call_id = call_id
+        self._recent = recent
+        self._buffer = ""
+        self._held = ""
+        self.spoken = ""
+        self.tripped = False
+
+    def feed(self, text: str) -> str:
+        """Add model text; returns the guarded text that is now safe to send."""
+        if self.tripped:
+            return ""
+        self._buffer += text
+        sentences = _SENTENCE_BOUNDARY.split(self._buffer)
+        self._buffer = sentences.pop()
+        return "".join(self._release(sentence + " ") for sentence in sentences)
+
+    def finish(self) -> str:
+        """Flush the trailing partial sentence and anything held back."""
+        out = ""
+        if self._buffer.strip() and not self.tripped:
+            out += self._release(self._buffer)
+        self._buffer = ""
+        if self._held:
+            held, self._held = self._held, ""
+            if held.strip() in self._recent:
+                held = _loop_break()
+            self.spoken += held
+            out += held
+        return out
+
+    def _release(self, sentence: str) -> str:
+        if self.tripped:
+            return ""
+        guarded = _apply_response_guards(sentence, self._context, self._user_text, self._call_id)
+        if guarded != sentence:
+            self.tripped = True
+            self._held = ""
+            if not self.spoken and guarded.strip() in self._recent:
+                guarded = _loop_break()
+            self.spoken += guarded
+            return guarded
+        self._held += sentence
+        candidate = (self.spoken + self._held).strip()
+        if any(prev.startswith(candidate) for prev in self._recent):
+            return ""
+        released, self._held = self._held, ""
+        self.spoken += released
+        return released
+
+
+async def _stream_model_reply(user_text: str):
+    """Yield Gemini reply text as it is generated; raises TimeoutError past the reply deadline."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    abandoned = False
+
+    def _push(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _produce() -> None:
+        try:
+            import google.generativeai as genai
+            model = genai.GenerativeModel("gemini-1.5-flash")
+            response = model.generate_content(
+                [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_text},
+                ],
+                stream=True,
+            )
+            for chunk in response:
+                if abandoned:
+                    break
+                text = getattr(chunk, "text", "") or ""
+                if text:
+                    _push(text)
+        except Exception as exc:
+            _push(exc)
+        finally:
+            _push(done)
+
+    producer = asyncio.ensure_future(asyncio.to_thread(_produce))
+    deadline = loop.time() + _LLM_REPLY_TIMEOUT_SECONDS
+    try:
+        while True:
+            item = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - loop.time()))
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        abandoned = True
+        if producer.done():
+            producer.result()
+
 # Voice WebSocket
 async def _retell_ws_handler(websocket: WebSocket, call_id: str | None = None) -> None:
     await websocket.accept()
@@ -952,54 +1473,60 @@ async def _retell_ws_handler(websocket: WebSocket, call_id: str | None = None) -
             state = _retell_state(call_id or "unknown")
             context = state["context"]
 
+            try:
+                resp_id_int = int(response_id_in)
+                response_counter = max(response_counter, resp_id_int)
+                response_id = resp_id_int
+            except Exception:
+                response_counter += 1
+                response_id = response_counter
+
+            async def send_partial(content: str) -> None:
+                if content:
+                    await websocket.send_json(
+                        {
+                            "response_id": response_id,
+                            "content": content,
+                            "content_complete": False,
+                            "end_call": False,
+                        }
+                    )
+
             if _is_unclear(user_text):
                 ai_reply = _clarify()
+                await send_partial(ai_reply)
             else:
-                ai_reply = ""
+                last_assistant = state["last_assistant"]
+                reply = _GuardedReplyStream(context, user_text, call_id, last_assistant[-2:])
                 if settings.google_api_key:
                     try:
-                        def _call_model() -> str:
-                            import google.generativeai as genai
-                            model = genai.GenerativeModel("gemini-1.5-flash")
-                            response = model.generate_content(
-                                [
-                                    {"role": "system", "content": SYSTEM_PROMPT},
-                                    {"role": "user", "content": user_text},
-                                ]
-                            )
-                            return (response.text or "").strip()
-
-                        ai_reply = await asyncio.wait_for(asyncio.to_thread(_call_model), timeout=8.0)
+                        # aclosing: a guard trip stops the producer thread too, not just this loop.
+                        async with aclosing(_stream_model_reply(user_text)) as chunks:
+                            async for chunk in chunks:
+                                await send_partial(reply.feed(chunk))
+                                if reply.tripped:
+                                    break
                     except asyncio.TimeoutError:
                         _open_staff_ticket("latency.llm_timeout", user_text, call_id)
                         logger.warning("Gemini AI API timeout")
-                        ai_reply = STILL_CHECKING_MESSAGE
+                        if not reply.spoken:
+                            await send_partial(reply.feed(STILL_CHECKING_MESSAGE))
                     except Exception as e:
                         logger.exception("Gemini AI API call failed: %s", e)
-                        ai_reply = ""
                 else:
                     logger.warning("GOOGLE_API_KEY is not set. Skipping AI generation.")
-                    ai_reply = ""
+                await send_partial(reply.finish())
 
-                if not ai_reply:
-                    ai_reply = "I'm experiencing a technical issue. How may I assist you today?"
+                if not reply.spoken.strip():
+                    reply = _GuardedReplyStream(context, user_text, call_id, last_assistant[-2:])
+                    await send_partial(reply.feed("I'm experiencing a technical issue. How may I assist you today?"))
+                    await send_partial(reply.finish())
 
-                last_assistant = state["last_assistant"]
-                ai_reply = _apply_response_guards(ai_reply, context, user_text, call_id)
-                if any(ai_reply.strip() == prev for prev in last_assistant[-2:]):
-                    ai_reply = _loop_break()
+                ai_reply = reply.spoken
                 last_assistant.append(ai_reply.strip())
                 if len(last_assistant) > 3:
                     del last_assistant[:-3]
 
-            try:
-                resp_id_int = int(response_id_in)
-                response_counter = max(response_counter, resp_id_int)
-                response_id = resp_id_int
-            except Exception:
-                response_counter += 1
-                response_id = response_counter
-
             logger.info(
                 "RETELL_WS_SEND call_id=%s response_id=%s preview=%s",
                 call_id,
@@ -1010,7 +1537,7 @@ async def _retell_ws_handler(websocket: WebSocket, call_id: str | None = None) -
             await websocket.send_json(
                 {
                     "response_id": response_id,
-                    "content": ai_reply,
+                    "content": "",
                     "content_complete": True,
                     "end_call": False,
                 }
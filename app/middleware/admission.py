@@ -0,0 +1,46 @@
+"""ASGI middleware that sheds webhook requests once their source is saturated."""
+
+import json
+from typing import Dict
+
+from app.core.admission import AdmissionController, AdmissionRejected
+
+
+class AdmissionMiddleware:
+    """Wrap the routes in ``routes`` (path -> source) in an admission slot.
+
+    Rejected requests get an immediate ``503`` with ``Retry-After`` without
+    reading the body or touching the database.
+    """
+
+    def __init__(self, app, *, controller: AdmissionController, routes: Dict[str, str]) -> None:
+        self.app = app
+        self.controller = controller
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send) -> None:
+        source = self.routes.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if source is None or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.slot(source):
+                await self.app(scope, receive, send)
+        except AdmissionRejected as exc:
+            await self._overloaded(send, exc)
+
+    async def _overloaded(self, send, exc: AdmissionRejected) -> None:
+        body = json.dumps({"error": "overloaded", "source": exc.source, "reason": exc.reason}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(exc.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
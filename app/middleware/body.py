@@ -0,0 +1,218 @@
+"""ASGI middleware that reads each webhook body exactly once.
+
+For the routes it wraps, ``WebhookBodyMiddleware`` consumes the request body
+chunk by chunk. Each chunk updates the SHA-256 state (the idempotency key) and,
+when the route is signed, an HMAC already seeded with ``timestamp.``. The body
+is capped at ``WEBHOOK_MAX_BODY_BYTES``. Once it is complete, it is parsed
+once with the stdlib ``json`` module, the same parser the handlers used
+before. The result is stored as a ``WebhookBody`` on
+``request.state.webhook_body``, and the buffered bytes are replayed
+downstream, so ``request.body()`` still works.
+
+Handlers call ``await read_webhook_body(request, route)``. It returns the
+state object, or reads the body itself when the middleware is not installed.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.security import (
+    SignatureError,
+    check_signature_headers,
+    compare_hmac_signature,
+    hmac_signer,
+)
+
+STATE_KEY = "webhook_body"
+
+
+@dataclass(frozen=True)
+class WebhookRoute:
+    """How to read one webhook route; ``secret_setting`` names the signing secret setting."""
+
+    secret_setting: Optional[str] = None
+    timestamp_header: str = "X-Signature-Timestamp"
+    signature_header: str = "X-Signature"
+    max_bytes: Optional[int] = None
+
+    def secret(self) -> Optional[str]:
+        return getattr(settings, self.secret_setting, None) if self.secret_setting else None
+
+    def limit(self) -> int:
+        return self.max_bytes if self.max_bytes is not None else settings.WEBHOOK_MAX_BODY_BYTES
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+_UNPARSED = object()
+
+
+class WebhookBody:
+    __slots__ = ("raw", "sha256", "json", "signature_error", "signed")
+
+    def __init__(
+        self,
+        *,
+        raw: bytes,
+        sha256: str,
+        parsed: Any,
+        signature_error: Optional[SignatureError],
+        signed: bool,
+    ) -> None:
+        self.raw = raw
+        self.sha256 = sha256
+        self.json = parsed
+        self.signature_error = signature_error
+        self.signed = signed
+
+    @property
+    def json_ok(self) -> bool:
+        return self.json is not _UNPARSED
+
+    def verify(self) -> None:
+        """Raise the signature failure recorded while the body streamed in, if any."""
+        if self.signature_error is not None:
+            raise self.signature_error
+
+
+def parse_json(raw: bytes) -> Any:
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return _UNPARSED
+
+
+class _BodyReader:
+    """Incremental digest/HMAC state for one request body."""
+
+    def __init__(self, route: WebhookRoute, headers: Dict[str, str]) -> None:
+        self.limit = route.limit()
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.signer = None
+        self.signature_error: Optional[SignatureError] = None
+        self.signature = headers.get(route.signature_header.lower())
+
+        secret = route.secret()
+        self.signed = bool(secret)
+        if self.signed:
+            timestamp = headers.get(route.timestamp_header.lower())
+            try:
+                check_signature_headers(
+                    timestamp=timestamp,
+                    signature=self.signature,
+                    tolerance_seconds=settings.WEBHOOK_TIMESTAMP_TOLERANCE_SECONDS,
+                )
+                self.signer = hmac_signer(secret, timestamp)
+            except SignatureError as exc:
+                self.signature_error = exc
+
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self.limit > 0 and self.size > self.limit:
+            raise BodyTooLarge()
+        self.chunks.append(chunk)
+        self.digest.update(chunk)
+        if self.signer is not None:
+            self.signer.update(chunk)
+
+    def finish(self) -> WebhookBody:
+        if self.signer is not None:
+            try:
+                compare_hmac_signature(self.signer.hexdigest(), self.signature)
+            except SignatureError as exc:
+                self.signature_error = exc
+        raw = b"".join(self.chunks)
+        return WebhookBody(
+            raw=raw,
+            sha256=self.digest.hexdigest(),
+            parsed=parse_json(raw),
+            signature_error=self.signature_error,
+            signed=self.signed,
+        )
+
+
+async def read_webhook_body(request, route: WebhookRoute) -> WebhookBody:
+    body = request.scope.get("state", {}).get(STATE_KEY)
+    if body is not None:
+        return body
+    reader = _BodyReader(route, {key.lower(): value for key, value in request.headers.items()})
+    async for chunk in request.stream():
+        reader.feed(chunk)
+    body = reader.finish()
+    request.scope.setdefault("state", {})[STATE_KEY] = body
+    return body
+
+
+class WebhookBodyMiddleware:
+    """Pre-read the POST bodies of ``routes`` (path -> ``WebhookRoute``).
+
+    Oversized bodies get a ``413`` as soon as the declared or streamed size
+    crosses the limit, before the handler runs.
+    """
+
+    def __init__(self, app, *, routes: Dict[str, WebhookRoute]) -> None:
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send) -> None:
+        route = self.routes.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if route is None or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        reader = _BodyReader(route, headers)
+        try:
+            declared = int(headers.get("content-length") or 0)
+        except ValueError:
+            declared = 0
+        try:
+            if reader.limit > 0 and declared > reader.limit:
+                raise BodyTooLarge()
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                reader.feed(message.get("body", b""))
+                if not message.get("more_body", False):
+                    break
+        except BodyTooLarge:
+            await self._too_large(send, reader.limit)
+            return
+
+        body = reader.finish()
+        scope.setdefault("state", {})[STATE_KEY] = body
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body.raw, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+    async def _too_large(self, send, limit: int) -> None:
+        payload = json.dumps({"error": "payload_too_large", "max_bytes": limit}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
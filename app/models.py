@@ -38,7 +38,9 @@ class CallSummaryRequest(BaseModel):  # pylint: disable=too-few-public-methods
 
 # --- SQLAlchemy Models ---
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, Float, Index, false
+from sqlalchemy.orm import deferred
+from app.core.compression import CompressedJSON, CompressedText
 from app.db import Base as DbBase
 
 class Escalation(DbBase):
@@ -46,10 +48,15 @@ class Escalation(DbBase):
     id = Column(Integer, primary_key=True, index=True)
     guest_name = Column(String, default="Unknown Guest")
     room_number = Column(String, default="Unknown")
-    issue = Column(Text)
+    issue = deferred(Column(CompressedText))
     status = Column(String, default="OPEN")
     sentiment = Column(String, default="Neutral")
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Derived from issue at write time (app.core.tickets.ticket_columns).
+    call_id = Column(String, nullable=True, index=True)
+    source = Column(String, nullable=True, index=True)
+    severity = Column(String, nullable=True, index=True)
+    subject = Column(String, nullable=True)
 
 class Event(DbBase):
     __tablename__ = "dashboard_events"
@@ -58,7 +65,7 @@ class Event(DbBase):
     type = Column(String, default="info")
     source = Column(String, default="system")
     text = Column(Text)
-    payload = Column(Text, nullable=True)
+    payload = deferred(Column(CompressedJSON, nullable=True))
 
 class CallSession(DbBase):
     __tablename__ = "call_sessions"
@@ -71,6 +78,31 @@ class CallSession(DbBase):
     transcript_snippet = Column(Text, default="")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class CallAnalysis(DbBase):
+    __tablename__ = "call_analyses"
+    id = Column(Integer, primary_key=True, index=True)
+    call_id = Column(String, nullable=False, unique=True, index=True)
+    ticket_id = Column(Integer, nullable=True)
+    # Set while the ticket pipeline owes this call a ticket; recover() reads only these.
+    ticket_pending = Column(Boolean, nullable=False, default=False, server_default=false(), index=True)
+    caller_name = Column(String, default="")
+    intent = Column(String, default="")
+    requested_service = Column(String, default="")
+    selected_time = Column(String, default="")
+    outcome = Column(String, default="")
+    summary = Column(Text, default="")
+    transcript = deferred(Column(CompressedText, default=""))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CallTranscriptTurn(DbBase):
+    __tablename__ = "call_transcript_turns"
+    call_id = Column(String, primary_key=True)
+    turn_index = Column(Integer, primary_key=True)
+    role = Column(String, default="")
+    content = Column(Text, default="")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class StaffMember(DbBase):
     __tablename__ = "staff_members"
     id = Column(String, primary_key=True, index=True)
@@ -81,3 +113,36 @@ class StaffMember(DbBase):
     status = Column(String, default="")
     languages = Column(Text, default="")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class IdempotencyKey(DbBase):
+    __tablename__ = "idempotency_keys"
+    key = Column(String, primary_key=True)
+    expires_at = Column(Float, nullable=False, index=True)
+
+class DeadLetter(DbBase):
+    __tablename__ = "event_deadletters"
+    id = Column(Integer, primary_key=True, index=True)
+    handler = Column(String, nullable=False)
+    source = Column(String, default="")
+    type = Column(String, default="")
+    idempotency_key = Column(String, default="")
+    correlation_id = Column(String, default="", index=True)
+    envelope = Column(Text)
+    error = Column(Text, default="")
+    timestamp = Column(Integer, nullable=False, index=True)
+    replay_count = Column(Integer, default=0)
+    replayed_at = Column(Integer, nullable=True)
+
+    __table_args__ = (Index("ix_event_deadletters_handler_timestamp", "handler", "timestamp"),)
+
+class EventStatus(DbBase):
+    __tablename__ = "event_statuses"
+    correlation_id = Column(String, primary_key=True)
+    source = Column(String, default="")
+    type = Column(String, default="")
+    status = Column(String, nullable=False, default="queued")
+    detail = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (Index("ix_event_statuses_status_updated_at", "status", "updated_at"),)
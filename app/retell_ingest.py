@@ -8,37 +8,87 @@ This is intentionally framework-agnostic (no FastAPI dependencies) so it can be:
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from datetime import datetime, timezone
 import re
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import DateTime, String, exists, func, literal, or_, select
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import insert as sa_insert
 
 from .db import AsyncSessionLocal
-from app.models import CallSession, Escalation
+from app.core.config import settings
+from app.core.extractor import ShapeExtractor
+from app.core.sequencer import KeyedSequencer
+from app.core.striped import StripedLock, advisory_key
+from app.core.tickets import ticket_columns
+from app.core.writebehind import WriteBehindBuffer
+from app.core.upsert import dialect_insert, dialect_name
+from app.models import CallAnalysis, CallSession, CallTranscriptTurn, Escalation
 
 _log = logging.getLogger("retell.ingest")
 
 
-def _first_str(mapping: dict[str, Any], keys: list[str]) -> str:
-    for key in keys:
-        value = mapping.get(key)
-        if isinstance(value, str) and value.strip():
-            return value.strip()
+_CALLER_NAME_KEYS = ("caller_name", "callerName", "name")
+_INTENT_KEYS = ("intent", "call_intent", "callIntent")
+_SERVICE_KEYS = ("requested_service", "requestedService", "service", "service_type")
+_TIME_KEYS = ("selected_time", "selectedTime", "time", "datetime", "date_time")
+_SUMMARY_KEYS = ("summary", "call_summary", "callSummary")
+
+# Compiled once per payload shape; see app.core.extractor.
+_payload_fields = ShapeExtractor(
+    "retell.payload",
+    strings={
+        "call_id": ("call_id", "callId", "conversation_id", "conversationId", "id"),
+        "from_contact": ("from", "from_number", "fromNumber", "from_contact", "caller"),
+        "intent": _INTENT_KEYS,
+        "caller_name": _CALLER_NAME_KEYS,
+        "requested_service": _SERVICE_KEYS,
+        "selected_time": _TIME_KEYS,
+        "outcome": ("outcome", "result"),
+        "summary": _SUMMARY_KEYS,
+    },
+    dicts={
+        "analysis": ("analysis", "call_analysis", "callAnalysis"),
+        "call": ("call",),
+    },
+)
+_analysis_fields = ShapeExtractor(
+    "retell.analysis",
+    strings={
+        "caller_name": _CALLER_NAME_KEYS,
+        "intent": _INTENT_KEYS,
+        "requested_service": _SERVICE_KEYS,
+        "selected_time": _TIME_KEYS,
+        "outcome": ("outcome", "call_outcome", "callOutcome", "result"),
+        "summary": _SUMMARY_KEYS,
+    },
+)
+_call_fields = ShapeExtractor("retell.call", strings={"call_id": ("call_id", "callId", "id")})
+
+
+def _call_id_from_fields(fields: dict[str, Any]) -> str:
+    call_id = fields.get("call_id")
+    if call_id:
+        return call_id
+    call_obj = fields.get("call")
+    if call_obj is not None:
+        return _call_fields.extract(call_obj).get("call_id", "")
     return ""
 
 
 def _extract_call_id(payload: Any) -> str:
     if not isinstance(payload, dict):
         return ""
-    call_id = _first_str(payload, ["call_id", "callId", "conversation_id", "conversationId", "id"])
-    if call_id:
-        return call_id
-    call_obj = payload.get("call")
-    if isinstance(call_obj, dict):
-        return _first_str(call_obj, ["call_id", "callId", "id"])
-    return ""
+    return _call_id_from_fields(_payload_fields.extract(payload))
+
+
+def extractor_stats() -> dict[str, Any]:
+    return {
+        extractor.name: extractor.stats()
+        for extractor in (_payload_fields, _analysis_fields, _call_fields)
+    }
 
 
 def _normalize_event_type(value: str) -> str:
@@ -53,6 +103,21 @@ def _normalize_event_type(value: str) -> str:
     return normalized
 
 
+def _turn_from_item(item: Any) -> tuple[str, str] | None:
+    if not isinstance(item, dict):
+        return None
+    role = item.get("role") or item.get("speaker") or item.get("type") or ""
+    content = item.get("content") or item.get("text") or item.get("message") or ""
+    if not isinstance(content, str) or not content.strip():
+        return None
+    return str(role).strip(), content.strip()
+
+
+def _turn_line(role: str, content: str) -> str:
+    prefix = role.title() if role else "Line"
+    return f"{prefix}: {content}"
+
+
 def _transcript_to_text(transcript: Any) -> str:
     if isinstance(transcript, str):
         return transcript.strip()
@@ -60,35 +125,86 @@ def _transcript_to_text(transcript: Any) -> str:
         return ""
     lines: list[str] = []
     for item in transcript:
-        if not isinstance(item, dict):
-            continue
-        role = item.get("role") or item.get("speaker") or item.get("type") or ""
-        content = item.get("content") or item.get("text") or item.get("message") or ""
-        if not isinstance(content, str) or not content.strip():
-            continue
-        prefix = str(role).strip().title() if role else "Line"
-        lines.append(f"{prefix}: {content.strip()}")
+        turn = _turn_from_item(item)
+        if turn is not None:
+            lines.append(_turn_line(*turn))
     return "\n".join(lines).strip()
 
 
 def _derive_snippet(text: str, *, max_len: int = 280) -> str:
+    """Keep the most recent ``max_len`` characters (the tail is what changed)."""
     cleaned = (text or "").strip()
     if len(cleaned) <= max_len:
         return cleaned
-    return cleaned[: max_len - 1] + "…"
+    return "…" + cleaned[-(max_len - 1) :].lstrip()
+
+
+def _tail_snippet(transcript: list[Any], *, max_len: int = 280) -> str:
+    """Snippet built from the last turns only, without rendering the whole transcript."""
+    lines: list[str] = []
+    size = 0
+    for item in reversed(transcript):
+        turn = _turn_from_item(item)
+        if turn is None:
+            continue
+        line = _turn_line(*turn)
+        lines.append(line)
+        size += len(line) + 1
+        if size > max_len:
+            break
+    return _derive_snippet("\n".join(reversed(lines)), max_len=max_len)
+
+
+_MAX_TRACKED_TRANSCRIPTS = 10_000
+# call_id -> number of raw transcript items already stored as turns.
+_stored_turns: OrderedDict[str, int] = OrderedDict()
+
+
+def _new_turn_rows(call_id: str, transcript: list[Any], now: datetime) -> list[dict[str, Any]]:
+    """Rows for transcript items this process has not stored yet, plus the last stored one.
+
+    ``turn_index`` is the item's position in Retell's list, which only grows,
+    so earlier turns never need to be re-read. The last stored turn is written
+    again because Retell keeps extending it while the speaker is talking.
+    After a restart the cursor starts at 0 and the upsert rewrites the
+    already-stored turns in place.
+    """
+    start = _stored_turns.get(call_id, 0)
+    if start > len(transcript):
+        start = 0
+    start = max(start - 1, 0)
+    rows: list[dict[str, Any]] = []
+    for index in range(start, len(transcript)):
+        turn = _turn_from_item(transcript[index])
+        if turn is not None:
+            rows.append(
+                {"call_id": call_id, "turn_index": index, "role": turn[0], "content": turn[1], "created_at": now}
+            )
+    return rows
+
+
+def _remember_turns(call_id: str, count: int) -> None:
+    _stored_turns[call_id] = max(count, _stored_turns.get(call_id, 0))
+    _stored_turns.move_to_end(call_id)
+    while len(_stored_turns) > _MAX_TRACKED_TRANSCRIPTS:
+        _stored_turns.popitem(last=False)
+
+
+def _turns_insert(insert):
+    table = CallTranscriptTurn.__table__
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.call_id, table.c.turn_index],
+        set_={"role": stmt.excluded.role, "content": stmt.excluded.content},
+    )
+
+
+def _transcript_reference(call_id: str) -> str:
+    return f"Stored as transcript turns: GET /api/calls/{call_id}/transcript"
 
 
 def _extract_analysis(payload: dict[str, Any]) -> dict[str, Any]:
-    analysis = payload.get("analysis")
-    if isinstance(analysis, dict):
-        return analysis
-    analysis = payload.get("call_analysis")
-    if isinstance(analysis, dict):
-        return analysis
-    analysis = payload.get("callAnalysis")
-    if isinstance(analysis, dict):
-        return analysis
-    return {}
+    return _payload_fields.extract(payload).get("analysis", {})
 
 
 def _build_ticket_issue(
@@ -101,6 +217,7 @@ def _build_ticket_issue(
     outcome: str,
     summary: str,
     transcript_text: str,
+    transcript_ref: str = "",
 ) -> str:
     parts: list[str] = []
     parts.append(f"call_id={call_id}")
@@ -118,6 +235,7 @@ def _build_ticket_issue(
     header = " | ".join(parts)
     body = summary.strip() if summary else ""
     transcript_block = transcript_text.strip() if transcript_text else ""
+    transcript_block = transcript_block or transcript_ref
     if transcript_block:
         transcript_block = f"\n\n---\nTRANSCRIPT\n{transcript_block}"
 
@@ -128,6 +246,208 @@ def _build_ticket_issue(
     return header.strip()
 
 
+_STATUS_BY_EVENT = {
+    "call_started": "Active",
+    "call_ended": "Ended",
+    "call_analyzed": "Analyzed",
+}
+
+_TERMINAL_EVENTS = {"call_ended", "call_analyzed"}
+
+_ANALYSIS_TEXT_FIELDS = (
+    "caller_name",
+    "intent",
+    "requested_service",
+    "selected_time",
+    "outcome",
+    "summary",
+    "transcript",
+)
+
+
+def _session_changes(
+    *,
+    normalized_type: str,
+    from_contact: str,
+    intent: str,
+    latency_ms: int | None,
+    snippet: str,
+) -> dict[str, Any]:
+    """The CallSession columns this event actually carries."""
+    changes: dict[str, Any] = {}
+    if from_contact:
+        changes["from_contact"] = from_contact
+    if intent:
+        changes["intent"] = intent
+    if latency_ms is not None:
+        changes["latency_ms"] = latency_ms
+    if snippet:
+        changes["transcript_snippet"] = snippet
+    if normalized_type in _STATUS_BY_EVENT:
+        changes["status"] = _STATUS_BY_EVENT[normalized_type]
+    return changes
+
+
+def _session_upsert(insert, columns):
+    """``INSERT ... ON CONFLICT (id) DO UPDATE`` of ``columns`` (plus ``updated_at``).
+
+    Parameters are bound at execute time, so one statement serves a single row
+    or an executemany batch whose rows all set the same ``columns``. Columns a
+    row leaves out fall back to their defaults on insert and are untouched on
+    update.
+    """
+    table = CallSession.__table__
+    stmt = insert(table)
+    excluded = stmt.excluded
+    set_ = {name: excluded[name] for name in columns}
+    set_["updated_at"] = excluded.updated_at
+    return stmt.on_conflict_do_update(index_elements=[table.c.id], set_=set_)
+
+
+def _session_row(call_id: str, changes: dict[str, Any], now: datetime) -> dict[str, Any]:
+    return {"id": call_id, "started_at": now, "updated_at": now, **changes}
+
+
+async def _flush_call_sessions(session_factory, rows: list[tuple[str, dict[str, Any]]]) -> None:
+    """Write buffered session state: one executemany per distinct column set."""
+    now = datetime.now(timezone.utc)
+    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for call_id, changes in rows:
+        groups.setdefault(tuple(sorted(changes)), []).append(_session_row(call_id, changes, now))
+    async with session_factory() as db:
+        insert = dialect_insert(db)
+        for columns, params in groups.items():
+            await db.execute(_session_upsert(insert, columns), params)
+        await db.commit()
+
+
+call_locks = StripedLock(settings.RETELL_INGEST_LOCK_STRIPES)
+
+_session_buffers: dict[Any, WriteBehindBuffer] = {}
+
+
+def _session_buffer(session_factory) -> WriteBehindBuffer:
+    buffer = _session_buffers.get(session_factory)
+    if buffer is None:
+        async def flush(rows: list[tuple[str, dict[str, Any]]]) -> None:
+            await _flush_call_sessions(session_factory, rows)
+
+        buffer = WriteBehindBuffer(
+            flush,
+            interval_seconds=settings.RETELL_SESSION_FLUSH_INTERVAL_MS / 1000,
+            max_rows=settings.RETELL_SESSION_FLUSH_MAX_ROWS,
+        )
+        _session_buffers[session_factory] = buffer
+    return buffer
+
+
+async def flush_session_buffers() -> None:
+    """Flush every write-behind CallSession buffer (called on shutdown)."""
+    for buffer in list(_session_buffers.values()):
+        try:
+            await buffer.stop()
+        except Exception as exc:
+            _log.warning("RETELL_SESSION_FLUSH_FAILED rows=%s err=%s", len(buffer), exc)
+
+
+def session_buffer_stats() -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for buffer in _session_buffers.values():
+        for name, value in buffer.stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def _severity_text(summary: str, transcript_text: str) -> str:
+    """What a call ticket's severity is classified from: the summary and the full transcript."""
+    return "\n".join(part for part in (summary, transcript_text) if part)
+
+
+def _ticket_insert(*, call_id: str, caller_name: str, issue: str, now: datetime, severity_text: str | None = None):
+    """Insert a ticket only while the call has no ticket yet; ``RETURNING id``."""
+    already_ticketed = exists().where(CallAnalysis.call_id == call_id, CallAnalysis.ticket_id.is_not(None))
+    columns = ticket_columns(issue, call_id=call_id, severity_text=severity_text)
+    rows = select(
+        literal(caller_name or "Unknown Caller", String),
+        literal("N/A", String),
+        literal(issue, Escalation.__table__.c.issue.type),
+        literal("OPEN", String),
+        literal("Neutral", String),
+        literal(now, DateTime),
+        *(literal(value, String) for value in columns.values()),
+    ).where(~already_ticketed)
+    return (
+        sa_insert(Escalation)
+        .from_select(
+            ["guest_name", "room_number", "issue", "status", "sentiment", "created_at", *columns],
+            rows,
+        )
+        .returning(Escalation.id)
+    )
+
+
+def _analysis_on_conflict(stmt):
+    """Non-empty incoming fields win and an existing ticket_id is kept."""
+    excluded = stmt.excluded
+    changes: dict[str, Any] = {
+        name: func.coalesce(func.nullif(excluded[name], ""), CallAnalysis.__table__.c[name])
+        for name in _ANALYSIS_TEXT_FIELDS
+    }
+    changes["ticket_id"] = func.coalesce(CallAnalysis.__table__.c.ticket_id, excluded.ticket_id)
+    changes["ticket_pending"] = or_(CallAnalysis.__table__.c.ticket_pending, excluded.ticket_pending)
+    changes["updated_at"] = excluded.updated_at
+    return stmt.on_conflict_do_update(index_elements=[CallAnalysis.call_id], set_=changes)
+
+
+def _analysis_upsert(
+    insert, *, call_id: str, fields: dict[str, str], ticket_id, now: datetime, ticket_pending: bool = False
+):
+    stmt = insert(CallAnalysis).values(
+        call_id=call_id,
+        ticket_id=ticket_id,
+        ticket_pending=ticket_pending,
+        created_at=now,
+        updated_at=now,
+        **fields,
+    )
+    return _analysis_on_conflict(stmt)
+
+
+async def _write_analysis(db, *, call_id: str, fields: dict[str, str], issue: str, now: datetime):
+    """Upsert the analysis and create its ticket at most once.
+
+    Postgres does both in one statement (the ticket insert is a data-modifying
+    CTE feeding the upsert). SQLite has no writable CTEs, so it runs the two
+    statements back to back in the same transaction. Returns
+    ``(ticket_id, created_ticket_id)``.
+    """
+    ticket = _ticket_insert(
+        call_id=call_id,
+        caller_name=fields["caller_name"],
+        issue=issue,
+        now=now,
+        severity_text=_severity_text(fields["summary"], fields["transcript"]),
+    )
+    insert = dialect_insert(db)
+
+    if dialect_name(db) == "postgresql":
+        new_ticket = ticket.cte("new_ticket")
+        created = select(new_ticket.c.id).scalar_subquery()
+        stmt = (
+            _analysis_upsert(insert, call_id=call_id, fields=fields, ticket_id=created, now=now)
+            .add_cte(new_ticket)
+            .returning(CallAnalysis.ticket_id, created.label("created_ticket_id"))
+        )
+        row = (await db.execute(stmt)).one()
+        return row.ticket_id, row.created_ticket_id
+
+    created_id = (await db.execute(ticket)).scalar_one_or_none()
+    stmt = _analysis_upsert(insert, call_id=call_id, fields=fields, ticket_id=created_id, now=now).returning(
+        CallAnalysis.ticket_id
+    )
+    return (await db.execute(stmt)).scalar_one(), created_id
+
+
 async def ingest_retell_webhook(
     payload: Any,
     *,
@@ -135,13 +455,18 @@ async def ingest_retell_webhook(
     correlation_id: str,
     session_factory=None,
 ) -> dict[str, Any]:
-    """Persist Retell call updates and (on analyzed) create a ticket exactly once."""
+    """Persist Retell call updates and (on analyzed) create a ticket exactly once.
+
+    The call session is written with a single upsert; on ``call_analyzed`` the
+    analysis upsert and ticket creation follow in one more statement (two on SQLite).
+    """
 
     if session_factory is None:
         session_factory = AsyncSessionLocal
 
     normalized_type = _normalize_event_type(event_type)
-    call_id = _extract_call_id(payload)
+    fields = _payload_fields.extract(payload) if isinstance(payload, dict) else {}
+    call_id = _call_id_from_fields(fields)
     if not call_id:
         _log.warning(
             "RETELL_INGEST_SKIP missing_call_id event_type=%s correlation_id=%s",
@@ -154,202 +479,213 @@ async def ingest_retell_webhook(
         payload = {"call_id": call_id}
 
     now = datetime.now(timezone.utc)
-    from_contact = _first_str(payload, ["from", "from_number", "fromNumber", "from_contact", "caller"])
-    intent = _first_str(payload, ["intent", "call_intent", "callIntent"])
+    from_contact = fields.get("from_contact", "")
+    intent = fields.get("intent", "")
     try:
         latency_ms = int(payload.get("latency_ms")) if payload.get("latency_ms") is not None else None
     except Exception:
         latency_ms = None
 
-    transcript_text = _transcript_to_text(payload.get("transcript"))
-    snippet = _derive_snippet(transcript_text)
-
-    async with session_factory() as db:
-        try:
-            result = await db.execute(select(CallSession).where(CallSession.id == call_id))
-            session = result.scalars().first()
-
-            if not session:
-                status = "Active"
-                if normalized_type == "call_ended":
-                    status = "Ended"
-                elif normalized_type == "call_analyzed":
-                    status = "Analyzed"
-                session = CallSession(
-                    id=call_id,
-                    from_contact=from_contact or "",
-                    status=status,
-                    intent=intent or "",
-                    latency_ms=latency_ms,
-                    started_at=now,
-                    transcript_snippet=snippet or "",
-                    updated_at=now,
-                )
-                db.add(session)
-            else:
-                if from_contact:
-                    session.from_contact = from_contact
-                if intent:
-                    session.intent = intent
-                if latency_ms is not None:
-                    session.latency_ms = latency_ms
-                if snippet:
-                    session.transcript_snippet = snippet
-                if normalized_type == "call_started":
-                    session.status = "Active"
-                elif normalized_type == "call_ended":
-                    session.status = "Ended"
-                elif normalized_type == "call_analyzed":
-                    session.status = "Analyzed"
-
-            ticket_id: int | None = None
-
-            if normalized_type == "call_analyzed":
-                analysis = _extract_analysis(payload)
-                summary = _first_str(payload, ["summary", "call_summary", "callSummary"]) or _first_str(
-                    analysis, ["summary", "call_summary", "callSummary"]
-                )
-                transcript_text = transcript_text or _transcript_to_text(analysis.get("transcript"))
-                snippet = snippet or _derive_snippet(transcript_text)
-                if snippet:
-                    session.transcript_snippet = snippet
-
-                caller_name = _first_str(payload, ["caller_name", "callerName", "name"]) or _first_str(
-                    analysis, ["caller_name", "callerName", "name"]
-                )
-                intent = intent or _first_str(analysis, ["intent", "call_intent", "callIntent"])
-                requested_service = _first_str(
-                    analysis, ["requested_service", "requestedService", "service", "service_type"]
-                ) or _first_str(payload, ["requested_service", "requestedService", "service", "service_type"])
-                selected_time = _first_str(
-                    analysis, ["selected_time", "selectedTime", "time", "datetime", "date_time"]
-                ) or _first_str(payload, ["selected_time", "selectedTime", "time", "datetime", "date_time"])
-                outcome = _first_str(
-                    analysis, ["outcome", "call_outcome", "callOutcome", "result"]
-                ) or _first_str(payload, ["outcome", "result"])
-
-                existing_result = await db.execute(
-                    select(CallAnalysis).where(CallAnalysis.call_id == call_id)
-                )
-                existing = existing_result.scalars().first()
-
-                if existing and existing.ticket_id:
-                    ticket_id = int(existing.ticket_id)
-                    existing.summary = summary or existing.summary
-                    existing.transcript = transcript_text or existing.transcript
-                    existing.caller_name = caller_name or existing.caller_name
-                    existing.intent = intent or existing.intent
-                    existing.requested_service = requested_service or existing.requested_service
-                    existing.selected_time = selected_time or existing.selected_time
-                    existing.outcome = outcome or existing.outcome
+    # List transcripts are stored as turn rows (only the new ones); legacy string
+    # transcripts are kept as text. call_analyzed happens once per call, so it
+    # also renders the full text for the analysis row and ticket severity; the
+    # ticket itself references the turns instead of embedding them.
+    transcript = payload.get("transcript_object") or payload.get("transcript")
+    analysis = fields.get("analysis", {}) if normalized_type == "call_analyzed" else {}
+    if not transcript and normalized_type == "call_analyzed":
+        transcript = analysis.get("transcript")
+    turn_rows: list[dict[str, Any]] = []
+    if isinstance(transcript, list):
+        transcript_text = _transcript_to_text(transcript) if normalized_type == "call_analyzed" else ""
+        snippet = _tail_snippet(transcript)
+        turn_rows = _new_turn_rows(call_id, transcript, now)
+    else:
+        transcript_text = _transcript_to_text(transcript)
+        snippet = _derive_snippet(transcript_text)
+    transcript_ref = _transcript_reference(call_id) if isinstance(transcript, list) and snippet else ""
+
+    analysis_fields: dict[str, str] | None = None
+    if normalized_type == "call_analyzed":
+        found = _analysis_fields.extract(analysis)
+        analysis_fields = {
+            "caller_name": fields.get("caller_name") or found.get("caller_name", ""),
+            "intent": intent or found.get("intent", ""),
+            "requested_service": found.get("requested_service") or fields.get("requested_service", ""),
+            "selected_time": found.get("selected_time") or fields.get("selected_time", ""),
+            "outcome": found.get("outcome") or fields.get("outcome", ""),
+            "summary": fields.get("summary") or found.get("summary", ""),
+            "transcript": transcript_text or "",
+        }
+
+    session_changes = _session_changes(
+        normalized_type=normalized_type,
+        from_contact=from_contact,
+        intent=intent,
+        latency_ms=latency_ms,
+        snippet=snippet,
+    )
+    buffered = settings.RETELL_SESSION_WRITE_BEHIND
+
+    # Same-call events serialize here (and across workers with the advisory lock),
+    # so concurrent deliveries never race on the call's rows.
+    async with call_locks.hold(call_id):
+        async with session_factory() as db:
+            try:
+                if buffered:
+                    # Terminal events force the buffer out before the analysis write. The
+                    # flush uses its own connection, so it runs before this session writes
+                    # anything (on SQLite it would otherwise wait on this transaction's lock).
+                    await _session_buffer(session_factory).put(
+                        call_id, session_changes, force=normalized_type in _TERMINAL_EVENTS
+                    )
+                if settings.RETELL_INGEST_ADVISORY_LOCK and dialect_name(db) == "postgresql":
+                    await db.execute(select(func.pg_advisory_xact_lock(advisory_key("retell.call", call_id))))
+                if turn_rows:
+                    await db.execute(_turns_insert(dialect_insert(db)), turn_rows)
+                if buffered:
+                    if analysis_fields is None:
+                        await db.commit()
+                        if isinstance(transcript, list):
+                            _remember_turns(call_id, len(transcript))
+                        return {"ok": True, "call_id": call_id, "ticket_id": None}
                 else:
-                    if not existing:
-                        existing = CallAnalysis(
-                            call_id=call_id,
-                            caller_name=caller_name or "",
-                            intent=intent or "",
-                            requested_service=requested_service or "",
-                            selected_time=selected_time or "",
-                            outcome=outcome or "",
-                            summary=summary or "",
-                            transcript=transcript_text or "",
-                            created_at=now,
-                            updated_at=now,
-                        )
-                        db.add(existing)
-                        await db.flush()
-                    else:
-                        existing.summary = summary or existing.summary
-                        existing.transcript = transcript_text or existing.transcript
-                        existing.caller_name = caller_name or existing.caller_name
-                        existing.intent = intent or existing.intent
-                        existing.requested_service = requested_service or existing.requested_service
-                        existing.selected_time = selected_time or existing.selected_time
-                        existing.outcome = outcome or existing.outcome
+                    await db.execute(
+                        _session_upsert(dialect_insert(db), session_changes),
+                        _session_row(call_id, session_changes, now),
+                    )
 
+                ticket_id: int | None = None
+                ticket_pending = False
+                if analysis_fields is not None and settings.RETELL_TICKET_PIPELINE:
+                    # Record the analysis now; the ticket is built off the request path.
+                    stmt = _analysis_upsert(
+                        dialect_insert(db),
+                        call_id=call_id,
+                        fields=analysis_fields,
+                        ticket_id=None,
+                        now=now,
+                        ticket_pending=True,
+                    ).returning(CallAnalysis.ticket_id)
+                    ticket_id = (await db.execute(stmt)).scalar_one()
+                    ticket_pending = ticket_id is None
+                elif analysis_fields is not None:
                     issue = _build_ticket_issue(
                         call_id=call_id,
-                        caller_name=caller_name,
-                        intent=intent,
-                        requested_service=requested_service,
-                        selected_time=selected_time,
-                        outcome=outcome,
-                        summary=summary,
-                        transcript_text=transcript_text,
+                        caller_name=analysis_fields["caller_name"],
+                        intent=analysis_fields["intent"],
+                        requested_service=analysis_fields["requested_service"],
+                        selected_time=analysis_fields["selected_time"],
+                        outcome=analysis_fields["outcome"],
+                        summary=analysis_fields["summary"],
+                        transcript_text="" if transcript_ref else transcript_text,
+                        transcript_ref=transcript_ref,
                     )
-
-                    ticket = Escalation(
-                        guest_name=caller_name or "Unknown Caller",
-                        room_number="N/A",
-                        issue=issue,
-                        status="OPEN",
-                        sentiment="Neutral",
-                        created_at=now,
-                    )
-                    db.add(ticket)
-                    await db.flush()
-                    ticket_id = int(ticket.id)
-                    existing.ticket_id = ticket_id
-
-                    _log.info(
-                        "RETELL_TICKET_CREATE_OK call_id=%s ticket_id=%s correlation_id=%s",
-                        call_id,
-                        ticket_id,
-                        correlation_id,
+                    ticket_id, created_id = await _write_analysis(
+                        db, call_id=call_id, fields=analysis_fields, issue=issue, now=now
                     )
+                    if created_id is not None and created_id != ticket_id:
+                        # Lost a cross-worker race: another writer linked its ticket first.
+                        await db.execute(sa_delete(Escalation).where(Escalation.id == created_id))
+                        _log.info(
+                            "RETELL_TICKET_CREATE_DUP call_id=%s correlation_id=%s",
+                            call_id,
+                            correlation_id,
+                        )
+                    elif created_id is not None:
+                        _log.info(
+                            "RETELL_TICKET_CREATE_OK call_id=%s ticket_id=%s correlation_id=%s",
+                            call_id,
+                            ticket_id,
+                            correlation_id,
+                        )
+                    ticket_id = int(ticket_id) if ticket_id is not None else None
 
-            await db.commit()
-            _log.info(
-                "RETELL_DB_WRITE_OK event_type=%s call_id=%s ticket_id=%s correlation_id=%s",
-                normalized_type or event_type,
-                call_id,
-                ticket_id,
-                correlation_id,
-            )
-            return {"ok": True, "call_id": call_id, "ticket_id": ticket_id}
-
-        except IntegrityError:
-            await db.rollback()
-            _log.info(
-                "RETELL_TICKET_CREATE_DUP call_id=%s correlation_id=%s",
-                call_id,
-                correlation_id,
-            )
-            try:
-                dup_result = await db.execute(
-                    select(CallAnalysis).where(CallAnalysis.call_id == call_id)
-                )
-                analysis = dup_result.scalars().first()
                 await db.commit()
-                return {
-                    "ok": True,
-                    "call_id": call_id,
-                    "ticket_id": int(analysis.ticket_id) if analysis and analysis.ticket_id else None,
-                }
-            except Exception as exc:
-                _log.warning(
-                    "RETELL_DB_WRITE_FAILED after_dedup event_type=%s call_id=%s correlation_id=%s err=%s",
+                if isinstance(transcript, list):
+                    _remember_turns(call_id, len(transcript))
+                _log.info(
+                    "RETELL_DB_WRITE_OK event_type=%s call_id=%s ticket_id=%s correlation_id=%s",
                     normalized_type or event_type,
                     call_id,
+                    ticket_id,
                     correlation_id,
-                    exc,
                 )
-                return {"ok": False, "reason": "db_error"}
+                if ticket_pending:
+                    from app.ticket_pipeline import ticket_pipeline
 
-        except Exception as exc:
-            await db.rollback()
-            if normalized_type == "call_analyzed":
+                    ticket_pipeline.enqueue(call_id, correlation_id=correlation_id, session_factory=session_factory)
+                    return {"ok": True, "call_id": call_id, "ticket_id": None, "ticket_pending": True}
+                return {"ok": True, "call_id": call_id, "ticket_id": ticket_id}
+
+            except Exception as exc:
+                await db.rollback()
+                if normalized_type == "call_analyzed":
+                    _log.warning(
+                        "RETELL_TICKET_CREATE_FAILED call_id=%s correlation_id=%s err=%s",
+                        call_id,
+                        correlation_id,
+                        exc,
+                    )
                 _log.warning(
-                    "RETELL_TICKET_CREATE_FAILED call_id=%s correlation_id=%s err=%s",
+                    "RETELL_DB_WRITE_FAILED event_type=%s call_id=%s correlation_id=%s err=%s",
+                    normalized_type or event_type,
                     call_id,
                     correlation_id,
                     exc,
                 )
-            _log.warning(
-                "RETELL_DB_WRITE_FAILED event_type=%s call_id=%s correlation_id=%s err=%s",
-                normalized_type or event_type,
-                call_id,
-                correlation_id,
-                exc,
-            )
-            return {"ok": False, "reason": "db_error"}
+                return {"ok": False, "reason": "db_error"}
+
+
+_LIFECYCLE_EVENTS = {"call_started", "call_ended", "call_analyzed"}
+
+
+def _merge_pending_update(previous: dict[str, Any], latest: dict[str, Any]) -> dict[str, Any]:
+    """Fold a newer mid-call update into one still waiting to be written."""
+    payload = latest["payload"]
+    if isinstance(previous["payload"], dict) and isinstance(payload, dict):
+        payload = {**previous["payload"], **payload}
+    return {**latest, "payload": payload}
+
+
+async def _run_sequenced(item: dict[str, Any]) -> dict[str, Any]:
+    return await ingest_retell_webhook(
+        item["payload"],
+        event_type=item["event_type"],
+        correlation_id=item["correlation_id"],
+        session_factory=item["session_factory"],
+    )
+
+
+call_sequencer = KeyedSequencer(_run_sequenced, merge=_merge_pending_update)
+
+
+async def ingest_retell_webhook_ordered(
+    payload: Any,
+    *,
+    event_type: str,
+    correlation_id: str,
+    session_factory=None,
+) -> dict[str, Any]:
+    """Ingest with per-call ordering: one call's events run in order, calls run in parallel.
+
+    Pending mid-call updates for the same call are coalesced (later fields win), so
+    only the latest state is written; lifecycle events are never merged.
+    """
+    call_id = _extract_call_id(payload)
+    if not call_id:
+        return await ingest_retell_webhook(
+            payload,
+            event_type=event_type,
+            correlation_id=correlation_id,
+            session_factory=session_factory,
+        )
+    return await call_sequencer.submit(
+        call_id,
+        {
+            "payload": payload,
+            "event_type": event_type,
+            "correlation_id": correlation_id,
+            "session_factory": session_factory,
+        },
+        coalesce=_normalize_event_type(event_type) not in _LIFECYCLE_EVENTS,
+    )
@@ -7,8 +7,10 @@ from fastapi import APIRouter, Depends
 from fastapi import Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.core.config import settings
+from app.core.tickets import ticket_columns
 from app.db import get_db
 from app.models import Escalation
 
@@ -22,6 +24,15 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
     try:
         result = await db.execute(select(Escalation).order_by(Escalation.created_at.desc()))
         tasks = result.scalars().all()
+        # Only the alerts shown need the (deferred) issue text.
+        latest = (
+            await db.execute(
+                select(Escalation)
+                .options(undefer(Escalation.issue))
+                .order_by(Escalation.created_at.desc())
+                .limit(15)
+            )
+        ).scalars().all()
 
         resolved = [t for t in tasks if t.status == "RESOLVED"]
 
@@ -37,7 +48,7 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
                     "status": t.status,
                     "created_at": t.created_at.isoformat(),
                 }
-                for t in tasks[:15]
+                for t in latest
             ],
         }
     except Exception as e:
@@ -82,6 +93,7 @@ async def trigger_escalation(request: Request, db: AsyncSession = Depends(get_db
         issue=data.get("issue"),
         status="PENDING",
         created_at=datetime.now(timezone.utc),
+        **ticket_columns(data.get("issue")),
     )
     db.add(new_task)
     await db.commit()
@@ -1,5 +1,3 @@
-from dataclasses import asdict
-
 import httpx
 
 from app.core.config import settings
@@ -36,7 +34,7 @@ async def handle_make_trigger(payload: dict, correlation_id: str) -> None:
 
 
 async def send_make_webhook(url: str, envelope: EventEnvelope) -> httpx.Response:
-    payload = asdict(envelope)
+    payload = envelope.to_dict()
     async with httpx.AsyncClient(timeout=10) as client:
         response = await client.post(
             url,
@@ -1,9 +1,7 @@
 import hashlib
 import json
-import time
 import uuid
 from collections import deque
-from dataclasses import asdict
 
 import httpx
 
@@ -37,7 +35,7 @@ def record_event(envelope: EventEnvelope) -> None:
 
 
 def get_last_events(limit: int = 10) -> list[dict]:
-    return [asdict(evt) for evt in list(_event_log)[-limit:]]
+    return [evt.to_dict() for evt in list(_event_log)[-limit:]]
 
 
 async def send_message(chat_id: int | str, text: str) -> bool:
@@ -80,12 +78,10 @@ async def handle_command(text: str, user_id: int, bus) -> dict:
             return {"error": "invalid_json"}
 
         idempotency_key = hashlib.sha256(raw_payload.encode("utf-8")).hexdigest()
-        envelope = EventEnvelope(
-            version="v1",
+        envelope = EventEnvelope.trusted(
             source="telegram",
             type="escalation.create",
             idempotency_key=idempotency_key,
-            timestamp=int(time.time()),
             correlation_id=str(uuid.uuid4()),
             payload=payload,
         )
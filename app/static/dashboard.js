@@ -378,6 +378,15 @@ document.addEventListener('DOMContentLoaded', () => {
         drawerCustomerMeta.innerText = `Source: ${ticket.source || 'System'}`;
         drawerCustomerAvatar.innerText = (ticket.customer || 'U').charAt(0).toUpperCase();
         drawerTicketNotes.innerText = ticket.notes || ticket.subject || '';
+        // The list omits the issue text; load it for the open ticket only.
+        fetchJSON(`/api/tickets/${encodeURIComponent(ticket.id)}`, { timeoutMs: 8000 })
+            .then((detail) => {
+                const notes = String(detail?.notes || '');
+                if (!notes) return;
+                ticket.notes = notes;
+                if (drawerTicketId.innerText === ticket.id) drawerTicketNotes.innerText = notes;
+            })
+            .catch((err) => warn('ticket detail failed', err));
 
         drawerTags.innerHTML = `
             <span class="status-badge ${getSeverityStyles(ticket.severity)}">${escapeHtml(ticket.severity)}</span>
@@ -0,0 +1,293 @@
+"""Background ticket creation for analyzed Retell calls.
+
+With ``RETELL_TICKET_PIPELINE`` on, ``ingest_retell_webhook`` commits the
+``call_analyses`` row with ``ticket_id`` NULL and returns. This stage then
+builds the ticket text, inserts the ``Escalation``, links ``ticket_id`` back
+and publishes ``ticket.created``.
+
+The link is a conditional ``UPDATE ... WHERE ticket_id IS NULL`` on the row
+keyed by the unique ``call_id``, so each call gets exactly one ticket even when
+the same call is queued twice or two workers race. Ingest marks the row
+``ticket_pending`` and the link clears it; pending rows are the durable
+backlog that ``recover()`` re-queues after a restart. Rows written without a
+ticket on purpose (``python -m app.backfill --no-tickets``) are never pending.
+
+A failed creation is re-queued after a capped exponential backoff, up to
+``RETELL_TICKET_MAX_ATTEMPTS``; the backoff waits on a timer, not in a worker.
+A failure to publish ``ticket.created`` is only logged: the ticket is linked by
+then, so a retry would find it and stop as a duplicate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import exists, select, update
+from sqlalchemy import delete as sa_delete
+from sqlalchemy.orm import undefer
+
+from app.core.config import settings
+from app.core.events import bus
+from app.models import CallAnalysis, CallTranscriptTurn, Escalation
+from app.retell_ingest import _build_ticket_issue, _severity_text, _ticket_insert, _transcript_reference, _turn_line
+
+_log = logging.getLogger("retell.ingest")
+
+
+class TicketPipeline:
+    def __init__(self, *, workers: int | None = None) -> None:
+        self._workers_wanted = workers
+        self._queue: asyncio.Queue | None = None
+        # Enqueue times in queue order (the queue is FIFO), for the oldest-entry lag.
+        self._enqueued_at: deque[float] = deque()
+        self._workers: list[asyncio.Task] = []
+        self._delayed: set[asyncio.TimerHandle] = set()
+        self.enqueued = 0
+        self.retries = 0
+        self.created = 0
+        self.duplicates = 0
+        self.failures = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        wanted = max(1, self._workers_wanted or settings.RETELL_TICKET_WORKERS)
+        while len(self._workers) < wanted:
+            self._workers.append(
+                asyncio.create_task(self._worker(), name=f"retell-ticket-worker-{len(self._workers)}")
+            )
+        return self._queue
+
+    def enqueue(self, call_id: str, *, correlation_id: str, session_factory=None, attempt: int = 1) -> None:
+        queue = self._ensure_workers()
+        queue.put_nowait((call_id, correlation_id, session_factory, attempt))
+        self._enqueued_at.append(time.monotonic())
+        self.enqueued += 1
+
+    def _retry_later(self, call_id: str, *, correlation_id: str, session_factory, attempt: int) -> bool:
+        """Re-queue a failed creation after a capped backoff; False once attempts run out."""
+        if attempt >= max(1, settings.RETELL_TICKET_MAX_ATTEMPTS):
+            return False
+        delay = min(
+            settings.RETELL_TICKET_RETRY_MAX_DELAY_SECONDS,
+            settings.RETELL_TICKET_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)),
+        )
+
+        def requeue() -> None:
+            self._delayed.discard(handle)
+            self.enqueue(
+                call_id, correlation_id=correlation_id, session_factory=session_factory, attempt=attempt + 1
+            )
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._delayed.add(handle)
+        self.retries += 1
+        return True
+
+    async def recover(self, *, session_factory=None, limit: int = 1000) -> int:
+        """Re-queue analyzed calls that are still marked as waiting for a pipeline ticket."""
+        factory = session_factory or _default_factory()
+        async with factory() as db:
+            rows = (
+                await db.execute(
+                    select(CallAnalysis.call_id)
+                    .where(CallAnalysis.ticket_pending.is_(True), CallAnalysis.ticket_id.is_(None))
+                    .order_by(CallAnalysis.id)
+                    .limit(limit)
+                )
+            ).scalars().all()
+        for call_id in rows:
+            self.enqueue(call_id, correlation_id=f"recover-{call_id}", session_factory=session_factory)
+        return len(rows)
+
+    async def join(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, *, drain_timeout: float | None = None) -> None:
+        if self._queue is not None:
+            timeout = drain_timeout if drain_timeout is not None else settings.EVENT_BUS_DRAIN_TIMEOUT_SECONDS
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                # Undrained calls keep ticket_id NULL and are picked up by recover().
+                _log.warning("RETELL_TICKET_PIPELINE_DRAIN_TIMEOUT pending=%s", self._queue.qsize())
+        # Calls waiting out a retry backoff stay pending in the database.
+        for handle in self._delayed:
+            handle.cancel()
+        self._delayed.clear()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def oldest_lag_seconds(self) -> float:
+        if not self._enqueued_at:
+            return 0.0
+        return time.monotonic() - self._enqueued_at[0]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "retrying": len(self._delayed),
+            "enqueued": self.enqueued,
+            "retries": self.retries,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "failures": self.failures,
+            "lag_seconds": round(self.oldest_lag_seconds(), 3),
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+        }
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            call_id, correlation_id, session_factory, attempt = await self._queue.get()
+            lag = time.monotonic() - self._enqueued_at.popleft()
+            self.last_lag_seconds = lag
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+            try:
+                await self.create_ticket(call_id, correlation_id=correlation_id, session_factory=session_factory)
+            except Exception as exc:
+                self.failures += 1
+                retrying = self._retry_later(
+                    call_id, correlation_id=correlation_id, session_factory=session_factory, attempt=attempt
+                )
+                _log.warning(
+                    "RETELL_TICKET_CREATE_FAILED call_id=%s correlation_id=%s attempt=%s retrying=%s err=%s",
+                    call_id,
+                    correlation_id,
+                    attempt,
+                    retrying,
+                    exc,
+                )
+            finally:
+                self._queue.task_done()
+
+    async def create_ticket(self, call_id: str, *, correlation_id: str, session_factory=None) -> int | None:
+        """Create and link the ticket for ``call_id``; returns the linked ticket id."""
+        factory = session_factory or _default_factory()
+        async with factory() as db:
+            analysis = (
+                await db.execute(
+                    select(CallAnalysis)
+                    .options(undefer(CallAnalysis.transcript))
+                    .where(CallAnalysis.call_id == call_id)
+                )
+            ).scalars().first()
+            if analysis is None:
+                return None
+            if analysis.ticket_id is not None:
+                self.duplicates += 1
+                return int(analysis.ticket_id)
+
+            transcript_text = analysis.transcript or ""
+            if transcript_text:
+                has_turns = bool(
+                    await db.scalar(select(exists().where(CallTranscriptTurn.call_id == call_id)))
+                )
+            else:
+                # Older analysis rows hold no text for list transcripts; rebuild it for severity.
+                turns = (
+                    await db.execute(
+                        select(CallTranscriptTurn.role, CallTranscriptTurn.content)
+                        .where(CallTranscriptTurn.call_id == call_id)
+                        .order_by(CallTranscriptTurn.turn_index)
+                    )
+                ).all()
+                transcript_text = "\n".join(_turn_line(role, content) for role, content in turns)
+                has_turns = bool(turns)
+            # Turn-based transcripts are referenced from the ticket, not embedded in it.
+            transcript_ref = _transcript_reference(call_id) if has_turns else ""
+            issue = _build_ticket_issue(
+                call_id=call_id,
+                caller_name=analysis.caller_name or "",
+                intent=analysis.intent or "",
+                requested_service=analysis.requested_service or "",
+                selected_time=analysis.selected_time or "",
+                outcome=analysis.outcome or "",
+                summary=analysis.summary or "",
+                transcript_text="" if transcript_ref else transcript_text,
+                transcript_ref=transcript_ref,
+            )
+            now = datetime.now(timezone.utc)
+            guest_name = analysis.caller_name or "Unknown Caller"
+            ticket_id = (
+                await db.execute(
+                    _ticket_insert(
+                        call_id=call_id,
+                        caller_name=guest_name,
+                        issue=issue,
+                        now=now,
+                        severity_text=_severity_text(analysis.summary or "", transcript_text),
+                    )
+                )
+            ).scalar_one_or_none()
+            linked = None
+            if ticket_id is not None:
+                linked = (
+                    await db.execute(
+                        update(CallAnalysis)
+                        .where(CallAnalysis.call_id == call_id, CallAnalysis.ticket_id.is_(None))
+                        .values(ticket_id=ticket_id, ticket_pending=False, updated_at=now)
+                        .returning(CallAnalysis.ticket_id)
+                        .execution_options(synchronize_session=False)
+                    )
+                ).scalar_one_or_none()
+            if linked is None:
+                if ticket_id is not None:
+                    await db.execute(sa_delete(Escalation).where(Escalation.id == ticket_id))
+                await db.commit()
+                self.duplicates += 1
+                _log.info("RETELL_TICKET_CREATE_DUP call_id=%s correlation_id=%s", call_id, correlation_id)
+                return None
+            await db.commit()
+
+        self.created += 1
+        _log.info(
+            "RETELL_TICKET_CREATE_OK call_id=%s ticket_id=%s correlation_id=%s",
+            call_id,
+            linked,
+            correlation_id,
+        )
+        try:
+            await bus.publish(
+                "ticket.created",
+                {
+                    "ticket_id": int(linked),
+                    "call_id": call_id,
+                    "guest_name": guest_name,
+                    "room_number": "N/A",
+                    "issue": issue,
+                },
+                correlation_id,
+            )
+        except Exception as exc:
+            # The ticket is already linked, so a retry would only see a duplicate; log instead.
+            _log.warning(
+                "RETELL_TICKET_EVENT_FAILED call_id=%s ticket_id=%s correlation_id=%s err=%s",
+                call_id,
+                linked,
+                correlation_id,
+                exc,
+            )
+        return int(linked)
+
+
+def _default_factory():
+    from app.db import AsyncSessionLocal
+
+    return AsyncSessionLocal
+
+
+ticket_pipeline = TicketPipeline()
@@ -0,0 +1,91 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController
+from app.core.config import settings
+from app.middleware.admission import AdmissionMiddleware
+
+
+def _app(controller, gate):
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller, routes={"/hook": "retell"})
+
+    @app.post("/hook")
+    async def hook():
+        await gate.wait()
+        return {"ok": True}
+
+    return app
+
+
+def test_admission_sheds_over_inflight_limit(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "ADMISSION_MAX_INFLIGHT_RETELL", 1)
+    monkeypatch.setitem(settings.__dict__, "ADMISSION_RETRY_AFTER_SECONDS", 3)
+    controller = AdmissionController()
+
+    async def scenario():
+        async with controller.slot("retell"):
+            try:
+                async with controller.slot("retell"):
+                    raise AssertionError("second slot should be rejected")
+            except Exception as exc:
+                assert exc.retry_after == 3
+                assert exc.reason == "inflight_limit"
+        async with controller.slot("retell"):
+            pass
+
+    asyncio.run(scenario())
+    stats = controller.stats()
+    assert stats["retell"]["shed"] == {"inflight_limit": 1}
+    assert stats["retell"]["admitted"] == 2
+    assert stats["retell"]["inflight"] == 0
+    assert stats["make"]["shed"] == {}
+
+
+def test_admission_middleware_returns_503_on_queue_depth(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "ADMISSION_MAX_QUEUE_DEPTH", 10)
+    monkeypatch.setitem(settings.__dict__, "ADMISSION_RETRY_AFTER_SECONDS", 2)
+    depth = {"value": 0}
+    controller = AdmissionController(queue_depth=lambda: depth["value"])
+    gate = asyncio.Event()
+    gate.set()
+    client = TestClient(_app(controller, gate))
+
+    assert client.post("/hook").status_code == 200
+
+    depth["value"] = 10
+    response = client.post("/hook")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+    assert response.json()["reason"] == "queue_depth"
+    assert controller.stats()["retell"]["shed"] == {"queue_depth": 1}
+
+
+def test_held_background_work_counts_toward_inflight_limit(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "ADMISSION_MAX_INFLIGHT_RETELL", 2)
+    controller = AdmissionController()
+
+    async def scenario():
+        async with controller.slot("retell"):
+            release = controller.hold("retell", limit=1)
+        # The request is answered, but its background work still occupies a slot.
+        assert controller.inflight("retell") == 1
+        try:
+            controller.hold("make", limit=1)
+            raise AssertionError("held work over the backlog limit should be rejected")
+        except Exception as exc:
+            assert exc.reason == "background_limit"
+        async with controller.slot("retell"):
+            try:
+                async with controller.slot("retell"):
+                    raise AssertionError("held work should count toward the inflight limit")
+            except Exception as exc:
+                assert exc.reason == "inflight_limit"
+        release()
+        release()
+        assert controller.inflight("retell") == 0
+
+    asyncio.run(scenario())
+    assert controller.stats()["make"]["shed"] == {"background_limit": 1}
@@ -0,0 +1,99 @@
+"""Tests for the bulk Retell backfill against a throw-away SQLite database."""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.backfill import backfill, iter_records, normalize_record
+from app.db import Base
+from app.models import CallAnalysis, CallSession, CallTranscriptTurn, Escalation
+
+
+@pytest.fixture
+async def backfill_db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'backfill.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _export(count: int) -> list[dict]:
+    records = []
+    for index in range(count):
+        record = {
+            "call_id": f"bf-{index}",
+            "from_number": f"+1555000{index:04d}",
+            "start_timestamp": 1_760_000_000_000 + index,
+            "transcript_object": [
+                {"role": "agent", "content": "Hello, how can I help?"},
+                {"role": "user", "content": f"Request number {index}"},
+            ],
+        }
+        if index % 2 == 0:
+            record["call_analysis"] = {"call_summary": f"Summary {index}", "caller_name": "Guest"}
+        records.append(record)
+    records.append({"no_call_id": True})
+    return records
+
+
+def test_iter_records_streams_json_array_and_jsonl(tmp_path):
+    records = [{"call_id": f"c-{index}", "text": "x" * 100} for index in range(2000)]
+    array_path = tmp_path / "export.json"
+    array_path.write_text(json.dumps(records, indent=2))
+    jsonl_path = tmp_path / "export.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    assert list(iter_records(str(array_path))) == records
+    assert list(iter_records(str(jsonl_path))) == records
+
+
+def test_normalize_record_references_turn_transcript():
+    call = normalize_record(_export(1)[0], datetime.now(timezone.utc))
+    assert "User: Request number 0" in call["analysis"]["transcript"]
+    assert "User: Request number 0" in call["severity_text"]
+    assert "GET /api/calls/bf-0/transcript" in call["issue"]
+    assert "Request number 0" not in call["issue"]
+
+
+async def test_backfill_writes_batches_and_resumes_from_checkpoint(tmp_path, backfill_db):
+    export = tmp_path / "calls.jsonl"
+    export.write_text("\n".join(json.dumps(record) for record in _export(25)))
+    checkpoint = tmp_path / "calls.checkpoint"
+
+    report = await backfill(
+        str(export),
+        session_factory=backfill_db,
+        batch_size=4,
+        concurrency=3,
+        checkpoint_path=str(checkpoint),
+    )
+    assert report.records == 26
+    assert report.skipped == 1
+    assert report.calls == 25
+    assert report.tickets == 13
+    assert json.loads(checkpoint.read_text())["offset"] == 26
+
+    again = await backfill(str(export), session_factory=backfill_db, checkpoint_path=str(checkpoint))
+    assert again.resumed_from == 26
+    assert again.records == 0
+
+    rerun = await backfill(str(export), session_factory=backfill_db, batch_size=10)
+    assert rerun.tickets == 0
+
+    async with backfill_db() as db:
+        assert (await db.execute(select(func.count()).select_from(CallSession))).scalar_one() == 25
+        assert (await db.execute(select(func.count()).select_from(CallTranscriptTurn))).scalar_one() == 50
+        assert (await db.execute(select(func.count()).select_from(Escalation))).scalar_one() == 13
+        unlinked = await db.execute(
+            select(func.count()).select_from(CallAnalysis).where(CallAnalysis.ticket_id.is_(None))
+        )
+        assert unlinked.scalar_one() == 0
+        session = (await db.execute(select(CallSession).where(CallSession.id == "bf-0"))).scalars().first()
+        assert session.status == "Analyzed"
+        assert session.from_contact == "+15550000000"
+        assert session.transcript_snippet.endswith("Request number 0")
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, text
+
+from app.core.compression import CompressedJSON, CompressedText, compress_text, decompress_text, is_compressed
+from app.core.config import settings
+
+
+def test_compress_text_round_trips_and_skips_small_values(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "COMPRESSION_MIN_BYTES", 64)
+    monkeypatch.setitem(settings.__dict__, "COMPRESSION_CODEC", "zlib")
+
+    assert compress_text("short") == "short"
+
+    large = "User: I would like to book a massage.\n" * 50
+    packed = compress_text(large)
+    assert is_compressed(packed)
+    assert len(packed) < len(large)
+    assert decompress_text(packed) == large
+    assert compress_text(packed) == packed
+    assert decompress_text("plain legacy row") == "plain legacy row"
+
+
+def test_compressed_columns_store_packed_text(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "COMPRESSION_MIN_BYTES", 64)
+    monkeypatch.setitem(settings.__dict__, "COMPRESSION_CODEC", "zlib")
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    docs = Table(
+        "docs",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("body", CompressedText),
+        Column("payload", CompressedJSON),
+    )
+    metadata.create_all(engine)
+
+    body = "transcript line\n" * 100
+    payload = {"items": ["x" * 20] * 20}
+    with engine.begin() as conn:
+        conn.execute(docs.insert(), [{"id": 1, "body": body, "payload": payload}])
+        conn.execute(text("INSERT INTO docs (id, body, payload) VALUES (2, 'legacy', '{\"a\": 1}')"))
+
+    with engine.connect() as conn:
+        raw = conn.execute(text("SELECT body, payload FROM docs WHERE id = 1")).one()
+        assert is_compressed(raw.body) and is_compressed(raw.payload)
+        rows = conn.execute(select(docs).order_by(docs.c.id)).all()
+
+    assert rows[0].body == body
+    assert rows[0].payload == payload
+    assert rows[1].body == "legacy"
+    assert rows[1].payload == {"a": 1}
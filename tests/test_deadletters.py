@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.deadletters import SqlDeadLetterStore
+from app.core.events import EventBus, EventEnvelope
+from app.db import Base
+import app.models  # noqa: F401 - registers tables on Base.metadata
+
+
+@pytest.fixture
+async def deadletter_store(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'deadletters.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield SqlDeadLetterStore(session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    await engine.dispose()
+
+
+def _envelope(key: str) -> EventEnvelope:
+    return EventEnvelope(
+        version="v1",
+        source="unit-test",
+        type="ticket.created",
+        idempotency_key=key,
+        timestamp=1234567890,
+        correlation_id=f"corr-{key}",
+        payload={"transcript": "x" * 64},
+    )
+
+
+async def test_sql_deadletters_persist_and_paginate(deadletter_store, monkeypatch):
+    bus = EventBus(ttl_seconds=3600, deadletter_store=deadletter_store)
+
+    async def noop_sleep(_):
+        return None
+
+    async def failing_handler(_envelope):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(asyncio, "sleep", noop_sleep)
+    bus.register_handler(event_type="ticket.created", handler=failing_handler)
+
+    for index in range(3):
+        result = await bus.publish(_envelope(f"idem-{index}"))
+        assert result.status == "failed"
+
+    first_page = await deadletter_store.list(limit=2)
+    assert [entry["idempotency_key"] for entry in first_page] == ["idem-2", "idem-1"]
+    assert "payload" not in first_page[0]
+    assert first_page[0]["handler"] == "failing_handler"
+
+    second_page = await deadletter_store.list(limit=2, before_id=first_page[-1]["id"])
+    assert [entry["idempotency_key"] for entry in second_page] == ["idem-0"]
+
+
+async def test_deadletter_replay_redispatches_in_batches(deadletter_store, monkeypatch):
+    bus = EventBus(ttl_seconds=3600, deadletter_store=deadletter_store)
+    healthy = False
+    delivered = []
+    sleeps = []
+
+    async def record_sleep(seconds):
+        sleeps.append(seconds)
+
+    async def flaky_handler(envelope):
+        if not healthy:
+            raise RuntimeError("downstream unavailable")
+        delivered.append(envelope.idempotency_key)
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    bus.register_handler(event_type="ticket.created", handler=flaky_handler, max_attempts=1)
+
+    for index in range(3):
+        await bus.publish(_envelope(f"replay-{index}"))
+
+    healthy = True
+    entries = await deadletter_store.select(handler="flaky_handler", limit=10)
+    summary = await bus.replay_deadletters(entries, batch_size=2, interval_seconds=0.5)
+
+    assert summary == {"replayed": 3, "processed": 3, "retry_scheduled": 0, "failed": 0, "skipped": 0}
+    assert delivered == ["replay-0", "replay-1", "replay-2"]
+    assert sleeps == [0.5]
+    # Replayed entries are resolved, so the same filter finds nothing left to send.
+    assert await deadletter_store.list(limit=10) == []
+    assert await deadletter_store.select(handler="flaky_handler", limit=10) == []
+
+
+async def test_deadletter_replay_failure_updates_original_entry(deadletter_store, monkeypatch):
+    bus = EventBus(ttl_seconds=3600, deadletter_store=deadletter_store)
+    failures = iter(["first outage", "second outage"])
+
+    async def noop_sleep(_):
+        return None
+
+    async def failing_handler(_envelope):
+        raise RuntimeError(next(failures))
+
+    monkeypatch.setattr(asyncio, "sleep", noop_sleep)
+    bus.register_handler(event_type="ticket.created", handler=failing_handler, max_attempts=1)
+    await bus.publish(_envelope("replay-fail"))
+
+    entries = await deadletter_store.select(handler="failing_handler", limit=10)
+    summary = await bus.replay_deadletters(entries)
+
+    assert summary == {"replayed": 1, "processed": 0, "retry_scheduled": 0, "failed": 1, "skipped": 0}
+    remaining = await deadletter_store.list(limit=10)
+    assert len(remaining) == 1
+    assert remaining[0]["id"] == entries[0]["id"]
+    assert remaining[0]["replay_count"] == 1
+    assert remaining[0]["error"] == "second outage"
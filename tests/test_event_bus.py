@@ -1,9 +1,11 @@
 import asyncio
+import json
 import time
 
 import pytest
 
 from app.core.events import EventBus, EventEnvelope
+from app.core.retry import RetryJob, RetryScheduler
 
 
 @pytest.mark.asyncio
@@ -31,6 +33,34 @@ async def test_event_envelope_validation_v1():
         )
 
 
+def test_event_envelope_trusted_and_serialization():
+    envelope = EventEnvelope.trusted(
+        source="unit-test",
+        type="ticket.created",
+        idempotency_key="idem-1",
+        correlation_id="corr-1",
+        payload={"ok": True},
+        timestamp=1234567890,
+    )
+    assert envelope == EventEnvelope(
+        version="v1",
+        source="unit-test",
+        type="ticket.created",
+        idempotency_key="idem-1",
+        timestamp=1234567890,
+        correlation_id="corr-1",
+        payload={"ok": True},
+    )
+    assert not hasattr(envelope, "__dict__")
+    with pytest.raises(AttributeError):
+        envelope.type = "other"
+
+    data = envelope.to_dict()
+    assert data["payload"] is envelope.payload
+    assert json.loads(envelope.to_bytes()) == data
+    assert EventEnvelope(**json.loads(envelope.to_bytes())) == envelope
+
+
 @pytest.mark.asyncio
 async def test_event_bus_idempotency_duplicate():
     bus = EventBus(ttl_seconds=3600)
@@ -118,3 +148,340 @@ async def test_event_bus_deadletter_capture(monkeypatch):
     assert result.status == "failed"
     assert len(deadletters) == 1
     assert deadletters[0]["envelope"].idempotency_key == "idem-dead"
+
+
+def _envelope(key: str, event_type: str = "ticket.created", source: str = "unit-test") -> EventEnvelope:
+    return EventEnvelope(
+        version="v1",
+        source=source,
+        type=event_type,
+        idempotency_key=key,
+        timestamp=1234567890,
+        correlation_id=f"corr-{key}",
+        payload={"ok": True},
+    )
+
+
+@pytest.mark.asyncio
+async def test_event_bus_concurrent_dispatch_bounded_by_slowest_handler():
+    bus = EventBus(ttl_seconds=3600, dispatch_mode="concurrent")
+
+    async def slow_a(_envelope):
+        await asyncio.sleep(0.2)
+
+    async def slow_b(_envelope):
+        await asyncio.sleep(0.2)
+
+    bus.register_handler(event_type="ticket.created", handler=slow_a)
+    bus.register_handler(event_type="ticket.created", handler=slow_b)
+
+    started = time.perf_counter()
+    result = await bus.publish(_envelope("idem-concurrent"))
+    elapsed = time.perf_counter() - started
+
+    assert result.status == "processed"
+    assert [outcome.handler for outcome in result.handlers] == ["slow_a", "slow_b"]
+    assert all(outcome.status == "processed" for outcome in result.handlers)
+    assert elapsed < 0.35
+
+
+@pytest.mark.asyncio
+async def test_event_bus_handler_timeout_reported_per_handler():
+    bus = EventBus(ttl_seconds=3600, dispatch_mode="concurrent")
+
+    async def hangs(_envelope):
+        await asyncio.sleep(5)
+
+    async def fine(_envelope):
+        return None
+
+    bus.register_handler(event_type="ticket.created", handler=hangs, timeout_seconds=0.05, max_attempts=1)
+    bus.register_handler(event_type="ticket.created", handler=fine)
+
+    result = await bus.publish(_envelope("idem-timeout"))
+
+    outcomes = {outcome.handler: outcome for outcome in result.handlers}
+    assert result.status == "failed"
+    assert outcomes["hangs"].status == "timeout"
+    assert outcomes["hangs"].attempts == 1
+    assert outcomes["fine"].status == "processed"
+    assert bus.get_deadletters()[0]["handler"] == "hangs"
+
+
+@pytest.mark.asyncio
+async def test_event_bus_queued_mode_acks_on_enqueue_and_drains_on_stop():
+    bus = EventBus(ttl_seconds=3600)
+    handled = []
+    release = asyncio.Event()
+
+    async def handler(envelope):
+        await release.wait()
+        handled.append(envelope.idempotency_key)
+
+    bus.register_handler(event_type="ticket.created", handler=handler)
+    await bus.start(workers=2, queue_size=10)
+
+    first = await bus.publish(_envelope("idem-q1"))
+    second = await bus.publish(_envelope("idem-q2"))
+    duplicate = await bus.publish(_envelope("idem-q1"))
+
+    assert first.status == "queued"
+    assert second.status == "queued"
+    assert duplicate.status == "duplicate"
+    assert handled == []
+
+    release.set()
+    await bus.stop(drain_timeout=1)
+
+    assert sorted(handled) == ["idem-q1", "idem-q2"]
+    assert not bus.queued
+
+
+@pytest.mark.asyncio
+async def test_event_bus_routing_index_wildcards_and_prefixes():
+    bus = EventBus(ttl_seconds=3600)
+    calls = []
+
+    def recorder(name):
+        def handler(envelope):
+            calls.append((name, envelope.idempotency_key))
+
+        handler.__name__ = name
+        return handler
+
+    bus.register_handler(handler=recorder("catch_all"))
+    bus.register_handler(source="make", handler=recorder("make_only"))
+    bus.register_handler(event_type="ticket.*", handler=recorder("ticket_prefix"))
+    bus.register_handler(source="retell", event_type="call_ended", handler=recorder("retell_ended"))
+    bus.register_handler(event_type="ticket.created", handler=recorder("ticket_created"))
+
+    await bus.publish(_envelope("r1", event_type="ticket.created", source="make"))
+    await bus.publish(_envelope("r2", event_type="call_ended", source="retell"))
+    await bus.publish(_envelope("r3", event_type="ticketing", source="retell"))
+
+    assert calls == [
+        ("catch_all", "r1"),
+        ("make_only", "r1"),
+        ("ticket_prefix", "r1"),
+        ("ticket_created", "r1"),
+        ("catch_all", "r2"),
+        ("retell_ended", "r2"),
+        ("catch_all", "r3"),
+    ]
+
+    # Subscribing after routes were resolved invalidates the compiled cache.
+    bus.register_handler(source="retell", event_type="*", handler=recorder("retell_any"))
+    await bus.publish(_envelope("r4", event_type="call_ended", source="retell"))
+    assert calls[-3:] == [("catch_all", "r4"), ("retell_ended", "r4"), ("retell_any", "r4")]
+
+
+@pytest.mark.asyncio
+async def test_event_bus_scheduled_retry_runs_off_the_publish_path():
+    bus = EventBus(
+        ttl_seconds=3600,
+        retry_mode="scheduled",
+        retry_scheduler=RetryScheduler(base_delay_seconds=0.01),
+    )
+    attempts = []
+    succeeded = asyncio.Event()
+
+    async def flaky(envelope):
+        attempts.append(envelope.idempotency_key)
+        if len(attempts) < 3:
+            raise RuntimeError("transient")
+        succeeded.set()
+
+    bus.register_handler(event_type="ticket.created", handler=flaky, max_attempts=3)
+
+    result = await bus.publish(_envelope("idem-retry"))
+    assert result.status == "retrying"
+    assert result.handlers[0].status == "retry_scheduled"
+    assert attempts == ["idem-retry"]
+
+    await asyncio.wait_for(succeeded.wait(), timeout=1)
+    await bus.stop()
+    assert len(attempts) == 3
+    assert bus.get_deadletters() == []
+    assert bus.get_stats()["retries"]["succeeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_bus_scheduled_retry_deadletters_when_exhausted():
+    bus = EventBus(
+        ttl_seconds=3600,
+        retry_mode="scheduled",
+        retry_scheduler=RetryScheduler(base_delay_seconds=0.01),
+    )
+
+    async def always_fails(_envelope):
+        raise RuntimeError("down")
+
+    bus.register_handler(event_type="ticket.created", handler=always_fails, max_attempts=2)
+    await bus.publish(_envelope("idem-exhaust"))
+
+    for _ in range(100):
+        if bus.get_deadletters():
+            break
+        await asyncio.sleep(0.01)
+    await bus.stop()
+
+    deadletters = bus.get_deadletters()
+    assert len(deadletters) == 1
+    assert deadletters[0]["envelope"].idempotency_key == "idem-exhaust"
+
+
+@pytest.mark.asyncio
+async def test_event_bus_deadletter_replay_reports_scheduled_retries():
+    bus = EventBus(
+        ttl_seconds=3600,
+        retry_mode="scheduled",
+        retry_scheduler=RetryScheduler(base_delay_seconds=0.01),
+    )
+    calls = []
+
+    async def flaky(envelope):
+        calls.append(envelope.idempotency_key)
+        if len(calls) < 4:
+            raise RuntimeError("down")
+
+    bus.register_handler(event_type="ticket.created", handler=flaky, max_attempts=2)
+    await bus.publish(_envelope("idem-replay-retry"))
+    for _ in range(100):
+        if bus.get_deadletters():
+            break
+        await asyncio.sleep(0.01)
+
+    entries = await bus.deadletters.select(handler="flaky", limit=10)
+    summary = await bus.replay_deadletters(entries)
+    assert summary["retry_scheduled"] == 1
+    assert summary["failed"] == 0
+
+    for _ in range(100):
+        if not bus.get_deadletters():
+            break
+        await asyncio.sleep(0.01)
+    await bus.stop()
+    assert len(calls) == 4
+    assert bus.get_deadletters() == []
+
+
+@pytest.mark.asyncio
+async def test_event_bus_scheduled_retry_covers_batch_handlers():
+    bus = EventBus(
+        ttl_seconds=3600,
+        retry_mode="scheduled",
+        retry_scheduler=RetryScheduler(base_delay_seconds=0.01),
+    )
+    batches = []
+    succeeded = asyncio.Event()
+
+    async def flaky_batch(envelopes):
+        batches.append([envelope.idempotency_key for envelope in envelopes])
+        if len(batches) < 2:
+            raise RuntimeError("transient")
+        succeeded.set()
+
+    bus.register_handler(event_type="ticket.created", handler=flaky_batch, batch=True, max_attempts=3)
+
+    results = await bus.publish_many([_envelope("sb0"), _envelope("sb1")])
+    assert [result.status for result in results] == ["retrying", "retrying"]
+    assert batches == [["sb0", "sb1"]]
+
+    await asyncio.wait_for(succeeded.wait(), timeout=1)
+    await bus.stop()
+    assert batches == [["sb0", "sb1"], ["sb0", "sb1"]]
+    assert bus.get_deadletters() == []
+
+
+@pytest.mark.asyncio
+async def test_event_bus_publish_many_dedups_and_groups_batch_handlers():
+    bus = EventBus(ttl_seconds=3600)
+    batches = []
+    singles = []
+
+    async def batch_handler(envelopes):
+        batches.append([envelope.idempotency_key for envelope in envelopes])
+
+    async def single_handler(envelope):
+        singles.append(envelope.idempotency_key)
+
+    bus.register_handler(event_type="ticket.created", handler=batch_handler, batch=True)
+    bus.register_handler(event_type="ticket.created", handler=single_handler)
+
+    await bus.publish(_envelope("b0"))
+    results = await bus.publish_many([_envelope("b0"), _envelope("b1"), _envelope("b2"), _envelope("b1")])
+
+    assert [result.status for result in results] == ["duplicate", "processed", "processed", "duplicate"]
+    assert batches == [["b0"], ["b1", "b2"]]
+    assert singles == ["b0", "b1", "b2"]
+    assert [outcome.handler for outcome in results[1].handlers] == ["batch_handler", "single_handler"]
+
+
+@pytest.mark.asyncio
+async def test_event_bus_critical_lane_preempts_queued_routine_events():
+    bus = EventBus(ttl_seconds=3600)
+    order = []
+    gate = asyncio.Event()
+
+    async def handler(envelope):
+        if envelope.idempotency_key == "routine-0":
+            await gate.wait()
+        order.append(envelope.idempotency_key)
+
+    bus.register_handler(handler=handler)
+    await bus.start(workers=1, queue_size=10)
+
+    for index in range(3):
+        await bus.publish(_envelope(f"routine-{index}", event_type="call_updated", source="retell"))
+    await asyncio.sleep(0)  # let the worker pick up routine-0 and block
+
+    fire = EventEnvelope(
+        version="v1",
+        source="telegram",
+        type="escalation.create",
+        idempotency_key="fire-1",
+        timestamp=1234567890,
+        correlation_id="corr-fire",
+        payload={"issue": "Smoke coming from room 1204"},
+    )
+    assert bus.priority_for(fire) == "critical"
+    await bus.publish(fire)
+
+    lanes = bus.get_stats()["lanes"]
+    assert lanes["normal"]["depth"] == 2
+    assert lanes["critical"]["depth"] == 1
+
+    gate.set()
+    await bus.stop(drain_timeout=1)
+
+    assert order == ["routine-0", "fire-1", "routine-1", "routine-2"]
+
+
+@pytest.mark.asyncio
+async def test_retry_scheduler_stop_does_not_restart_runner():
+    scheduler = RetryScheduler(base_delay_seconds=0.001)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    exhausted = []
+
+    async def run():
+        started.set()
+        await release.wait()
+        raise RuntimeError("still down")
+
+    async def on_exhausted(error):
+        exhausted.append(str(error))
+
+    scheduler.schedule(RetryJob(name="slow", attempt=1, max_attempts=5, run=run, on_exhausted=on_exhausted))
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    stopping = asyncio.create_task(scheduler.stop())
+    # Fail the in-flight attempt only once stop() has torn the runner down.
+    while scheduler._runner is not None:
+        await asyncio.sleep(0)
+    release.set()
+    await stopping
+
+    assert scheduler._runner is None
+    assert exhausted == ["retry_cancelled_on_shutdown"]
+    assert scheduler.stats()["pending"] == 0
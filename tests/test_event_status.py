@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.deadletters import InMemoryDeadLetterStore
+from app.core.events import EventBus, EventEnvelope
+from app.core.status import EventStatusStore
+from app.db import Base
+import app.models  # noqa: F401 - registers tables on Base.metadata
+
+
+@pytest.fixture
+async def status_store(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'statuses.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield EventStatusStore(session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    await engine.dispose()
+
+
+def _envelope(key: str) -> EventEnvelope:
+    return EventEnvelope(
+        version="v1",
+        source="make",
+        type="ticket.created",
+        idempotency_key=key,
+        timestamp=1234567890,
+        correlation_id=f"corr-{key}",
+        payload={},
+    )
+
+
+async def test_bus_moves_accepted_events_to_final_status(status_store, monkeypatch):
+    bus = EventBus(ttl_seconds=3600, deadletter_store=InMemoryDeadLetterStore())
+    bus.track_statuses(status_store)
+
+    async def noop_sleep(_):
+        return None
+
+    async def handler(envelope):
+        if envelope.idempotency_key == "bad":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(asyncio, "sleep", noop_sleep)
+    bus.register_handler(event_type="ticket.created", handler=handler)
+
+    for key in ("good", "bad"):
+        await status_store.record(f"corr-{key}", source="make", type="ticket.created")
+        assert (await status_store.get(f"corr-{key}"))["status"] == "queued"
+
+    await bus.publish(_envelope("good"))
+    await bus.publish(_envelope("bad"))
+
+    assert (await status_store.get("corr-good"))["status"] == "processed"
+    bad = await status_store.get("corr-bad")
+    assert bad["status"] == "dead_lettered"
+    assert bad["detail"] == "handler: boom"
+
+    # A late "processed" does not overwrite a terminal failure.
+    assert not await status_store.mark("corr-bad", "processed", only_from=("queued", "retrying"))
+    # Events without a status row are not tracked.
+    await bus.publish(_envelope("untracked"))
+    assert await status_store.get("corr-untracked") is None
+
+
+def test_event_status_endpoint_requires_admin_token(monkeypatch):
+    from starlette.testclient import TestClient
+
+    import app.main as main
+    from app.core.config import settings
+
+    class FakeStatuses:
+        async def get(self, correlation_id):
+            return {"correlation_id": correlation_id, "status": "processed"}
+
+    monkeypatch.setitem(settings.__dict__, "ADMIN_TOKEN", "admin-token")
+    monkeypatch.setattr(main, "event_statuses", FakeStatuses())
+    client = TestClient(main.app)
+
+    assert client.get("/events/status/corr-1").status_code == 401
+    assert client.get("/events/status/corr-1", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    response = client.get("/events/status/corr-1", headers={"X-Admin-Token": "admin-token"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "processed"
@@ -0,0 +1,26 @@
+from app.core.extractor import ShapeExtractor
+
+
+def test_shape_extractor_compiles_once_per_shape_and_counts_hits():
+    extractor = ShapeExtractor(
+        "test",
+        strings={"call_id": ("call_id", "callId", "id"), "intent": ("intent", "callIntent")},
+        dicts={"analysis": ("analysis", "callAnalysis")},
+        max_shapes=2,
+    )
+
+    assert extractor.extract({"callId": " c-1 ", "intent": "spa"}) == {"call_id": "c-1", "intent": "spa"}
+    assert extractor.extract({"callId": "c-2", "intent": ""}) == {"call_id": "c-2"}
+    # Present but unusable aliases fall through to the next present alias.
+    assert extractor.extract({"call_id": 7, "id": "c-3", "callAnalysis": {"x": 1}}) == {
+        "call_id": "c-3",
+        "analysis": {"x": 1},
+    }
+
+    stats = extractor.stats()
+    assert stats["compiled"] == 2
+    assert stats["top"][0] == {"keys": ["callId", "intent"], "hits": 2}
+
+    extractor.extract({"other": "x"})
+    assert extractor.stats()["shapes"] == 2
+    assert extractor.stats()["evictions"] == 1
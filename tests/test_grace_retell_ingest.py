@@ -5,6 +5,7 @@ idempotent ticket creation against a throw-away SQLite database.
 """
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 
 import pytest
@@ -12,11 +13,15 @@ from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import undefer
 
 from app.api import routes as dashboard_routes
+from app.core.config import settings
 from app.db import Base
-from app.models import CallSession, Escalation
-from app.retell_ingest import ingest_retell_webhook
+from app.models import CallAnalysis, CallSession, CallTranscriptTurn, Escalation, Event
+from app.retell_ingest import ingest_retell_webhook, ingest_retell_webhook_ordered
+from app import ticket_pipeline as pipeline_module
+from app.ticket_pipeline import TicketPipeline, ticket_pipeline
 
 
 @pytest.fixture
@@ -81,6 +86,199 @@ async def test_retell_ingest_call_ended_updates_status(retell_db):
         assert row.status == "Ended"
 
 
+async def test_retell_ingest_upsert_keeps_fields_missing_from_event(retell_db):
+    await ingest_retell_webhook(
+        {"call_id": "call-keep-1", "from": "+15550003333", "intent": "dining", "latency_ms": 250},
+        event_type="call_started",
+        correlation_id="corr-keep-1",
+        session_factory=retell_db,
+    )
+    await ingest_retell_webhook(
+        {"call_id": "call-keep-1"},
+        event_type="call_ended",
+        correlation_id="corr-keep-2",
+        session_factory=retell_db,
+    )
+
+    async with retell_db() as db:
+        result = await db.execute(
+            select(CallSession).where(CallSession.id == "call-keep-1")
+        )
+        row = result.scalars().first()
+        assert row.status == "Ended"
+        assert row.from_contact == "+15550003333"
+        assert row.intent == "dining"
+        assert row.latency_ms == 250
+
+
+async def test_retell_ingest_write_behind_buffers_until_terminal_event(retell_db, monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_SESSION_WRITE_BEHIND", True)
+    monkeypatch.setitem(settings.__dict__, "RETELL_SESSION_FLUSH_INTERVAL_MS", 60_000)
+
+    async def fetch():
+        async with retell_db() as db:
+            result = await db.execute(
+                select(CallSession).where(CallSession.id == "call-buffer-1")
+            )
+            return result.scalars().first()
+
+    for event_type, payload in (
+        ("call_started", {"call_id": "call-buffer-1", "from": "+15550004444"}),
+        ("call_updated", {"call_id": "call-buffer-1", "intent": "spa"}),
+    ):
+        res = await ingest_retell_webhook(
+            payload,
+            event_type=event_type,
+            correlation_id="corr-buffer",
+            session_factory=retell_db,
+        )
+        assert res["ok"] is True
+    assert await fetch() is None
+
+    await ingest_retell_webhook(
+        {"call_id": "call-buffer-1"},
+        event_type="call_ended",
+        correlation_id="corr-buffer-end",
+        session_factory=retell_db,
+    )
+    row = await fetch()
+    assert row.status == "Ended"
+    assert row.from_contact == "+15550004444"
+    assert row.intent == "spa"
+
+
+async def test_retell_ingest_write_behind_terminal_event_with_turns(retell_db, monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_SESSION_WRITE_BEHIND", True)
+    monkeypatch.setitem(settings.__dict__, "RETELL_SESSION_FLUSH_INTERVAL_MS", 60_000)
+    transcript = [
+        {"role": "agent", "content": "Front desk, how can I help?"},
+        {"role": "user", "content": "Please send towels to room 8"},
+    ]
+
+    await ingest_retell_webhook(
+        {"call_id": "call-buffer-turns-1", "from": "+15550005555", "transcript": transcript[:1]},
+        event_type="call_started",
+        correlation_id="corr-buffer-turns-1",
+        session_factory=retell_db,
+    )
+    res = await asyncio.wait_for(
+        ingest_retell_webhook(
+            {"call_id": "call-buffer-turns-1", "transcript": transcript},
+            event_type="call_ended",
+            correlation_id="corr-buffer-turns-2",
+            session_factory=retell_db,
+        ),
+        timeout=3,
+    )
+    assert res["ok"] is True
+
+    async with retell_db() as db:
+        session = (
+            await db.execute(select(CallSession).where(CallSession.id == "call-buffer-turns-1"))
+        ).scalars().first()
+        assert session.status == "Ended"
+        assert session.from_contact == "+15550005555"
+        turns = (
+            await db.execute(
+                select(CallTranscriptTurn.turn_index).where(CallTranscriptTurn.call_id == "call-buffer-turns-1")
+            )
+        ).scalars().all()
+        assert sorted(turns) == [0, 1]
+
+
+async def test_retell_ingest_appends_only_new_transcript_turns(retell_db):
+    transcript = [{"role": "user", "content": f"message {index} " + "x" * 60} for index in range(6)]
+    for size in (2, 4, 6, 6):
+        res = await ingest_retell_webhook(
+            {"call_id": "call-turns-1", "transcript": transcript[:size]},
+            event_type="call_updated",
+            correlation_id=f"corr-turns-{size}",
+            session_factory=retell_db,
+        )
+        assert res["ok"] is True
+
+    async with retell_db() as db:
+        turns = (
+            await db.execute(
+                select(CallTranscriptTurn)
+                .where(CallTranscriptTurn.call_id == "call-turns-1")
+                .order_by(CallTranscriptTurn.turn_index)
+            )
+        ).scalars().all()
+        assert [turn.turn_index for turn in turns] == list(range(6))
+
+        session = (
+            await db.execute(select(CallSession).where(CallSession.id == "call-turns-1"))
+        ).scalars().first()
+        assert session.transcript_snippet.startswith("…")
+        assert session.transcript_snippet.endswith("message 5 " + "x" * 60)
+        assert len(session.transcript_snippet) <= 280
+
+
+async def test_retell_ingest_rewrites_growing_tail_turn(retell_db):
+    updates = [
+        [{"role": "agent", "content": "Front desk, how can I help?"}, {"role": "user", "content": "There is"}],
+        [
+            {"role": "agent", "content": "Front desk, how can I help?"},
+            {"role": "user", "content": "There is smoke in room 12"},
+        ],
+    ]
+    for index, transcript in enumerate(updates):
+        res = await ingest_retell_webhook(
+            {"call_id": "call-tail-1", "transcript": transcript},
+            event_type="call_updated",
+            correlation_id=f"corr-tail-{index}",
+            session_factory=retell_db,
+        )
+        assert res["ok"] is True
+
+    async with retell_db() as db:
+        turns = (
+            await db.execute(
+                select(CallTranscriptTurn)
+                .where(CallTranscriptTurn.call_id == "call-tail-1")
+                .order_by(CallTranscriptTurn.turn_index)
+            )
+        ).scalars().all()
+        assert [(turn.role, turn.content) for turn in turns] == [
+            ("agent", "Front desk, how can I help?"),
+            ("user", "There is smoke in room 12"),
+        ]
+
+
+# ── ordered ingest ────────────────────────────────────────────────────────
+
+
+async def test_retell_ingest_ordered_applies_same_call_events_in_order(retell_db):
+    events = [
+        ("call_started", {"call_id": "call-order-1", "from": "+15550002222"}),
+        ("call_updated", {"call_id": "call-order-1", "intent": "spa"}),
+        ("call_updated", {"call_id": "call-order-1", "latency_ms": 420}),
+        ("call_ended", {"call_id": "call-order-1"}),
+    ]
+    results = await asyncio.gather(
+        *(
+            ingest_retell_webhook_ordered(
+                payload,
+                event_type=event_type,
+                correlation_id=f"corr-order-{index}",
+                session_factory=retell_db,
+            )
+            for index, (event_type, payload) in enumerate(events)
+        )
+    )
+    assert all(result["ok"] for result in results)
+
+    async with retell_db() as db:
+        result = await db.execute(
+            select(CallSession).where(CallSession.id == "call-order-1")
+        )
+        row = result.scalars().first()
+        assert row.status == "Ended"
+        assert row.intent == "spa"
+        assert row.latency_ms == 420
+
+
 # ── call_analyzed (idempotent ticket) ─────────────────────────────────────
 
 
@@ -120,19 +318,214 @@ async def test_retell_ingest_call_analyzed_creates_ticket_idempotent(retell_db):
     assert second["ticket_id"] == first["ticket_id"]
 
     async with retell_db() as db:
-        ticket_result = await db.execute(select(Escalation))
+        ticket_result = await db.execute(select(Escalation).options(undefer(Escalation.issue)))
         tickets = ticket_result.scalars().all()
         assert len(tickets) == 1
         assert "TRANSCRIPT" in (tickets[0].issue or "")
+        assert tickets[0].call_id == "call-analyzed-1"
+        assert tickets[0].source == "Voice"
+        assert tickets[0].severity in {"critical", "high", "medium"}
+        assert tickets[0].subject.startswith("call_id=call-analyzed-1")
 
         analysis_result = await db.execute(
-            select(CallAnalysis).where(CallAnalysis.call_id == "call-analyzed-1")
+            select(CallAnalysis)
+            .options(undefer(CallAnalysis.transcript))
+            .where(CallAnalysis.call_id == "call-analyzed-1")
         )
         analysis = analysis_result.scalars().first()
         assert analysis is not None
         assert analysis.ticket_id == first["ticket_id"]
         assert analysis.summary
         assert analysis.transcript
+        assert "User: Hi, I'd like to book a Swedish massage for tonight." in analysis.transcript
+        assert "GET /api/calls/call-analyzed-1/transcript" in (tickets[0].issue or "")
+        assert "Swedish massage for tonight" not in (tickets[0].issue or "")
+
+        turns = (
+            await db.execute(
+                select(CallTranscriptTurn)
+                .where(CallTranscriptTurn.call_id == "call-analyzed-1")
+                .order_by(CallTranscriptTurn.turn_index)
+            )
+        ).scalars().all()
+        assert [turn.role for turn in turns] == ["user", "assistant"]
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+async def test_retell_ingest_severity_reads_list_transcript(retell_db, monkeypatch, pipeline):
+    monkeypatch.setitem(settings.__dict__, "RETELL_TICKET_PIPELINE", pipeline)
+    call_id = f"call-smoke-{int(pipeline)}"
+    payload = {
+        "call_id": call_id,
+        "call_analysis": {"call_summary": "Guest called the front desk about room 12."},
+        "transcript": "Agent: Front desk.\nUser: There is smoke in room 12.",
+        "transcript_object": [
+            {"role": "agent", "content": "Front desk."},
+            {"role": "user", "content": "There is smoke in room 12."},
+        ],
+    }
+    monkeypatch.setattr(ticket_pipeline, "enqueue", lambda *args, **kwargs: None)
+    res = await ingest_retell_webhook(
+        payload, event_type="call_analyzed", correlation_id=f"corr-{call_id}", session_factory=retell_db
+    )
+    assert res["ok"] is True
+    if pipeline:
+        await TicketPipeline().create_ticket(call_id, correlation_id=f"corr-{call_id}", session_factory=retell_db)
+
+    async with retell_db() as db:
+        ticket = (await db.execute(select(Escalation).options(undefer(Escalation.issue)))).scalars().one()
+        assert ticket.severity == "critical"
+        assert f"GET /api/calls/{call_id}/transcript" in ticket.issue
+        assert "smoke in room 12" not in ticket.issue
+        turns = (
+            await db.execute(select(CallTranscriptTurn).where(CallTranscriptTurn.call_id == call_id))
+        ).scalars().all()
+        assert len(turns) == 2
+
+
+async def test_retell_ingest_ticket_pipeline_creates_ticket_off_path(retell_db, monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_TICKET_PIPELINE", True)
+    payload = {
+        "call_id": "call-pipeline-1",
+        "analysis": {"summary": "Late checkout request.", "caller_name": "Jane Roe"},
+    }
+
+    try:
+        first = await ingest_retell_webhook(
+            payload,
+            event_type="call_analyzed",
+            correlation_id="corr-p1",
+            session_factory=retell_db,
+        )
+        assert first == {"ok": True, "call_id": "call-pipeline-1", "ticket_id": None, "ticket_pending": True}
+
+        second = await ingest_retell_webhook(
+            payload,
+            event_type="call_analyzed",
+            correlation_id="corr-p2",
+            session_factory=retell_db,
+        )
+        assert second["ok"] is True
+        await ticket_pipeline.join()
+        # A stale queue entry for an already-ticketed call is a no-op.
+        await ticket_pipeline.create_ticket("call-pipeline-1", correlation_id="corr-p3", session_factory=retell_db)
+    finally:
+        await ticket_pipeline.stop()
+
+    async with retell_db() as db:
+        tickets = (await db.execute(select(Escalation))).scalars().all()
+        assert len(tickets) == 1
+        assert tickets[0].guest_name == "Jane Roe"
+        analysis = (
+            await db.execute(select(CallAnalysis).where(CallAnalysis.call_id == "call-pipeline-1"))
+        ).scalars().first()
+        assert analysis.ticket_id == tickets[0].id
+
+    stats = ticket_pipeline.stats()
+    assert stats["created"] == 1
+    assert stats["pending"] == 0
+    assert stats["max_lag_seconds"] >= 0
+
+
+async def test_ticket_pipeline_retries_failures_and_recovers_only_pending_calls(retell_db, monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_TICKET_PIPELINE", True)
+    monkeypatch.setitem(settings.__dict__, "RETELL_TICKET_RETRY_BASE_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(ticket_pipeline, "enqueue", lambda *args, **kwargs: None)
+    await ingest_retell_webhook(
+        {"call_id": "call-retry-1", "analysis": {"summary": "Extra towels."}},
+        event_type="call_analyzed",
+        correlation_id="corr-retry-1",
+        session_factory=retell_db,
+    )
+    async with retell_db() as db:
+        # What `python -m app.backfill --no-tickets` leaves behind: no ticket, not pending.
+        db.add(CallAnalysis(call_id="call-imported-1", summary="Imported call."))
+        await db.commit()
+
+    pipeline = TicketPipeline(workers=1)
+    create_ticket = pipeline.create_ticket
+    calls = []
+
+    async def flaky_create_ticket(call_id, **kwargs):
+        calls.append(call_id)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return await create_ticket(call_id, **kwargs)
+
+    monkeypatch.setattr(pipeline, "create_ticket", flaky_create_ticket)
+    try:
+        assert await pipeline.recover(session_factory=retell_db) == 1
+        for _ in range(200):
+            if pipeline.created:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await pipeline.stop()
+
+    assert calls == ["call-retry-1", "call-retry-1"]
+    assert pipeline.stats()["retries"] == 1
+    async with retell_db() as db:
+        analysis = (
+            await db.execute(select(CallAnalysis).where(CallAnalysis.call_id == "call-retry-1"))
+        ).scalars().one()
+        assert analysis.ticket_id is not None
+        assert analysis.ticket_pending is False
+    assert await pipeline.recover(session_factory=retell_db) == 0
+    await pipeline.stop()
+
+
+async def test_ticket_pipeline_publish_failure_is_not_retried(retell_db, monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_TICKET_PIPELINE", True)
+    monkeypatch.setattr(ticket_pipeline, "enqueue", lambda *args, **kwargs: None)
+    await ingest_retell_webhook(
+        {"call_id": "call-publish-1", "analysis": {"summary": "Extra pillows."}},
+        event_type="call_analyzed",
+        correlation_id="corr-publish-1",
+        session_factory=retell_db,
+    )
+
+    async def failing_publish(*_args, **_kwargs):
+        raise RuntimeError("bus unavailable")
+
+    monkeypatch.setattr(pipeline_module.bus, "publish", failing_publish)
+    pipeline = TicketPipeline(workers=1)
+    try:
+        pipeline.enqueue("call-publish-1", correlation_id="corr-publish-1", session_factory=retell_db)
+        await pipeline.join()
+    finally:
+        await pipeline.stop()
+
+    stats = pipeline.stats()
+    assert stats["created"] == 1
+    assert stats["failures"] == 0
+    assert stats["retries"] == 0
+    assert stats["lag_seconds"] == 0.0
+    async with retell_db() as db:
+        analysis = (
+            await db.execute(select(CallAnalysis).where(CallAnalysis.call_id == "call-publish-1"))
+        ).scalars().one()
+        assert analysis.ticket_id is not None
+
+
+async def test_retell_ingest_concurrent_same_call_creates_one_ticket(retell_db):
+    payload = {"call_id": "call-race-1", "analysis": {"summary": "Extra towels."}}
+    results = await asyncio.gather(
+        *(
+            ingest_retell_webhook(
+                payload,
+                event_type="call_analyzed",
+                correlation_id=f"corr-race-{index}",
+                session_factory=retell_db,
+            )
+            for index in range(5)
+        )
+    )
+    assert all(result["ok"] for result in results)
+    assert len({result["ticket_id"] for result in results}) == 1
+
+    async with retell_db() as db:
+        tickets = (await db.execute(select(Escalation))).scalars().all()
+        assert len(tickets) == 1
 
 
 # ── API /api/calls integration ────────────────────────────────────────────
@@ -167,3 +560,31 @@ async def test_api_calls_reads_db(retell_db, monkeypatch):
     data = res.json()
     assert isinstance(data, list)
     assert any(item.get("id") == "call-api-1" for item in data)
+
+
+async def test_api_lists_skip_large_columns_unless_requested(retell_db, monkeypatch):
+    async with retell_db() as db:
+        ticket = Escalation(guest_name="Jane", issue="Leak in room 4\n\nLong notes", severity="critical", subject="Leak")
+        db.add(ticket)
+        db.add(Event(source="make", type="info", text="ok", payload={"room": "4"}))
+        await db.commit()
+
+    monkeypatch.setattr(dashboard_routes, "AsyncSessionLocal", retell_db)
+    app = FastAPI()
+    app.include_router(dashboard_routes.router, prefix="/api")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        tickets = (await client.get("/api/tickets")).json()
+        with_notes = (await client.get("/api/tickets", params={"notes": "true"})).json()
+        detail = await client.get(f"/api/tickets/TCK-{ticket.id}")
+        missing = await client.get("/api/tickets/TCK-999")
+        events = (await client.get("/api/events")).json()
+        with_payload = (await client.get("/api/events", params={"payload": "true"})).json()
+
+    assert tickets[0]["notes"] == "" and tickets[0]["severity"] == "critical"
+    assert with_notes[0]["notes"].startswith("Leak in room 4")
+    assert detail.status_code == 200
+    assert detail.json()["notes"].startswith("Leak in room 4")
+    assert missing.status_code == 404
+    assert "payload" not in events[0]
+    assert with_payload[0]["payload"] == {"room": "4"}
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.idempotency import IdempotencyStore, SqlIdempotencyBackend
+from app.db import Base
+import app.models  # noqa: F401 - registers tables on Base.metadata
+
+
+def test_idempotency_store_expires_incrementally(monkeypatch):
+    store = IdempotencyStore(ttl_seconds=10, max_size=100)
+
+    monkeypatch.setattr(time, "time", lambda: 1000)
+    store.add("a")
+    monkeypatch.setattr(time, "time", lambda: 1005)
+    store.add("b")
+
+    monkeypatch.setattr(time, "time", lambda: 1011)
+    assert store.purge_expired() == 1
+    assert not store.seen("a")
+    assert store.seen("b")
+    assert store.stats()["expirations"] == 1
+
+
+def test_idempotency_store_evicts_least_recently_used():
+    store = IdempotencyStore(ttl_seconds=3600, max_size=2)
+
+    store.add("a")
+    store.add("b")
+    assert store.seen("a")  # refresh "a" so "b" becomes least recently used
+    store.add("c")
+
+    assert len(store) == 2
+    assert "a" in store
+    assert "b" not in store
+    assert "c" in store
+    stats = store.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+
+
+def test_idempotency_store_remark_does_not_expire_early(monkeypatch):
+    store = IdempotencyStore(ttl_seconds=10, max_size=100)
+
+    monkeypatch.setattr(time, "time", lambda: 1000)
+    store.add("a")
+    monkeypatch.setattr(time, "time", lambda: 1008)
+    store.add("a")
+
+    monkeypatch.setattr(time, "time", lambda: 1012)
+    store.purge_expired()
+    assert store.seen("a")
+    assert store.stats()["misses"] == 0
+
+
+@pytest.fixture
+async def idempotency_db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def test_sql_idempotency_backend_shared_between_instances(idempotency_db):
+    # Two backends over one table model two uvicorn workers.
+    worker_a = SqlIdempotencyBackend(3600, session_factory=idempotency_db)
+    worker_b = SqlIdempotencyBackend(3600, session_factory=idempotency_db)
+
+    assert await worker_a.claim("retell-1") is True
+    assert await worker_b.claim("retell-1") is False
+    assert await worker_b.claim("retell-2") is True
+    assert worker_b.stats()["duplicates"] == 1
+
+
+async def test_sql_idempotency_backend_reclaims_expired_key(idempotency_db, monkeypatch):
+    backend = SqlIdempotencyBackend(10, session_factory=idempotency_db, cleanup_interval_seconds=3600)
+
+    monkeypatch.setattr(time, "time", lambda: 1000)
+    assert await backend.claim("retell-ttl") is True
+    monkeypatch.setattr(time, "time", lambda: 1005)
+    assert await backend.claim("retell-ttl") is False
+    monkeypatch.setattr(time, "time", lambda: 1011)
+    assert await backend.claim("retell-ttl") is True
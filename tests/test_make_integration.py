@@ -264,3 +264,33 @@ async def test_make_trigger_hmac_auth_valid(monkeypatch, test_client):
     assert res.status_code == 200
     assert res.json()["status"] == "sent"
     assert calls["headers"]["X-Correlation-Id"] == "corr-hmac"
+
+
+@pytest.mark.asyncio
+async def test_make_ingress_batch_dedups_within_one_signed_request(monkeypatch, test_client):
+    _set_setting(monkeypatch, "ENABLE_MAKE_WEBHOOKS", True)
+    _set_setting(monkeypatch, "MAKE_SIGNING_SECRET", "secret")
+
+    envelopes = [
+        _make_envelope(idempotency_key="batch-1", correlation_id="corr-b1"),
+        _make_envelope(idempotency_key="batch-2", correlation_id="corr-b2"),
+        _make_envelope(idempotency_key="batch-1", correlation_id="corr-b3"),
+    ]
+    body = json.dumps(envelopes, separators=(",", ":")).encode("utf-8")
+    timestamp = str(int(time.time()))
+
+    res = await test_client.post(
+        "/webhooks/make/in/batch",
+        content=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-Signature-Timestamp": timestamp,
+            "X-Signature": _sign("secret", timestamp, body),
+        },
+    )
+
+    assert res.status_code == 200
+    assert [item["status"] for item in res.json()["results"]] == ["accepted", "accepted", "duplicate"]
+
+    res_unsigned = await test_client.post("/webhooks/make/in/batch", content=body)
+    assert res_unsigned.status_code == 401
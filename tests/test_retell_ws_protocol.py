@@ -30,3 +30,125 @@ def test_ws_root_path_also_works(sync_client):
         frame = ws.receive_json()
         assert frame["response_id"] == 0
         assert frame["content_complete"] is True
+
+
+def _stream_frames(sync_client, monkeypatch, chunks, call_id):
+    import app.main as main
+
+    async def fake_stream(_user_text):
+        for chunk in chunks:
+            yield chunk
+
+    monkeypatch.setattr(main, "_stream_model_reply", fake_stream)
+    return _reply_frames(sync_client, monkeypatch, call_id)
+
+
+def _reply_frames(sync_client, monkeypatch, call_id, on_complete=None):
+    import app.main as main
+    from app.core.config import settings
+
+    monkeypatch.setitem(settings.__dict__, "google_api_key", "test-key")
+    monkeypatch.setattr(main, "_open_staff_ticket", lambda *args, **kwargs: None)
+    monkeypatch.setattr(main, "_emit_event", lambda *args, **kwargs: None)
+
+    frames = []
+    with sync_client.websocket_connect(f"/llm-websocket/{call_id}") as ws:
+        ws.receive_json()
+        ws.send_json(
+            {
+                "interaction_type": "response_required",
+                "response_id": 7,
+                "transcript": [{"role": "user", "content": "What spa treatments do you offer?"}],
+            }
+        )
+        while True:
+            frame = ws.receive_json()
+            frames.append(frame)
+            if frame["content_complete"]:
+                break
+        if on_complete is not None:
+            on_complete()
+    return frames
+
+
+def test_ws_streams_sentences_before_completion(sync_client, monkeypatch):
+    """Each completed sentence is sent as a partial frame, then an empty completion frame."""
+    frames = _stream_frames(
+        sync_client, monkeypatch, ["We offer massages", " and facials. Would you", " like to book one?"], "call_stream"
+    )
+
+    assert [frame["response_id"] for frame in frames] == [7, 7, 7]
+    assert [frame["content_complete"] for frame in frames] == [False, False, True]
+    assert frames[0]["content"] == "We offer massages and facials. "
+    assert frames[1]["content"] == "Would you like to book one?"
+    assert frames[2]["content"] == ""
+
+
+def test_ws_stream_guard_replaces_policy_violation(sync_client, monkeypatch):
+    """A sentence that trips a response guard is replaced and ends the reply."""
+    import app.main as main
+
+    frames = _stream_frames(
+        sync_client, monkeypatch, ["Great choice. ", "Your massage is booked for 5pm. ", "Enjoy!"], "call_guard"
+    )
+
+    spoken = "".join(frame["content"] for frame in frames)
+    assert spoken == "Great choice. " + main.PENDING_BOOKING_MESSAGE
+    assert "booked" not in spoken
+    assert frames[-1]["content_complete"] is True
+
+
+def test_ws_stream_guard_stops_model_producer(sync_client, monkeypatch):
+    """Tripping the guard closes the reply stream, so the producer thread stops pulling chunks."""
+    import sys
+    import threading
+    import time
+    import types
+
+    pulled = []
+    stopped = threading.Event()
+
+    def generate():
+        try:
+            for index in range(500):
+                pulled.append(index)
+                text = ["Great choice. ", "Your massage is booked for 5pm. "][index] if index < 2 else "More. "
+                yield types.SimpleNamespace(text=text)
+                time.sleep(0.01)
+        finally:
+            stopped.set()
+
+    class FakeModel:
+        def __init__(self, _name):
+            pass
+
+        def generate_content(self, _messages, stream=False):
+            return generate()
+
+    import app.main as main
+
+    # `import google.generativeai` reads the attribute off the parent package when it is
+    # set (the conftest stub sets it), so patch both the parent and sys.modules.
+    genai = types.SimpleNamespace(GenerativeModel=FakeModel)
+    google = sys.modules.get("google") or types.ModuleType("google")
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    monkeypatch.setattr(google, "generativeai", genai, raising=False)
+    # Hold a reference so garbage collection cannot be what closes the stream.
+    streams = []
+    stream_model_reply = main._stream_model_reply
+
+    def tracked_stream(user_text):
+        streams.append(stream_model_reply(user_text))
+        return streams[-1]
+
+    monkeypatch.setattr(main, "_stream_model_reply", tracked_stream)
+
+    def producer_stopped():
+        # Checked while the socket is still open, before loop shutdown closes leftovers.
+        assert stopped.wait(2)
+
+    frames = _reply_frames(sync_client, monkeypatch, "call_guard_stop", on_complete=producer_stopped)
+
+    assert frames[-1]["content_complete"] is True
+    assert len(pulled) < 500
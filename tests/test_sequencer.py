@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.core.sequencer import KeyedSequencer
+
+
+@pytest.mark.asyncio
+async def test_sequencer_orders_per_key_and_coalesces_pending_updates():
+    writes = []
+    gate = asyncio.Event()
+
+    async def run(value):
+        if value["state"] == "started":
+            await gate.wait()
+        writes.append((value["key"], value["state"]))
+        return value["state"]
+
+    def merge(previous, latest):
+        return {**previous, **latest}
+
+    sequencer = KeyedSequencer(run, merge=merge)
+
+    started = asyncio.create_task(sequencer.submit("call-1", {"key": "call-1", "state": "started"}))
+    await asyncio.sleep(0)
+    update_1 = asyncio.create_task(sequencer.submit("call-1", {"key": "call-1", "state": "update-1"}, coalesce=True))
+    update_2 = asyncio.create_task(sequencer.submit("call-1", {"key": "call-1", "state": "update-2"}, coalesce=True))
+    ended = asyncio.create_task(sequencer.submit("call-1", {"key": "call-1", "state": "ended"}))
+    other = asyncio.create_task(sequencer.submit("call-2", {"key": "call-2", "state": "update"}, coalesce=True))
+
+    # A different call is not blocked behind call-1.
+    assert await asyncio.wait_for(other, timeout=1) == "update"
+
+    gate.set()
+    results = await asyncio.gather(started, update_1, update_2, ended)
+
+    assert results == ["started", "update-2", "update-2", "ended"]
+    assert [state for key, state in writes if key == "call-1"] == ["started", "update-2", "ended"]
+    assert sequencer.stats()["coalesced"] == 1
+    assert sequencer.stats()["active_keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sequencer_propagates_errors_to_every_waiter():
+    async def run(_value):
+        raise RuntimeError("db down")
+
+    sequencer = KeyedSequencer(run, merge=lambda _previous, latest: latest)
+
+    with pytest.raises(RuntimeError):
+        await sequencer.submit("call-err", {"state": "update"}, coalesce=True)
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from app.core.striped import StripedLock, advisory_key
+
+
+def test_striped_lock_maps_keys_stably():
+    locks = StripedLock(8)
+    assert locks.lock_for("call-1") is locks.lock_for("call-1")
+    assert len({id(locks.lock_for(f"call-{index}")) for index in range(100)}) == 8
+    assert advisory_key("retell.call", "call-1") == advisory_key("retell.call", "call-1")
+    assert -(2**63) <= advisory_key("retell.call", "call-1") < 2**63
+
+
+@pytest.mark.asyncio
+async def test_striped_lock_serializes_same_key():
+    locks = StripedLock(4)
+    active = 0
+    peak = 0
+
+    async def work():
+        nonlocal active, peak
+        async with locks.hold("call-1"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(work() for _ in range(5)))
+    assert peak == 1
+    assert locks.stats()["contended"] == 4
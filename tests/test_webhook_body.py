@@ -0,0 +1,81 @@
+import hashlib
+import hmac
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.security import SignatureInvalidError
+from app.middleware.body import WebhookBodyMiddleware, WebhookRoute, read_webhook_body
+
+ROUTE = WebhookRoute(secret_setting="RETELL_SIGNING_SECRET")
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(WebhookBodyMiddleware, routes={"/hook": ROUTE})
+
+    @app.post("/hook")
+    async def hook(request: Request):
+        body = await read_webhook_body(request, ROUTE)
+        try:
+            body.verify()
+            signature = "ok"
+        except SignatureInvalidError:
+            signature = "invalid"
+        return {
+            "sha256": body.sha256,
+            "json": body.json if body.json_ok else None,
+            "signature": signature,
+            "replayed": (await request.body()) == body.raw,
+        }
+
+    return app
+
+
+def _sign(secret: str, timestamp: str, raw_body: bytes) -> str:
+    return hmac.new(secret.encode(), timestamp.encode() + b"." + raw_body, hashlib.sha256).hexdigest()
+
+
+def test_body_is_hashed_verified_and_parsed_once(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_SIGNING_SECRET", "secret")
+    client = TestClient(_app())
+    raw = b'{"event":"call_started","call_id":"c-1"}'
+    timestamp = str(int(time.time()))
+
+    def chunks():
+        yield raw[:10]
+        yield raw[10:]
+
+    res = client.post(
+        "/hook",
+        content=chunks(),
+        headers={"X-Signature-Timestamp": timestamp, "X-Signature": "sha256=" + _sign("secret", timestamp, raw)},
+    )
+    assert res.status_code == 200
+    data = res.json()
+    assert data["sha256"] == hashlib.sha256(raw).hexdigest()
+    assert data["json"] == {"event": "call_started", "call_id": "c-1"}
+    assert data["signature"] == "ok"
+    assert data["replayed"] is True
+
+    res = client.post("/hook", content=raw, headers={"X-Signature-Timestamp": timestamp, "X-Signature": "bad"})
+    assert res.json()["signature"] == "invalid"
+
+
+def test_oversized_body_is_rejected(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "RETELL_SIGNING_SECRET", None)
+    monkeypatch.setitem(settings.__dict__, "WEBHOOK_MAX_BODY_BYTES", 16)
+    client = TestClient(_app())
+
+    res = client.post("/hook", content=b"x" * 17)
+    assert res.status_code == 413
+    assert res.json() == {"error": "payload_too_large", "max_bytes": 16}
+
+    def chunks():
+        yield b"x" * 10
+        yield b"x" * 10
+
+    res = client.post("/hook", content=chunks())
+    assert res.status_code == 413
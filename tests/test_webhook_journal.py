@@ -0,0 +1,66 @@
+import asyncio
+
+from app.core.journal import WebhookJournal
+
+
+def test_uncommitted_entries_are_replayed_after_restart(tmp_path):
+    async def scenario():
+        journal = WebhookJournal(str(tmp_path), fsync_interval_ms=1)
+        await journal.open()
+        first, second = await asyncio.gather(
+            journal.append("retell", b'{"call_id":"a"}', correlation_id="c-a", sha256="h-a"),
+            journal.append("retell", b'{"call_id":"b"}', correlation_id="c-b", sha256="h-b"),
+        )
+        assert journal.fsyncs == 1  # both appends shared one group fsync
+        journal.commit(first)
+        # Simulated crash: the second entry never gets its commit marker.
+        await journal.close()
+
+        restarted = WebhookJournal(str(tmp_path), fsync_interval_ms=1)
+        assert await restarted.open() == 1
+        seen = []
+
+        async def handler(entry):
+            seen.append((entry["seq"], entry["correlation_id"], entry["body"]))
+
+        assert await restarted.replay({"retell": handler}) == 1
+        assert seen == [(second, "c-b", '{"call_id":"b"}')]
+        await restarted.close()
+
+        again = WebhookJournal(str(tmp_path), fsync_interval_ms=1)
+        assert await again.open() == 0
+        await again.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_replay_stays_pending_and_committed_segments_are_compacted(tmp_path):
+    async def scenario():
+        journal = WebhookJournal(str(tmp_path), segment_bytes=64, fsync_interval_ms=0)
+        await journal.open()
+        seqs = [
+            await journal.append("make", b'{"n":%d}' % index, correlation_id=f"c-{index}", sha256=f"h-{index}")
+            for index in range(4)
+        ]
+        assert journal.stats()["segments"] >= 3
+        for seq in seqs[:3]:
+            journal.commit(seq)
+        # Everything before the segment holding the last pending entry is gone.
+        assert journal.stats()["pending"] == 1
+        assert journal.compacted_segments >= 2
+        await journal.close()
+
+        restarted = WebhookJournal(str(tmp_path), fsync_interval_ms=0)
+        assert await restarted.open() == 1
+
+        async def failing(entry):
+            raise RuntimeError("db down")
+
+        assert await restarted.replay({"make": failing}) == 0
+        await restarted.close()
+
+        final = WebhookJournal(str(tmp_path), fsync_interval_ms=0)
+        assert await final.open() == 1
+        await final.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.core.writebehind import WriteBehindBuffer
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches_skips_noops_and_forces_flush():
+    batches = []
+
+    async def flush(rows):
+        batches.append(dict(rows))
+
+    buffer = WriteBehindBuffer(flush, interval_seconds=0.05, max_rows=3)
+
+    assert await buffer.put("call-1", {"status": "Active"}) is True
+    assert await buffer.put("call-1", {"intent": "spa"}) is True
+    assert await buffer.put("call-2", {"status": "Active"}) is True
+    assert batches == []
+
+    await asyncio.sleep(0.1)
+    assert batches == [{"call-1": {"status": "Active", "intent": "spa"}, "call-2": {"status": "Active"}}]
+
+    assert await buffer.put("call-1", {"intent": "spa"}) is False
+    assert await buffer.put("call-1", {"status": "Ended"}, force=True) is True
+    assert batches[-1] == {"call-1": {"status": "Ended"}}
+
+    for index in range(3):
+        await buffer.put(f"bulk-{index}", {"status": "Active"})
+    assert len(batches[-1]) == 3
+
+    stats = buffer.stats()
+    assert stats["noops"] == 1
+    assert stats["pending"] == 0
+    assert stats["flushes"] == 3
+
+
+@pytest.mark.asyncio
+async def test_write_behind_keeps_rows_on_failure_and_flushes_on_stop():
+    calls = []
+
+    async def flush(rows):
+        calls.append(dict(rows))
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+
+    buffer = WriteBehindBuffer(flush, interval_seconds=60, max_rows=100)
+    await buffer.put("call-1", {"status": "Active"})
+    with pytest.raises(RuntimeError):
+        await buffer.flush()
+    assert len(buffer) == 1
+
+    await buffer.put("call-1", {"latency_ms": 10})
+    await buffer.stop()
+    assert calls[-1] == {"call-1": {"status": "Active", "latency_ms": 10}}
+    assert buffer.stats()["failures"] == 1